@@ -0,0 +1,293 @@
+import json
+import re
+from collections import defaultdict
+
+VALUATION_KEYS = {"PASS": "Pass", "FAIL": "Fail", "ERROR": "Error", "WARNING": "Warning"}
+ERROR_TEST_CASE_EXCLUDE_PATTERN = re.compile(r"^\d{2}_\d{2}$")
+
+
+def _new_counts():
+    return {"Pass": 0, "Fail": 0, "Error": 0, "Warning": 0, "Total": 0}
+
+
+class StabilityAggregate:
+    """
+    Mergeable test case x date x valuation counts for the stability summary.
+
+    Rows are ordered by the first (date, file, position) a test case was seen at, so merging shards
+    in any order renders the same output as a single-process run.
+
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty aggregate.
+
+        """
+        self.counts = defaultdict(lambda: defaultdict(_new_counts))
+        self.first_seen = {}
+        self.campaign_details = {}
+        self.dates = set()
+
+    @classmethod
+    def from_extractions(cls, extractions):
+        """
+        Build an aggregate from extraction results.
+
+        """
+        aggregate = cls()
+        for extraction in extractions:
+            aggregate.add_extraction(extraction)
+        return aggregate
+
+    def add_extraction(self, extraction):
+        """
+        Fold the test valuations of one extracted report into the aggregate.
+
+        """
+        campaign_date = extraction.campaign_date
+        self.campaign_details[extraction.filepath] = extraction.campaign_details
+        self.dates.add(campaign_date)
+
+        for position, (test_case_name, valuation) in enumerate(extraction.test_valuations):
+            order_key = [campaign_date, extraction.filepath, position]
+            if test_case_name not in self.first_seen or order_key < self.first_seen[test_case_name]:
+                self.first_seen[test_case_name] = order_key
+            counts = self.counts[test_case_name][campaign_date]
+            counts["Total"] += 1
+            if valuation in VALUATION_KEYS:
+                counts[VALUATION_KEYS[valuation]] += 1
+
+    def update(self, other):
+        """
+        Fold another aggregate into this one in place.
+
+        """
+        for test_case, date_counts in other.counts.items():
+            for date, counts in date_counts.items():
+                target = self.counts[test_case][date]
+                for key, value in counts.items():
+                    target[key] += value
+        for test_case, order_key in other.first_seen.items():
+            if test_case not in self.first_seen or order_key < self.first_seen[test_case]:
+                self.first_seen[test_case] = order_key
+        self.campaign_details.update(other.campaign_details)
+        self.dates |= other.dates
+
+    def merge(self, other):
+        """
+        Return a new aggregate combining this one and other.
+
+        """
+        merged = StabilityAggregate()
+        merged.update(self)
+        merged.update(other)
+        return merged
+
+    def results(self):
+        """
+        Return (results, sorted dates, campaign details) in the shape used by MultipleFileAnalysis.
+
+        """
+        results = {
+            test_case: self.counts[test_case]
+            for test_case in sorted(self.counts, key=lambda test_case: self.first_seen[test_case])
+        }
+        campaign_details = {filepath: self.campaign_details[filepath] for filepath in sorted(self.campaign_details)}
+        return results, sorted(self.dates), campaign_details
+
+    def to_dict(self):
+        """
+        Serialize the aggregate to JSON-compatible data.
+
+        """
+        return {
+            "counts": {test_case: dict(date_counts) for test_case, date_counts in self.counts.items()},
+            "first_seen": self.first_seen,
+            "campaign_details": self.campaign_details,
+            "dates": sorted(self.dates),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild an aggregate from the output of to_dict.
+
+        """
+        aggregate = cls()
+        for test_case, date_counts in data["counts"].items():
+            for date, counts in date_counts.items():
+                aggregate.counts[test_case][date].update(counts)
+        aggregate.first_seen = {test_case: list(order_key) for test_case, order_key in data["first_seen"].items()}
+        aggregate.campaign_details = dict(data["campaign_details"])
+        aggregate.dates = set(data["dates"])
+        return aggregate
+
+
+class ErrorAggregate:
+    """
+    Mergeable message x date x test case recurrence counts for the error statistics.
+
+    Messages are ordered by their first occurrence and keep the category of their last occurrence,
+    both by (date, file, position), so any sharding gives the same output.
+
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty aggregate.
+
+        """
+        self.messages = {}
+        self.campaign_details = {}
+        self.dates = set()
+
+    @classmethod
+    def from_extractions(cls, extractions):
+        """
+        Build an aggregate from extraction results.
+
+        """
+        aggregate = cls()
+        for extraction in extractions:
+            aggregate.add_extraction(extraction)
+        return aggregate
+
+    def _entry(self, message):
+        if message not in self.messages:
+            self.messages[message] = {
+                "Occurrences": 0, "Test Cases": set(), "Date Counts": defaultdict(int),
+                "Category": None, "first_seen": None, "last_seen": None,
+            }
+        return self.messages[message]
+
+    def add_extraction(self, extraction):
+        """
+        Fold the issues of one extracted report into the aggregate.
+
+        """
+        campaign_date = extraction.campaign_date
+        self.campaign_details[extraction.filepath] = extraction.campaign_details
+        self.dates.add(campaign_date)
+
+        for position, issue in enumerate(extraction.issues):
+            test_case_name = issue["test_case"]
+            if ERROR_TEST_CASE_EXCLUDE_PATTERN.match(test_case_name):
+                continue
+            message = issue["message"].split(":", 1)[-1].strip()
+            order_key = [campaign_date, extraction.filepath, position]
+
+            entry = self._entry(message)
+            entry["Occurrences"] += 1
+            entry["Test Cases"].add(test_case_name)
+            entry["Date Counts"][campaign_date] += 1
+            if entry["first_seen"] is None or order_key < entry["first_seen"]:
+                entry["first_seen"] = order_key
+            if entry["last_seen"] is None or order_key > entry["last_seen"]:
+                entry["last_seen"] = order_key
+                entry["Category"] = issue["type"]
+
+    def update(self, other):
+        """
+        Fold another aggregate into this one in place.
+
+        """
+        for message, details in other.messages.items():
+            entry = self._entry(message)
+            entry["Occurrences"] += details["Occurrences"]
+            entry["Test Cases"] |= details["Test Cases"]
+            for date, count in details["Date Counts"].items():
+                entry["Date Counts"][date] += count
+            if entry["first_seen"] is None or details["first_seen"] < entry["first_seen"]:
+                entry["first_seen"] = details["first_seen"]
+            if entry["last_seen"] is None or details["last_seen"] > entry["last_seen"]:
+                entry["last_seen"] = details["last_seen"]
+                entry["Category"] = details["Category"]
+        self.campaign_details.update(other.campaign_details)
+        self.dates |= other.dates
+
+    def merge(self, other):
+        """
+        Return a new aggregate combining this one and other.
+
+        """
+        merged = ErrorAggregate()
+        merged.update(self)
+        merged.update(other)
+        return merged
+
+    def error_analysis(self):
+        """
+        Return (messages in first-occurrence order, sorted dates, campaign details).
+
+        """
+        error_analysis = {
+            message: self.messages[message]
+            for message in sorted(self.messages, key=lambda message: self.messages[message]["first_seen"])
+        }
+        campaign_details = {filepath: self.campaign_details[filepath] for filepath in sorted(self.campaign_details)}
+        return error_analysis, sorted(self.dates), campaign_details
+
+    def to_dict(self):
+        """
+        Serialize the aggregate to JSON-compatible data.
+
+        """
+        messages = {
+            message: {
+                **details, "Test Cases": sorted(details["Test Cases"]), "Date Counts": dict(details["Date Counts"])
+            }
+            for message, details in self.messages.items()
+        }
+        return {"messages": messages, "campaign_details": self.campaign_details, "dates": sorted(self.dates)}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild an aggregate from the output of to_dict.
+
+        """
+        aggregate = cls()
+        for message, details in data["messages"].items():
+            entry = aggregate._entry(message)
+            entry.update(details)
+            entry["Test Cases"] = set(details["Test Cases"])
+            entry["Date Counts"] = defaultdict(int, details["Date Counts"])
+        aggregate.campaign_details = dict(data["campaign_details"])
+        aggregate.dates = set(data["dates"])
+        return aggregate
+
+
+def merge_aggregates(aggregates):
+    """
+    Merge a non-empty sequence of aggregates of the same kind into a new one.
+
+    Every aggregate is folded into a single accumulator, so merging n shards costs their total size.
+
+    """
+    merged = None
+    for aggregate in aggregates:
+        if merged is None:
+            merged = type(aggregate)()
+        merged.update(aggregate)
+    return merged
+
+
+def save_aggregate(aggregate, path):
+    """
+    Write an aggregate to a JSON file.
+
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"kind": type(aggregate).__name__, "data": aggregate.to_dict()}, f)
+
+
+def load_aggregate(path):
+    """
+    Load an aggregate written by save_aggregate.
+
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    kind = {"StabilityAggregate": StabilityAggregate, "ErrorAggregate": ErrorAggregate}[payload["kind"]]
+    return kind.from_dict(payload["data"])
@@ -0,0 +1,170 @@
+import atexit
+import io
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from matplotlib.figure import Figure
+from openpyxl.drawing.image import Image
+
+CHART_WORKERS = min(4, (os.cpu_count() or 1) - 1)
+
+_chart_pool = None
+
+
+def _figure_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def _label_bars(ax, bars, heights):
+    # Counts centred in their bar segment, empty segments left unlabelled.
+    ax.bar_label(
+        bars, labels=[int(height) if height > 0 else "" for height in heights],
+        label_type="center", fontsize=9, color="white",
+    )
+
+
+def pie_chart_png(title, categories, counts, colors):
+    """
+    Render a category pie chart and return it as PNG bytes.
+
+    """
+    fig = Figure(figsize=(5, 5))
+    ax = fig.add_subplot()
+    ax.pie(counts, labels=categories, colors=colors, autopct='%1.1f%%', startangle=140)
+    ax.set_title(title)
+    return _figure_png(fig)
+
+
+def summary_plot_png(dates, series):
+    """
+    Render the stacked test case counts by date and return it as PNG bytes.
+
+    """
+    fig = Figure(figsize=(12, 6))
+    ax = fig.add_subplot()
+    cumulative_bottom = [0] * len(dates)
+
+    for category, color in zip(["Pass", "Fail", "Error", "Warning"], ["green", "red", "orange", "yellow"]):
+        bars = ax.bar(dates, series[category], color=color, label=category, bottom=cumulative_bottom)
+        _label_bars(ax, bars, series[category])
+        cumulative_bottom = [sum(val) for val in zip(cumulative_bottom, series[category])]
+
+    ax.legend()
+    ax.set_title("Test Case Counts by Date")
+    ax.set_xlabel("Dates")
+    ax.set_ylabel("Counts")
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
+    return _figure_png(fig)
+
+
+def cyclic_summary_plot_png(dates, passes, fails):
+    """
+    Render the passed and failed test cases per date and return it as PNG bytes.
+
+    """
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    x = range(len(dates))
+    cumulative_bottom = [0] * len(dates)
+
+    for heights, category, color in [(passes, "Pass", "green"), (fails, "Fail", "red")]:
+        bars = ax.bar(x, heights, color=color, bottom=cumulative_bottom, label=category)
+        _label_bars(ax, bars, heights)
+        cumulative_bottom = [sum(val) for val in zip(cumulative_bottom, heights)]
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(dates, rotation=45, ha="right")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Count")
+    ax.set_title("Cyclic Summary by Date")
+    ax.legend()
+    fig.tight_layout()
+    return _figure_png(fig)
+
+
+def _render(function, args):
+    started = time.time()
+    png = function(*args)
+    return png, started, time.time()
+
+
+def chart_pool():
+    """
+    Return the shared chart rendering pool, started on first use, or None when charts render inline.
+
+    """
+    global _chart_pool
+    if _chart_pool is None and CHART_WORKERS > 0:
+        _chart_pool = ProcessPoolExecutor(max_workers=CHART_WORKERS)
+    return _chart_pool
+
+
+def shutdown_chart_pool():
+    """
+    Stop the chart rendering pool, if it was started, dropping charts nobody waits for.
+
+    """
+    global _chart_pool
+    if _chart_pool is not None:
+        _chart_pool.shutdown(wait=True, cancel_futures=True)
+        _chart_pool = None
+
+
+atexit.register(shutdown_chart_pool)
+
+
+class ChartJob:
+    """
+    A chart rendering to PNG bytes in the worker pool while the caller keeps assembling its workbook.
+
+    Rendering happens in the same functions whichever way it runs, so pooled and inline output are
+    identical. Charts render inline when no pool can be used.
+
+    """
+
+    def __init__(self, function, *args):
+        """
+        Submit function(*args) to the chart pool, or render it right away if there is no pool.
+
+        """
+        self.started = self.finished = None
+        try:
+            pool = chart_pool()
+            self.future = pool.submit(_render, function, args) if pool else None
+        except (OSError, RuntimeError, BrokenProcessPool):
+            self.future = None
+        if self.future is None:
+            self.future = Future()
+            self.future.set_result(_render(function, args))
+
+    def png(self):
+        """
+        Wait for the chart and return its PNG bytes.
+
+        """
+        png, self.started, self.finished = self.future.result()
+        return png
+
+    def image(self):
+        """
+        Wait for the chart and return it as an openpyxl image.
+
+        """
+        return Image(io.BytesIO(self.png()))
+
+
+def chart_timings(jobs, assembly_started, assembly_finished):
+    """
+    Describe how long the charts took to render and how much of it overlapped workbook assembly.
+
+    """
+    jobs = [job for job in jobs if job.started is not None]
+    render_time = sum(job.finished - job.started for job in jobs)
+    overlap = sum(
+        max(0.0, min(job.finished, assembly_finished) - max(job.started, assembly_started)) for job in jobs
+    )
+    return f"Rendered {len(jobs)} chart(s) in {render_time:.2f} s, {overlap:.2f} s of it alongside workbook assembly"
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import shutil
+import pandas as pd
+from Aggregates import load_aggregate, merge_aggregates, save_aggregate
+from ReportExtraction import extract_report
+from ReportIsolation import IsolatedExtractor
+from ReportReader import ReportPrefetcher, expand_inputs, report_size, report_stat
+
+CHECKPOINT_DIR = ".report_checkpoints"
+ISOLATE_FILES = True
+
+
+def run_key(kind, filepaths):
+    """
+    Identify a run by its kind and the path, size and modification time of every input.
+
+    """
+    digest = hashlib.sha1(kind.encode("utf-8"))
+    for filepath in sorted(map(os.path.abspath, filepaths)):
+        try:
+            stat = report_stat(filepath)
+            signature = f"{filepath}|{stat.st_size}|{stat.st_mtime}"
+        except OSError:
+            signature = f"{filepath}|missing"
+        digest.update(signature.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class RunCheckpoint:
+    """
+    Run-scoped directory holding one aggregate per finished input and the error of every failed one.
+
+    A rerun with the same inputs finds the same directory and only processes the files not finished yet.
+
+    """
+
+    def __init__(self, save_path, kind, filepaths):
+        """
+        Open, or create, the checkpoint directory of this run.
+
+        """
+        self.directory = os.path.join(save_path, CHECKPOINT_DIR, f"{kind}_{run_key(kind, filepaths)}")
+        os.makedirs(self.directory, exist_ok=True)
+        self.failures_path = os.path.join(self.directory, "failures.json")
+        self.failures = {}
+        if os.path.exists(self.failures_path):
+            with open(self.failures_path, "r", encoding="utf-8") as f:
+                self.failures = {
+                    filepath: failure if isinstance(failure, dict) else {"stage": None, "size": None, "error": failure}
+                    for filepath, failure in json.load(f).items()
+                }
+
+    def _path(self, filepath):
+        name = hashlib.sha1(os.path.abspath(filepath).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + ".json")
+
+    def done(self, filepath):
+        """
+        Return True if the aggregate of this input is already checkpointed.
+
+        """
+        return os.path.exists(self._path(filepath))
+
+    def temp_path(self, filepath):
+        """
+        Return the file an aggregate of this input is written to before commit makes it the checkpoint.
+
+        """
+        return self._path(filepath) + ".tmp"
+
+    def commit(self, filepath):
+        """
+        Atomically turn the aggregate written to temp_path into the checkpoint of this input.
+
+        """
+        os.replace(self.temp_path(filepath), self._path(filepath))
+        if self.failures.pop(filepath, None) is not None:
+            self._save_failures()
+
+    def save(self, filepath, aggregate):
+        """
+        Checkpoint the aggregate of one input, replacing the file atomically.
+
+        """
+        save_aggregate(aggregate, self.temp_path(filepath))
+        self.commit(filepath)
+
+    def load(self, filepath):
+        """
+        Load the checkpointed aggregate of one input.
+
+        """
+        return load_aggregate(self._path(filepath))
+
+    def record_failure(self, filepath, error, stage=None):
+        """
+        Record why an input could not be processed, at which stage, and its uncompressed size.
+
+        error is an exception or a message.
+
+        """
+        try:
+            size = report_size(filepath)
+        except Exception:
+            size = None
+        message = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+        self.failures[filepath] = {"stage": stage, "size": size, "error": message}
+        self._save_failures()
+        print(f"Skipping {filepath} ({stage or 'unknown'} stage, {size} bytes): {message}")
+
+    def _save_failures(self):
+        with open(self.failures_path, "w", encoding="utf-8") as f:
+            json.dump(self.failures, f, indent=1)
+
+    def skipped_inputs(self):
+        """
+        Return the failed inputs with their stage, size and error as a table.
+
+        """
+        return pd.DataFrame(
+            [(filepath, failure["stage"], failure["size"], failure["error"])
+             for filepath, failure in sorted(self.failures.items())],
+            columns=["File", "Stage", "Size (bytes)", "Error"],
+        )
+
+    def remove(self):
+        """
+        Delete the checkpoint directory once the run is complete, and its parent if no other run is left.
+
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+        try:
+            os.rmdir(os.path.dirname(self.directory))
+        except OSError:
+            pass
+
+
+def checkpointed_aggregates(filepaths, save_path, aggregate_class, regions):
+    """
+    Build one aggregate per input of a multi-file run, checkpointing each input as it finishes.
+
+    With ISOLATE_FILES each input is extracted in a worker process with a time and memory limit (see
+    IsolatedExtractor), which reads the next input ahead; otherwise inputs are read ahead by a
+    ReportPrefetcher. Failed inputs are recorded instead of aborting the run and retried on the next
+    run. Returns (aggregates of the finished inputs in input order, skipped inputs table); the
+    checkpoint is removed when every input succeeded. .zip archives are processed member by member.
+
+    """
+    filepaths = expand_inputs(filepaths)
+    checkpoint = RunCheckpoint(save_path, aggregate_class.__name__, filepaths)
+    missing = [filepath for filepath in filepaths if not checkpoint.done(filepath)]
+    if len(missing) < len(filepaths):
+        print(f"Resuming run from {checkpoint.directory}: {len(filepaths) - len(missing)} file(s) already done")
+
+    if ISOLATE_FILES:
+        extractor = IsolatedExtractor(aggregate_class, regions)
+        try:
+            for idx, filepath in enumerate(missing):
+                next_filepath = missing[idx + 1] if idx + 1 < len(missing) else None
+                failure = extractor.run(filepath, checkpoint.temp_path(filepath), next_filepath)
+                if failure is None:
+                    checkpoint.commit(filepath)
+                else:
+                    checkpoint.record_failure(filepath, failure["error"], failure["stage"])
+        finally:
+            extractor.close()
+    else:
+        for filepath, content, error in ReportPrefetcher(missing):
+            stage = "read"
+            if error is None:
+                try:
+                    stage = "extract"
+                    extraction = extract_report(filepath, content, regions)
+                except Exception as exc:
+                    error = exc
+            if error is not None:
+                checkpoint.record_failure(filepath, error, stage)
+                continue
+            checkpoint.save(filepath, aggregate_class.from_extractions([extraction]))
+
+    aggregates = [checkpoint.load(filepath) for filepath in filepaths if checkpoint.done(filepath)]
+    skipped_inputs = checkpoint.skipped_inputs()
+    if skipped_inputs.empty:
+        checkpoint.remove()
+    return aggregates, skipped_inputs
+
+
+def checkpointed_aggregate(filepaths, save_path, aggregate_class, regions):
+    """
+    Build the merged aggregate of a multi-file run with checkpointed_aggregates.
+
+    Returns (aggregate, skipped inputs table).
+
+    """
+    aggregates, skipped_inputs = checkpointed_aggregates(filepaths, save_path, aggregate_class, regions)
+    aggregate = merge_aggregates(aggregates) if aggregates else aggregate_class()
+    return aggregate, skipped_inputs
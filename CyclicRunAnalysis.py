@@ -1,149 +1,147 @@
+import os
+import time
 import pandas as pd
-from collections import defaultdict
-import matplotlib.pyplot as plt
-from openpyxl.drawing.image import Image
 from openpyxl.styles import Font
-from Utils import (
-    parse_html,
-    prepare_message_rows,
-    generate_summary_piechart,
-    parse_issues,
-    find_closest_stimulation,
-    find_closest_test_case
-)
-
-def process_content_cyclic_run(soup, stimulations, test_cases, keyword, target_dict):
-    """
-    Process HTML content for cyclic runs, allowing duplicates for passes and warnings.
+from Charts import chart_timings
+from HtmlReport import svg_pie_chart, write_html_report, write_json_summary
+from ReportExtraction import extract_report
+from SheetExport import export_full_tables, write_sheet
+from Timeline import TIMELINE_SHEETS, prepare_timeline_frames
+from ReportFrames import issue_frame, valuation_frame
+from Utils import generate_summary_piechart, summary_piechart_job
 
-    """
-    for div in soup.find_all("div", class_="content"):
-        if "Valuation" in div.text and keyword in div.text:
-            stimulation = find_closest_stimulation(stimulations, div.sourceline)
-            test_case = find_closest_test_case(test_cases, div.sourceline)
-            target_dict[stimulation]["stimulations"].append(stimulation)
-            target_dict[stimulation]["test_cases"].append(test_case)
-
-def extract_cyclic_messages(html_file):
+PARSE_REGIONS = ("campaign", "titles", "valuations", "issues")
+FAILING_VALUATIONS = frozenset(("Failure", "Error"))
+
+
+def extract_cyclic_messages(html_file, extraction=None):
     """
     Extract messages from the provided HTML file for cyclic run analysis.
 
+    Issues are the extracted issue records with their duplicates; passes and warnings are
+    {(stimulation, test case): count} counters.
+
     """
-    soup = parse_html(html_file)
-
-    passes = defaultdict(lambda: {"stimulations": [], "test_cases": []})
-    warnings = defaultdict(lambda: {"stimulations": [], "test_cases": []})
-    issues = defaultdict(lambda: {
-        "stimulations": [],
-        "test_cases": [],
-        "messages": [],
-        "types": [],
-        "times": [],
-        "previous_actions": []
-    })
+    extraction = extraction or extract_report(html_file, regions=PARSE_REGIONS)
 
-    stimulations = [
-        (div, div.find("span", class_="highlight").get_text(strip=True))
-        for div in soup.find_all("div") if "title" in div.get("class", []) and div.find("span", class_="highlight")
-    ]
-
-    test_cases = [
-        (div, div.get_text(strip=True).split()[0])
-        for div in soup.find_all("div") if "title" in div.get("class", []) and "test" in div.get("class", [])
-    ]
-
-    for tag in soup.find_all("span", class_=True):
-        issue = parse_issues(tag, stimulations)
-        if issue:
-            issues[issue["stimulation"]]["stimulations"].append(issue["stimulation"])
-            issues[issue["stimulation"]]["test_cases"].append(issue["test_case"])
-            issues[issue["stimulation"]]["messages"].append(issue["message"])
-            issues[issue["stimulation"]]["types"].append(issue["type"])
-            issues[issue["stimulation"]]["times"].append(issue["timestamp"])
-            issues[issue["stimulation"]]["previous_actions"].append(issue["previous_actions"])
-
-    process_content_cyclic_run(soup, stimulations, test_cases, "PASS", passes)
-
-    process_content_cyclic_run(soup, stimulations, test_cases, "WARNING", warnings)
-
-    campaign_details = {}
-    campaign_section = soup.find("div", {"data-tab": "campaign"})
-    if campaign_section:
-        for row in campaign_section.find_all("tr"):
-            columns = row.find_all("td")
-            if len(columns) == 2:
-                key = columns[0].get_text(strip=True)
-                value = columns[1].get_text(strip=True)
-                campaign_details[key] = value
-    return passes, issues, warnings, campaign_details
-
-
-def generate_excel_report(output_file, passes, warnings, issues, campaign_details):
+    return extraction.passes, extraction.issues, extraction.warnings, extraction.campaign_table
+
+
+CAMPAIGN_INFO = [
+    ("Campaign Name", "Campaign name"),
+    ("Campaign Date", "Campaign date"),
+    ("Duration", "Duration"),
+    ("ENNA Version", "ENNA version"),
+    ("Python Version", "Python version"),
+    ("Train", "Train"),
+]
+
+
+def prepare_unique_rows(counts):
     """
-    Generate an Excel report with issues, warnings, passes, and campaign details.
+    Build the unique (test case, stimulation) table of passes or warnings and their total count.
+
+    Rows are grouped by stimulation in first-seen order, with each test case shown once. The first
+    valuation of the run is left out, as in the single day report.
 
     """
-    issues_data_frame = pd.DataFrame(
-        prepare_message_rows(issues),
-        columns=["Test Case", "Type", "Stimulation", "Message", "Time", "Previous Actions"],
-    )
-    issues_data_frame.insert(5, "Jira Ticket", "")
-    issues_data_frame.insert(6, "Jira Status", "")
-    issues_data_frame.insert(7, "Comments", "")
+    counts = dict(counts)
+    if counts:
+        first = next(iter(counts))
+        counts[first] -= 1
+        if not counts[first]:
+            del counts[first]
 
-    passes_data_frame = pd.DataFrame(
-        prepare_message_rows(passes, is_pass=True, retain_duplicates=True),
-        columns=["Test Case", "Stimulation", "Message"],
-    )
+    return valuation_frame(counts, adjacent_blanks=False), sum(counts.values())
 
-    warnings_data_frame = pd.DataFrame(
-        prepare_message_rows(warnings, is_pass=True, retain_duplicates=True),
-        columns=["Test Case", "Stimulation", "Message"],
-    )
 
-    if not passes_data_frame.empty:
-        passes_data_frame = passes_data_frame.iloc[1:]
-    if not warnings_data_frame.empty:
-        warnings_data_frame = warnings_data_frame.iloc[1:]
+def prepare_report_frames(passes, warnings, issues):
+    """
+    Build the Issues, unique Passes and unique Warnings tables and the category counts for a cyclic run.
+
+    """
+    issues_data_frame, type_counts = issue_frame(issues, dedup_rows=True, adjacent_blanks=False)
+    unique_passes_df, total_passes = prepare_unique_rows(passes)
+    unique_warnings_df, total_warnings = prepare_unique_rows(warnings)
 
-    total_passes = (len(passes_data_frame) - 1) // 2 if not passes_data_frame.empty else 0
-    total_warnings = (len(warnings_data_frame) - 1) // 2 if not warnings_data_frame.empty else 0
-    total_failures = len(issues_data_frame[issues_data_frame["Type"] == "Failure"])
-    total_errors = len(issues_data_frame[issues_data_frame["Type"] == "Error"])
     category_counts = {
         "Passes": total_passes,
         "Warnings": total_warnings,
-        "Failures": total_failures,
-        "Errors": total_errors,
+        "Failures": type_counts["Failure"],
+        "Errors": type_counts["Error"],
     }
+    return issues_data_frame, unique_passes_df, unique_warnings_df, category_counts
+
 
-    unique_passes_df = passes_data_frame.drop_duplicates(subset=["Test Case", "Stimulation"]).reset_index(drop=True)
-    unique_warnings_df = warnings_data_frame.drop_duplicates(subset=["Test Case", "Stimulation"]).reset_index(drop=True)
+def prepare_cycle_frames(cycle_counts):
+    """
+    Build the per-cycle results and the per-test-case cycle statistics from the cycle counters.
 
-    for df in [issues_data_frame, unique_passes_df, unique_warnings_df]:
-        df["Test Case"] = df["Test Case"].mask(df["Test Case"].duplicated(), "")
+    A cycle or test case fails when it has any Failure or Error valuation.
+
+    """
+    cycles = {}
+    test_cases = {}
+    for (cycle, stimulation, test_case, valuation), count in cycle_counts.items():
+        totals = cycles.setdefault(cycle, {"Pass": 0, "Warning": 0, "Failure": 0, "Error": 0, "failed": set()})
+        totals[valuation] += count
+        runs = test_cases.setdefault(test_case, {"run": set(), "failed": set()})
+        runs["run"].add(cycle)
+        if valuation in FAILING_VALUATIONS:
+            totals["failed"].add(test_case)
+            runs["failed"].add(cycle)
+
+    cycles_df = pd.DataFrame(
+        [
+            (cycle, "Fail" if totals["failed"] else "Pass", totals["Pass"], totals["Warning"],
+             totals["Failure"], totals["Error"], "; ".join(sorted(totals["failed"])))
+            for cycle, totals in sorted(cycles.items())
+        ],
+        columns=["Cycle", "Result", "Passes", "Warnings", "Failures", "Errors", "Failed Test Cases"],
+    )
+    test_cases_df = pd.DataFrame(
+        [
+            (test_case, len(runs["run"]), len(runs["failed"]), min(runs["failed"], default="--"),
+             round(len(runs["failed"]) / len(runs["run"]) * 100, 2))
+            for test_case, runs in sorted(test_cases.items())
+        ],
+        columns=["Test Case", "Cycles Run", "Failed Cycles", "First Failing Cycle", "Failure Rate (%)"],
+    )
+    return cycles_df, test_cases_df
+
+
+def generate_excel_report(output_file, passes, warnings, issues, campaign_details, cycle_counts=None,
+                          timeline_frames=()):
+    """
+    Generate an Excel report with issues, warnings, passes, campaign details, per-cycle results and the timeline.
+
+    Returns the tables by sheet name.
+
+    """
+    issues_data_frame, unique_passes_df, unique_warnings_df, category_counts = prepare_report_frames(
+        passes, warnings, issues
+    )
+    cycles_df, test_case_cycles_df = prepare_cycle_frames(cycle_counts or {})
+    pie_chart = summary_piechart_job(category_counts)
+    assembly_started = time.time()
+
+    tables = {"Issues": issues_data_frame, "Warnings": unique_warnings_df, "Passes": unique_passes_df}
+    extra_tables = {"Cycles": cycles_df, "Test Case Cycles": test_case_cycles_df}
+    extra_tables.update(zip(TIMELINE_SHEETS, timeline_frames))
+    export_full_tables(output_file, {**tables, **extra_tables})
 
     with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-        issues_data_frame.to_excel(writer, sheet_name="Issues", index=False)
-        unique_warnings_df.to_excel(writer, sheet_name="Warnings", index=False)
-        unique_passes_df.to_excel(writer, sheet_name="Passes", index=False)
+        for sheet_name, data_frame in tables.items():
+            write_sheet(writer, output_file, data_frame, sheet_name)
 
-        generate_summary_piechart(writer, category_counts)
+        assembly_finished = time.time()
+        generate_summary_piechart(writer, category_counts, chart=pie_chart, anchor="E1")
 
         workbook = writer.book
         summary_sheet = workbook["Summary"]
 
-        campaign_info = [
-            ("Campaign Name", "Campaign name"),
-            ("Campaign Date", "Campaign date"),
-            ("Duration", "Duration"),
-            ("ENNA Version", "ENNA version"),
-            ("Python Version", "Python version"),
-            ("Train", "Train"),
-        ]
-
         row_idx = 1
-        for label, key in campaign_info:
+        for label, key in CAMPAIGN_INFO:
             if key in campaign_details:
                 summary_sheet.cell(row=row_idx, column=1, value=label).font = Font(bold=True)
                 summary_sheet.cell(row=row_idx, column=2, value=campaign_details[key])
@@ -153,22 +151,71 @@ def generate_excel_report(output_file, passes, warnings, issues, campaign_detail
         for idx, (category, count) in enumerate(category_counts.items(), start=start_row):
             summary_sheet.cell(row=idx, column=1, value=category).font = Font(bold=True)
             summary_sheet.cell(row=idx, column=2, value=count)
+        cycles_row = start_row + len(category_counts)
+        summary_sheet.cell(row=cycles_row, column=1, value="Cycles").font = Font(bold=True)
+        summary_sheet.cell(row=cycles_row, column=2, value=len(cycles_df))
 
-        pie_chart_image = "summary_piechart.png"
-        img = Image(pie_chart_image)
-        summary_sheet.add_image(img, "E1")
+        for sheet_name, data_frame in extra_tables.items():
+            write_sheet(writer, output_file, data_frame, sheet_name)
 
     print(f"Excel report generated at {output_file}")
+    print(chart_timings([pie_chart], assembly_started, assembly_finished))
+    return {**tables, **extra_tables}
 
 
-def analyze_cyclic_run(html_file, save_path):
+def generate_html_report(output_file, passes, warnings, issues, campaign_details, cycle_counts=None,
+                         timeline_frames=()):
     """
-    Analyze the provided HTML file for cyclic run data and generate a summary report.
+    Generate an HTML report and a JSON summary for a cyclic run; returns the tables by name.
 
     """
-    passes, issues, warnings, campaign_details = extract_cyclic_messages(html_file)
+    issues_data_frame, unique_passes_df, unique_warnings_df, category_counts = prepare_report_frames(
+        passes, warnings, issues
+    )
+    cycles_df, test_case_cycles_df = prepare_cycle_frames(cycle_counts or {})
+    campaign_rows = [(label, campaign_details[key]) for label, key in CAMPAIGN_INFO if key in campaign_details]
+    tables = {
+        "Issues": issues_data_frame, "Warnings": unique_warnings_df, "Passes": unique_passes_df,
+        "Cycles": cycles_df, "Test Case Cycles": test_case_cycles_df,
+    }
+    tables.update(zip(TIMELINE_SHEETS, timeline_frames))
+
+    write_html_report(
+        output_file,
+        "Cyclic Run Analysis",
+        summary_rows=campaign_rows + list(category_counts.items()) + [("Cycles", len(cycles_df))],
+        charts=[svg_pie_chart("Summary", category_counts)],
+        tables=list(tables.items()),
+    )
+    write_json_summary(os.path.splitext(output_file)[0] + ".json", {
+        "campaign": dict(campaign_rows),
+        "counts": category_counts,
+        "cycles": cycles_df.to_dict(orient="records"),
+        "test_case_cycles": test_case_cycles_df.to_dict(orient="records"),
+        "issues": issues_data_frame.to_dict(orient="records"),
+        "timeline": {name: df.to_dict(orient="records") for name, df in zip(TIMELINE_SHEETS, timeline_frames)},
+    })
 
-    output_file = f"{save_path}/{html_file.split('/')[-1]}_cyclic_summary.xlsx"
+    print(f"HTML report and JSON summary generated at {output_file}")
+    return tables
 
-    generate_excel_report(output_file, passes, warnings, issues, campaign_details)
 
+def analyze_cyclic_run(html_file, save_path, extraction=None, output_format="excel"):
+    """
+    Analyze the provided HTML file for cyclic run data and generate a summary report.
+
+    """
+    extraction = extraction or extract_report(html_file, regions=PARSE_REGIONS)
+    passes, issues, warnings, campaign_details = extract_cyclic_messages(html_file, extraction)
+    timeline_frames = prepare_timeline_frames(extraction.events)
+
+    if output_format == "html":
+        output_file = f"{save_path}/{html_file.split('/')[-1]}_cyclic_summary.html"
+        return generate_html_report(
+            output_file, passes, warnings, issues, campaign_details, extraction.cycle_counts, timeline_frames
+        )
+    else:
+        output_file = f"{save_path}/{html_file.split('/')[-1]}_cyclic_summary.xlsx"
+        return generate_excel_report(
+            output_file, passes, warnings, issues, campaign_details, extraction.cycle_counts, timeline_frames
+        )
@@ -1,8 +1,12 @@
 import pandas as pd
-from collections import defaultdict
 import os
-import re
-from Utils import add_campaign_details_rows, extract_campaign_details, parse_html, parse_issues
+from Aggregates import ErrorAggregate
+from Checkpoint import checkpointed_aggregate
+from ReportExtraction import extract_reports
+from HtmlReport import write_html_report, write_json_summary
+from Utils import campaign_details_rows
+
+PARSE_REGIONS = ("campaign", "issues")
 
 
 def extract_messages_from_files(filepaths):
@@ -10,59 +14,14 @@ def extract_messages_from_files(filepaths):
     Extract messages from multiple files and collect error statistics.
 
     """
-    error_failure_data = []
-    campaign_details = {}
-    dates = []
-
-    test_case_pattern = re.compile(r"^\d{2}_\d{2}$")
-
-    for filepath in filepaths:
-        soup = parse_html(filepath)
-
-        campaign_date, details = extract_campaign_details(filepath, soup)
-        campaign_details[filepath] = details
-        dates.append(campaign_date)
-
-        stimulations = []
-        for tag in soup.find_all("span", class_=True):
-            parsed_issue = parse_issues(tag, stimulations)
-            if not parsed_issue:
-                continue
+    return ErrorAggregate.from_extractions(extract_reports(filepaths, PARSE_REGIONS)).error_analysis()
 
-            test_case_name = parsed_issue["test_case"]
-            if test_case_pattern.match(test_case_name):
-                continue
 
-            error_failure_data.append({
-                "Test Case": test_case_name,
-                "Message": parsed_issue["message"].split(":", 1)[-1].strip(),
-                "Category": parsed_issue["type"],
-                "Date": campaign_date,
-            })
-
-    return error_failure_data, sorted(set(dates)), campaign_details
-
-
-def prepare_error_failure_analysis(error_failure_data, dates):
+def prepare_error_failure_analysis(error_analysis, dates, campaign_details=None):
     """
-    Prepare error failure analysis data for reporting.
+    Prepare error failure analysis data for reporting, with the campaign details per date below it when given.
 
     """
-    error_analysis = defaultdict(
-        lambda: {"Occurrences": 0, "Test Cases": set(), "Date Counts": defaultdict(int)}
-    )
-
-    for entry in error_failure_data:
-        message = entry["Message"]
-        category = entry["Category"]
-        test_case = entry["Test Case"]
-        date = entry["Date"]
-
-        error_analysis[message]["Occurrences"] += 1
-        error_analysis[message]["Test Cases"].add(test_case)
-        error_analysis[message]["Date Counts"][date] += 1
-        error_analysis[message]["Category"] = category
-
     error_analysis_data = []
     for message, details in error_analysis.items():
         row = {
@@ -75,20 +34,58 @@ def prepare_error_failure_analysis(error_failure_data, dates):
             row[date] = details["Date Counts"].get(date, "--")
         error_analysis_data.append(row)
 
+    if campaign_details is not None:
+        # The table has no "Test Case" column, so only the per-date values of these rows are kept.
+        error_analysis_data.extend(
+            {date: row[date] for date in dates} for row in campaign_details_rows(campaign_details, dates)
+        )
     return pd.DataFrame(error_analysis_data)
 
 
-def generate_error_statistics(filepaths, save_path):
+def generate_error_statistics(filepaths, save_path, extractions=None, output_format="excel"):
+    """
+    Generate a summary report for error statistics across multiple files, or already extracted reports.
+
+    Runs over files are checkpointed per file in save_path, so an interrupted run resumes where it
+    stopped; files that fail are listed in a "Skipped Inputs" sheet. Returns the tables of the report by name.
+
+    """
+    skipped_inputs = None
+    if extractions is None:
+        aggregate, skipped_inputs = checkpointed_aggregate(filepaths, save_path, ErrorAggregate, PARSE_REGIONS)
+    else:
+        aggregate = ErrorAggregate.from_extractions(extractions)
+    return render_error_statistics(aggregate, save_path, output_format, skipped_inputs)
+
+
+def render_error_statistics(aggregate, save_path, output_format="excel", skipped_inputs=None):
     """
-    Generate a summary report for error statistics across multiple files.
+    Write the error statistics report (Excel, or HTML with a JSON summary) from a possibly merged error aggregate,
+    and return its tables by name.
 
     """
-    error_failure_data, dates, campaign_details = extract_messages_from_files(filepaths)
+    error_analysis, dates, campaign_details = aggregate.error_analysis()
+
+    error_failure_df = prepare_error_failure_analysis(error_analysis, dates, campaign_details)
+    tables = {"Error-Failure Analysis": error_failure_df}
+    if skipped_inputs is not None and not skipped_inputs.empty:
+        tables["Skipped Inputs"] = skipped_inputs
+
+    if output_format == "html":
+        output_file = os.path.join(save_path, "ErrorStatistics_Summary.html")
+        write_html_report(output_file, "Error Statistics", tables=list(tables.items()))
+        write_json_summary(os.path.join(save_path, "ErrorStatistics_Summary.json"), {
+            "dates": dates,
+            "messages": error_failure_df.to_dict(orient="records"),
+            "skipped_inputs": skipped_inputs.to_dict(orient="records") if "Skipped Inputs" in tables else [],
+        })
+        print(f"Error statistics saved to {output_file}")
+        return tables
 
-    error_failure_df = prepare_error_failure_analysis(error_failure_data, dates)
-    add_campaign_details_rows(error_failure_df, campaign_details, dates)
     output_file = os.path.join(save_path, "ErrorStatistics_Summary.xlsx")
     with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-        error_failure_df.to_excel(writer, sheet_name="Error-Failure Analysis", index=False)
+        for sheet_name, data_frame in tables.items():
+            data_frame.to_excel(writer, sheet_name=sheet_name, index=False)
 
     print(f"Error statistics saved to {output_file}")
+    return tables
@@ -0,0 +1,249 @@
+import bisect
+import heapq
+import json
+import os
+from collections import deque
+import pandas as pd
+from ResultsCube import VALUATIONS
+
+FLAKINESS_INDEX_FILE = "flakiness_index.json"
+
+
+def outcome_from_counts(counts):
+    """
+    Reduce the valuation counts of one test case on one date to a single outcome.
+
+    """
+    if counts["Fail"] > 0 or counts["Error"] > 0:
+        return "Fail"
+    if counts["Pass"] > 0:
+        return "Pass"
+    return None
+
+
+def summarize_history(history, window):
+    """
+    Compute the runs, flips, streak, rolling window and first/last failure of a test case from its
+    [date, report, outcome] history in date order.
+
+    """
+    entry = {
+        "runs": 0, "passes": 0, "flips": 0,
+        "last_outcome": None, "streak": 0,
+        "recent": deque(maxlen=window),
+        "first_failure": None, "last_failure": None,
+    }
+    for campaign_date, report, outcome in history:
+        fold_outcome(entry, campaign_date, outcome)
+    return entry
+
+
+def fold_outcome(entry, campaign_date, outcome):
+    """
+    Update the summary of a test case with an outcome newer than all the outcomes it holds.
+
+    """
+    entry["runs"] += 1
+    if outcome == "Pass":
+        entry["passes"] += 1
+    else:
+        if entry["first_failure"] is None:
+            entry["first_failure"] = campaign_date
+        entry["last_failure"] = campaign_date
+
+    if entry["last_outcome"] == outcome:
+        entry["streak"] += 1
+    else:
+        if entry["last_outcome"] is not None:
+            entry["flips"] += 1
+        entry["streak"] = 1
+    entry["last_outcome"] = outcome
+    entry["recent"].append(outcome == "Pass")
+
+
+class FlakinessIndex:
+    """
+    Per-test-case pass/fail history that is updated incrementally as reports arrive.
+
+    Outcomes are keyed by report, so several reports of the same date all count and adding a report
+    again replaces its outcomes instead of counting them twice. Each test case keeps its history in
+    date order: a report newer than the history is folded into the summary directly, an older one is
+    inserted in place and the summary of the test case is recomputed.
+
+    """
+
+    def __init__(self, window=10):
+        """
+        Initialize an empty index with the given rolling window size.
+
+        """
+        self.window = window
+        self.reports = {}
+        self.histories = {}
+        self.test_cases = {}
+
+    def add_report(self, report, campaign_date, outcomes):
+        """
+        Fold the outcomes ({test case: "Pass"/"Fail"}) of one report of a campaign date into the index.
+
+        report identifies the report, such as its file path. A report that was already ingested with
+        the same date and outcomes is ignored, so re-running over the same files is safe; one whose
+        date or outcomes changed replaces them.
+
+        """
+        if campaign_date == "Unknown Date":
+            return False
+        outcomes = {test_case: outcome for test_case, outcome in outcomes.items() if outcome is not None}
+        if report in self.reports:
+            if self.reports[report] == [campaign_date, outcomes]:
+                return False
+            self.remove_report(report)
+        self.reports[report] = [campaign_date, outcomes]
+
+        key = [campaign_date, report]
+        for test_case, outcome in outcomes.items():
+            history = self.histories.setdefault(test_case, [])
+            if not history or history[-1][:2] < key:
+                history.append(key + [outcome])
+                entry = self.test_cases.get(test_case)
+                if entry is None:
+                    entry = self.test_cases[test_case] = summarize_history([], self.window)
+                fold_outcome(entry, campaign_date, outcome)
+            else:
+                bisect.insort(history, key + [outcome])
+                self.test_cases[test_case] = summarize_history(history, self.window)
+        return True
+
+    def remove_report(self, report):
+        """
+        Drop the outcomes of a report from the index.
+
+        """
+        if report not in self.reports:
+            return False
+        campaign_date, outcomes = self.reports.pop(report)
+        for test_case in outcomes:
+            history = [item for item in self.histories[test_case] if item[1] != report]
+            if history:
+                self.histories[test_case] = history
+                self.test_cases[test_case] = summarize_history(history, self.window)
+            else:
+                del self.histories[test_case]
+                del self.test_cases[test_case]
+        return True
+
+    def add_aggregates(self, aggregates):
+        """
+        Ingest StabilityAggregates of one report each, such as the checkpoints of a run, keyed by file path.
+
+        """
+        reports = []
+        for aggregate in aggregates:
+            if len(aggregate.campaign_details) != 1:
+                raise ValueError("FlakinessIndex needs one aggregate per report")
+            reports.append((next(iter(aggregate.dates)), next(iter(aggregate.campaign_details)), aggregate))
+        for campaign_date, filepath, aggregate in sorted(reports, key=lambda report: report[:2]):
+            outcomes = {
+                test_case: outcome_from_counts(date_counts[campaign_date])
+                for test_case, date_counts in aggregate.counts.items() if campaign_date in date_counts
+            }
+            self.add_report(filepath, campaign_date, outcomes)
+
+    def add_cube(self, cube):
+        """
+        Ingest a ResultsCube, or a slice of one, with one report per bench and date.
+
+        """
+        for date_idx, campaign_date in enumerate(cube.dates):
+            for bench_idx, bench in enumerate(cube.benches):
+                outcomes = {}
+                for test_case, counts in zip(cube.test_cases, cube.counts[:, date_idx, bench_idx]):
+                    counts = dict(zip(VALUATIONS, map(int, counts)))
+                    if counts["Total"]:
+                        outcomes[test_case] = outcome_from_counts(counts)
+                if outcomes:
+                    self.add_report(f"{bench} {campaign_date}", campaign_date, outcomes)
+
+    def add_results(self, results, dates):
+        """
+        Ingest per-date results without report identity, such as those of a merged aggregate, as one
+        report per date.
+
+        """
+        for date in sorted(dates):
+            outcomes = {
+                test_case: outcome_from_counts(date_results[date])
+                for test_case, date_results in results.items() if date in date_results
+            }
+            self.add_report(date, date, outcomes)
+
+    @staticmethod
+    def flip_rate(entry):
+        """
+        Fraction of consecutive runs in which the outcome changed.
+
+        """
+        if entry["runs"] < 2:
+            return 0.0
+        return entry["flips"] / (entry["runs"] - 1)
+
+    def top_flakiest(self, k=20):
+        """
+        Return the k test cases with the highest flip rate as (test case, entry) pairs.
+
+        """
+        return heapq.nlargest(
+            k,
+            self.test_cases.items(),
+            key=lambda item: (self.flip_rate(item[1]), item[1]["flips"], item[1]["runs"] - item[1]["passes"]),
+        )
+
+    def to_dataframe(self, k=None):
+        """
+        Build the "Flakiness" sheet, flakiest test cases first.
+
+        """
+        ranked = self.top_flakiest(k if k is not None else len(self.test_cases))
+        rows = []
+        for test_case, entry in ranked:
+            recent = entry["recent"]
+            rows.append({
+                "Test Case": test_case,
+                "Runs": entry["runs"],
+                "Flips": entry["flips"],
+                "Flip Rate (%)": f"{self.flip_rate(entry) * 100:.2f}%",
+                "Current Streak": f"{entry['streak']} x {entry['last_outcome']}",
+                f"Stability Last {self.window} (%)": (
+                    f"{sum(recent) / len(recent) * 100:.2f}%" if recent else "--"
+                ),
+                "First Failure": entry["first_failure"] or "--",
+                "Last Failure": entry["last_failure"] or "--",
+            })
+        return pd.DataFrame(rows, columns=[
+            "Test Case", "Runs", "Flips", "Flip Rate (%)", "Current Streak",
+            f"Stability Last {self.window} (%)", "First Failure", "Last Failure",
+        ])
+
+    def save(self, path):
+        """
+        Write the outcomes of every report to a JSON file; the summaries are recomputed on load.
+
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"window": self.window, "reports": self.reports}, f)
+
+    @classmethod
+    def load(cls, path, window=10):
+        """
+        Load an index from a JSON file, or return an empty one if the file does not exist.
+
+        """
+        if not os.path.exists(path):
+            return cls(window)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(data["window"])
+        reports = sorted(data["reports"].items(), key=lambda item: (item[1][0], item[0]))
+        for report, (campaign_date, outcomes) in reports:
+            index.add_report(report, campaign_date, outcomes)
+        return index
@@ -0,0 +1,167 @@
+import json
+import math
+from html import escape
+
+CATEGORY_COLORS = {
+    "Passes": "green", "Warnings": "yellow", "Failures": "orange", "Errors": "red",
+    "Pass": "green", "Fail": "red", "Error": "orange", "Warning": "yellow",
+}
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body{{font-family:sans-serif;margin:20px}}
+table{{border-collapse:collapse;margin-bottom:24px}}
+th,td{{border:1px solid #ccc;padding:3px 8px;text-align:left;white-space:pre-wrap}}
+th{{background:#eee;cursor:pointer}}
+svg{{margin:8px 24px 24px 0}}
+</style>
+<script>
+function sortTable(th){{
+  var table=th.closest("table"),body=table.tBodies[0],idx=th.cellIndex,asc=th.dataset.asc!=="1";
+  var rows=Array.prototype.slice.call(body.rows);
+  rows.sort(function(a,b){{
+    var x=a.cells[idx].textContent,y=b.cells[idx].textContent,nx=parseFloat(x),ny=parseFloat(y);
+    var r=(!isNaN(nx)&&!isNaN(ny))?nx-ny:x.localeCompare(y);
+    return asc?r:-r;
+  }});
+  rows.forEach(function(r){{body.appendChild(r);}});
+  th.dataset.asc=asc?"1":"0";
+}}
+</script>
+</head><body>
+<h1>{title}</h1>
+"""
+
+
+def _cell(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return escape(str(value))
+
+
+def write_key_values(f, rows):
+    """
+    Write (label, value) pairs as a two-column table.
+
+    """
+    f.write("<table>\n")
+    for label, value in rows:
+        f.write(f"<tr><th>{_cell(label)}</th><td>{_cell(value)}</td></tr>\n")
+    f.write("</table>\n")
+
+
+def write_table(f, name, df):
+    """
+    Write a DataFrame as a sortable table, one row at a time.
+
+    """
+    f.write(f"<h2>{escape(name)} ({len(df)})</h2>\n<table><thead><tr>")
+    for column in df.columns:
+        f.write(f'<th onclick="sortTable(this)">{_cell(column)}</th>')
+    f.write("</tr></thead><tbody>\n")
+    for row in df.itertuples(index=False, name=None):
+        f.write("<tr>" + "".join(f"<td>{_cell(value)}</td>" for value in row) + "</tr>\n")
+    f.write("</tbody></table>\n")
+
+
+def svg_pie_chart(title, counts, size=240):
+    """
+    Return an inline SVG pie chart of category counts.
+
+    """
+    total = sum(counts.values())
+    radius = size / 2 - 10
+    center = size / 2
+    parts = [f'<svg width="{size + 160}" height="{size + 30}" xmlns="http://www.w3.org/2000/svg">',
+             f'<text x="10" y="18" font-weight="bold">{escape(title)}</text>']
+    angle = -math.pi / 2
+    for idx, (category, count) in enumerate(counts.items()):
+        color = CATEGORY_COLORS.get(category, "gray")
+        if total and count:
+            sweep = 2 * math.pi * count / total
+            if count == total:
+                parts.append(f'<circle cx="{center}" cy="{center + 20}" r="{radius}" fill="{color}"/>')
+            else:
+                x1, y1 = center + radius * math.cos(angle), center + 20 + radius * math.sin(angle)
+                x2 = center + radius * math.cos(angle + sweep)
+                y2 = center + 20 + radius * math.sin(angle + sweep)
+                large_arc = 1 if sweep > math.pi else 0
+                parts.append(
+                    f'<path d="M{center},{center + 20} L{x1:.2f},{y1:.2f} '
+                    f'A{radius},{radius} 0 {large_arc},1 {x2:.2f},{y2:.2f} Z" fill="{color}"/>'
+                )
+            angle += sweep
+        percent = f" ({count / total * 100:.1f}%)" if total else ""
+        parts.append(f'<rect x="{size}" y="{40 + idx * 20}" width="12" height="12" fill="{color}"/>')
+        parts.append(f'<text x="{size + 18}" y="{51 + idx * 20}">{escape(category)}: {count}{percent}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def svg_stacked_bar_chart(title, labels, series, height=300):
+    """
+    Return an inline SVG stacked bar chart; series maps each category to one value per label.
+
+    """
+    bar_width = 40
+    gap = 20
+    width = max(len(labels), 1) * (bar_width + gap) + 160
+    totals = [sum(values[idx] for values in series.values()) for idx in range(len(labels))]
+    scale = (height - 80) / max(max(totals, default=0), 1)
+    parts = [f'<svg width="{width}" height="{height + 60}" xmlns="http://www.w3.org/2000/svg">',
+             f'<text x="10" y="18" font-weight="bold">{escape(title)}</text>']
+    for idx, label in enumerate(labels):
+        x = 20 + idx * (bar_width + gap)
+        bottom = height
+        for category, values in series.items():
+            value = values[idx]
+            if value <= 0:
+                continue
+            bar_height = value * scale
+            bottom -= bar_height
+            parts.append(
+                f'<rect x="{x}" y="{bottom:.2f}" width="{bar_width}" height="{bar_height:.2f}" '
+                f'fill="{CATEGORY_COLORS.get(category, "gray")}"><title>{escape(category)}: {value}</title></rect>'
+            )
+            parts.append(
+                f'<text x="{x + bar_width / 2}" y="{bottom + bar_height / 2 + 4:.2f}" font-size="10" '
+                f'text-anchor="middle" fill="white">{value}</text>'
+            )
+        parts.append(
+            f'<text x="{x + bar_width / 2}" y="{height + 14}" font-size="10" text-anchor="end" '
+            f'transform="rotate(-45 {x + bar_width / 2} {height + 14})">{escape(str(label))}</text>'
+        )
+    for idx, category in enumerate(series):
+        legend_x = width - 130
+        parts.append(f'<rect x="{legend_x}" y="{30 + idx * 20}" width="12" height="12" '
+                     f'fill="{CATEGORY_COLORS.get(category, "gray")}"/>')
+        parts.append(f'<text x="{legend_x + 18}" y="{41 + idx * 20}">{escape(category)}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def write_html_report(output_file, title, summary_rows=(), charts=(), tables=()):
+    """
+    Write a self-contained HTML report: a summary table, inline SVG charts and sortable tables.
+
+    """
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(PAGE_HEAD.format(title=escape(title)))
+        if summary_rows:
+            write_key_values(f, summary_rows)
+        for chart in charts:
+            f.write(chart)
+        f.write("\n")
+        for name, df in tables:
+            write_table(f, name, df)
+        f.write("</body></html>\n")
+
+
+def write_json_summary(output_file, summary):
+    """
+    Write the machine-readable summary of a report.
+
+    """
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=1, default=str)
@@ -0,0 +1,533 @@
+import bisect
+import json
+from array import array
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+import pandas as pd
+from ReportExtraction import extract_reports
+from ReportReader import expand_inputs, report_stat
+
+PARSE_REGIONS = ("campaign", "titles", "issues")
+MANIFEST_FILE = "manifest.json"
+SEGMENT_FILES = 50
+MERGE_THRESHOLD = 8
+TOKEN_PATTERN = re.compile(r"\w+")
+QUERY_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def tokenize(text):
+    """
+    Split text into lowercase word tokens.
+
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def encode_postings(postings):
+    """
+    Encode [(doc, positions)] sorted by doc as varints: doc delta, position count, position deltas.
+
+    """
+    out = bytearray()
+    previous_doc = 0
+    for doc, positions in postings:
+        values = [doc - previous_doc, len(positions)]
+        previous_position = 0
+        for position in positions:
+            values.append(position - previous_position)
+            previous_position = position
+        previous_doc = doc
+        for value in values:
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+    return bytes(out)
+
+
+def _varints(data):
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+
+
+def decode_postings(data):
+    """
+    Decode the output of encode_postings back into [(doc, positions)].
+
+    """
+    postings = []
+    values = _varints(data)
+    doc = 0
+    for doc_delta in values:
+        doc += doc_delta
+        positions = []
+        position = 0
+        for _ in range(next(values)):
+            position += next(values)
+            positions.append(position)
+        postings.append((doc, positions))
+    return postings
+
+
+def write_segment(directory, name, files, docs, term_postings):
+    """
+    Write a segment: its sorted term dictionary and files, its packed posting lists, and its occurrences
+    as JSON lines with a table of their byte offsets.
+
+    """
+    terms = sorted(term_postings)
+    offsets = []
+    with open(os.path.join(directory, name + ".postings"), "wb") as f:
+        for term in terms:
+            data = encode_postings(term_postings[term])
+            offsets.append([f.tell(), len(data)])
+            f.write(data)
+    with open(os.path.join(directory, name + ".terms.json"), "w", encoding="utf-8") as f:
+        json.dump({"files": files, "terms": terms, "offsets": offsets}, f)
+    doc_offsets = array("Q")
+    with open(os.path.join(directory, name + ".docs"), "wb") as f:
+        for doc in docs:
+            doc_offsets.append(f.tell())
+            f.write(json.dumps(doc).encode("utf-8") + b"\n")
+    with open(os.path.join(directory, name + ".docidx"), "wb") as f:
+        doc_offsets.tofile(f)
+
+
+class Segment:
+    """
+    Read-only view of one index segment; occurrences are read from disk only when a query returns them.
+
+    """
+
+    SUFFIXES = (".postings", ".terms.json", ".docs", ".docidx")
+
+    def __init__(self, directory, name):
+        """
+        Load the term dictionary, posting lists and occurrence offsets of the segment.
+
+        """
+        self.directory = directory
+        self.name = name
+        with open(os.path.join(directory, name + ".terms.json"), "r", encoding="utf-8") as f:
+            term_data = json.load(f)
+        self.files = term_data["files"]
+        self.terms = term_data["terms"]
+        self.offsets = term_data["offsets"]
+        with open(os.path.join(directory, name + ".postings"), "rb") as f:
+            self.data = f.read()
+        self.doc_offsets = array("Q")
+        with open(os.path.join(directory, name + ".docidx"), "rb") as f:
+            self.doc_offsets.frombytes(f.read())
+        # Kept open until close(), so occurrences are read without reopening the file per query.
+        self._docs_file = open(os.path.join(directory, name + ".docs"), "rb")
+        self._docs_lock = threading.Lock()
+
+    def postings(self, term):
+        """
+        Return the [(doc, positions)] of a term.
+
+        """
+        idx = bisect.bisect_left(self.terms, term)
+        if idx == len(self.terms) or self.terms[idx] != term:
+            return []
+        offset, length = self.offsets[idx]
+        return decode_postings(self.data[offset:offset + length])
+
+    def prefix_terms(self, prefix):
+        """
+        Return the terms starting with prefix.
+
+        """
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_left(self.terms, prefix + "\uffff")
+        return self.terms[start:end]
+
+    def docs(self, doc_ids):
+        """
+        Read the given occurrences, in order: [file id, test case, stimulation, type, message], or
+        return None if the segment was closed.
+
+        """
+        rows = []
+        with self._docs_lock:
+            if self._docs_file.closed:
+                return None
+            for doc in doc_ids:
+                self._docs_file.seek(self.doc_offsets[doc])
+                rows.append(json.loads(self._docs_file.readline()))
+        return rows
+
+    def all_docs(self):
+        """
+        Read every occurrence of the segment in order.
+
+        """
+        with open(os.path.join(self.directory, self.name + ".docs"), "rb") as f:
+            return [json.loads(line) for line in f]
+
+    def close(self):
+        """
+        Close the occurrences file; queries reading the segment afterwards get None from docs.
+
+        """
+        with self._docs_lock:
+            self._docs_file.close()
+
+    def remove(self):
+        """
+        Close the segment and delete its files.
+
+        Where a file cannot be deleted, the next MessageIndex opened on the directory removes it.
+
+        """
+        self.close()
+        for suffix in self.SUFFIXES:
+            try:
+                os.remove(os.path.join(self.directory, self.name + suffix))
+            except OSError:
+                pass
+
+
+class MessageIndex:
+    """
+    On-disk inverted index of issue messages: tokens to occurrences with test case, stimulation,
+    date, bench and file.
+
+    Reports are added incrementally as new segments; a changed report is re-indexed into a new segment
+    and its older occurrences are ignored until a merge drops them. Segments are merged in the
+    background once there are more than MERGE_THRESHOLD of them.
+
+    """
+
+    def __init__(self, directory):
+        """
+        Open, or create, the index stored in directory.
+
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = {"next_segment": 1, "segments": [], "files": {}}
+        manifest_path = os.path.join(directory, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self.segments = {name: Segment(directory, name) for name in self.manifest["segments"]}
+        for filename in os.listdir(directory):
+            if filename.startswith("seg_") and filename.split(".", 1)[0] not in self.segments:
+                os.remove(os.path.join(directory, filename))
+        self._lock = threading.Lock()
+        self._merge_lock = threading.Lock()
+        self._merge_thread = None
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self.pending_files = []
+        self.pending_docs = []
+        self.pending_terms = defaultdict(list)
+
+    def _save_manifest(self):
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(path + ".tmp", path)
+
+    def needs_indexing(self, filepath):
+        """
+        Return True if the report is new or changed since it was indexed.
+
+        """
+        stat = report_stat(filepath)
+        entry = self.manifest["files"].get(os.path.abspath(filepath))
+        return entry is None or entry["mtime"] != stat.st_mtime or entry["size"] != stat.st_size
+
+    def add_extraction(self, extraction):
+        """
+        Buffer the issues of one extracted report for the next segment.
+
+        """
+        filepath = os.path.abspath(extraction.filepath)
+        file_id = len(self.pending_files)
+        bench = extraction.campaign_details.get("Testbench", "Unknown")
+        self.pending_files.append([filepath, extraction.campaign_date, bench])
+
+        for issue in extraction.issues:
+            doc = len(self.pending_docs)
+            message = issue["message"].split(":", 1)[-1].strip()
+            self.pending_docs.append([file_id, issue["test_case"], issue["stimulation"], issue["type"], message])
+            positions = defaultdict(list)
+            for position, token in enumerate(tokenize(message)):
+                positions[token].append(position)
+            for token, token_positions in positions.items():
+                self.pending_terms[token].append((doc, token_positions))
+
+    def flush(self):
+        """
+        Write the buffered reports as a new segment.
+
+        """
+        if not self.pending_files:
+            return None
+        with self._lock:
+            name = f"seg_{self.manifest['next_segment']:06d}"
+            self.manifest["next_segment"] += 1
+        write_segment(self.directory, name, self.pending_files, self.pending_docs, self.pending_terms)
+        segment = Segment(self.directory, name)
+
+        with self._lock:
+            for filepath, campaign_date, bench in self.pending_files:
+                try:
+                    stat = report_stat(filepath)
+                    mtime, size = stat.st_mtime, stat.st_size
+                except OSError:
+                    mtime = size = None
+                self.manifest["files"][filepath] = {"mtime": mtime, "size": size, "segment": name}
+            self.manifest["segments"].append(name)
+            self.segments[name] = segment
+            self._save_manifest()
+        self._reset_pending()
+
+        if len(self.manifest["segments"]) > MERGE_THRESHOLD:
+            self.merge(self.smallest_segments(MERGE_THRESHOLD), background=True)
+        return name
+
+    def smallest_segments(self, count):
+        """
+        Return the names of the count smallest segments, which are merged first so that big segments
+        are rewritten rarely.
+
+        """
+        with self._lock:
+            names = list(self.manifest["segments"])
+        return sorted(names, key=lambda name: len(self.segments[name].doc_offsets))[:count]
+
+    def update(self, filepaths):
+        """
+        Index the new or changed reports among filepaths, one segment per SEGMENT_FILES reports.
+
+        .zip archives are indexed member by member.
+
+        """
+        filepaths = [filepath for filepath in expand_inputs(filepaths) if self.needs_indexing(filepath)]
+        for extraction in extract_reports(filepaths, PARSE_REGIONS):
+            self.add_extraction(extraction)
+            if len(self.pending_files) >= SEGMENT_FILES:
+                self.flush()
+        self.flush()
+        print(f"Indexed {len(filepaths)} report(s) into {self.directory}")
+
+    @staticmethod
+    def _live(files, segment, file_id):
+        entry = files.get(segment.files[file_id][0])
+        return entry is not None and entry["segment"] == segment.name
+
+    def merge(self, names=None, background=False):
+        """
+        Merge the given segments (all by default) into one, dropping occurrences of re-indexed reports.
+
+        Queries keep using the old segments until the merged one replaces them.
+
+        """
+        if background:
+            if self._merge_thread is None or not self._merge_thread.is_alive():
+                self._merge_thread = threading.Thread(target=self.merge, args=(names,), daemon=True)
+                self._merge_thread.start()
+            return self._merge_thread
+
+        with self._merge_lock:
+            return self._merge(names)
+
+    def _merge(self, names):
+        with self._lock:
+            names = [name for name in self.manifest["segments"] if names is None or name in names]
+            if len(names) < 2:
+                return None
+            name = f"seg_{self.manifest['next_segment']:06d}"
+            self.manifest["next_segment"] += 1
+            live_files = {
+                filepath: entry["segment"] for filepath, entry in self.manifest["files"].items()
+                if entry["segment"] in names
+            }
+
+        files, docs = [], []
+        term_postings = defaultdict(list)
+        for segment_name in names:
+            segment = self.segments[segment_name]
+            file_map = {}
+            for file_id, file_row in enumerate(segment.files):
+                if live_files.get(file_row[0]) == segment_name:
+                    file_map[file_id] = len(files)
+                    files.append(file_row)
+            doc_map = {}
+            for doc, row in enumerate(segment.all_docs()):
+                if row[0] in file_map:
+                    doc_map[doc] = len(docs)
+                    docs.append([file_map[row[0]]] + row[1:])
+            for idx, term in enumerate(segment.terms):
+                offset, length = segment.offsets[idx]
+                for doc, positions in decode_postings(segment.data[offset:offset + length]):
+                    if doc in doc_map:
+                        term_postings[term].append((doc_map[doc], positions))
+
+        write_segment(self.directory, name, files, docs, term_postings)
+        merged = Segment(self.directory, name)
+
+        with self._lock:
+            self.manifest["segments"] = [name] + [
+                segment_name for segment_name in self.manifest["segments"] if segment_name not in names
+            ]
+            for filepath, entry in list(self.manifest["files"].items()):
+                if entry["segment"] in names and live_files.get(filepath) == entry["segment"]:
+                    self.manifest["files"][filepath] = dict(entry, segment=name)
+            self.segments[name] = merged
+            old_segments = [self.segments.pop(segment_name) for segment_name in names]
+            self._save_manifest()
+        for segment in old_segments:
+            segment.remove()
+        return name
+
+    def wait_for_merge(self):
+        """
+        Wait until a background merge, if any, has finished.
+
+        """
+        if self._merge_thread is not None:
+            self._merge_thread.join()
+
+    def close(self):
+        """
+        Wait for a background merge and close every segment.
+
+        """
+        self.wait_for_merge()
+        with self._lock:
+            segments = list(self.segments.values())
+        for segment in segments:
+            segment.close()
+
+    def _clause_docs(self, segment, clause):
+        kind, tokens = clause
+        if kind == "term":
+            return {doc for doc, positions in segment.postings(tokens[0])}
+        if kind == "prefix":
+            return {doc for term in segment.prefix_terms(tokens[0]) for doc, positions in segment.postings(term)}
+
+        token_positions = [dict(segment.postings(token)) for token in tokens]
+        docs = set(token_positions[0])
+        for positions in token_positions[1:]:
+            docs &= set(positions)
+        return {
+            doc for doc in docs
+            if any(
+                all(start + offset in token_positions[offset][doc] for offset in range(1, len(tokens)))
+                for start in token_positions[0][doc]
+            )
+        }
+
+    @staticmethod
+    def parse_query(query):
+        """
+        Split a query into clauses: "quoted phrases", prefix* terms and plain terms, all required.
+
+        """
+        clauses = []
+        for phrase, word in QUERY_PATTERN.findall(query):
+            if phrase:
+                tokens = tokenize(phrase)
+                if len(tokens) == 1:
+                    clauses.append(("term", tokens))
+                elif tokens:
+                    clauses.append(("phrase", tokens))
+            elif word.endswith("*") and tokenize(word):
+                clauses.append(("prefix", tokenize(word)[:1]))
+            else:
+                clauses.extend(("term", [token]) for token in tokenize(word))
+        return clauses
+
+    def search(self, query):
+        """
+        Return every occurrence matching the query, ordered by date.
+
+        """
+        clauses = self.parse_query(query)
+        if not clauses:
+            return []
+        with self._lock:
+            segments = [self.segments[name] for name in self.manifest["segments"]]
+            files = dict(self.manifest["files"])
+
+        results = []
+        for segment in segments:
+            docs = None
+            for clause in clauses:
+                clause_docs = self._clause_docs(segment, clause)
+                docs = clause_docs if docs is None else docs & clause_docs
+                if not docs:
+                    break
+            if not docs:
+                continue
+            rows = segment.docs(sorted(docs))
+            if rows is None:
+                with self._lock:
+                    replaced = segment.name not in self.segments
+                if not replaced:
+                    raise ValueError(f"Message index {self.directory} is closed")
+                # A merge replaced the segment during the query; the manifest now lists the merged one.
+                return self.search(query)
+            for file_id, test_case, stimulation, issue_type, message in rows:
+                if not self._live(files, segment, file_id):
+                    continue
+                filepath, campaign_date, bench = segment.files[file_id]
+                results.append({
+                    "Message": message, "Category": issue_type, "Test Case": test_case,
+                    "Stimulation": stimulation, "Date": campaign_date, "Bench": bench, "File": filepath,
+                })
+        results.sort(key=lambda result: result["Date"])
+        return results
+
+
+def summarize_occurrences(results):
+    """
+    Group search results by message: occurrences, benches, test cases and first/last date.
+
+    """
+    columns = ["Message", "Category", "Occurrences", "Benches", "Test Cases", "First Seen", "Last Seen"]
+    if not results:
+        return pd.DataFrame(columns=columns)
+    df = pd.DataFrame(results)
+    summary = df.groupby("Message", sort=False).agg({
+        "Category": "last",
+        "File": "size",
+        "Bench": lambda values: ", ".join(sorted(set(values))),
+        "Test Case": lambda values: "; ".join(sorted(set(values))),
+        "Date": ["min", "max"],
+    })
+    summary.columns = columns[1:]
+    return summary.reset_index()[columns]
+
+
+if __name__ == "__main__":
+    command, index_dir = sys.argv[1], sys.argv[2]
+    index = MessageIndex(index_dir)
+    if command == "index":
+        index.update(sys.argv[3:])
+        index.wait_for_merge()
+    elif command == "merge":
+        index.merge()
+    elif command == "search":
+        started = time.perf_counter()
+        results = index.search(" ".join(sys.argv[3:]))
+        elapsed = time.perf_counter() - started
+        with pd.option_context("display.max_colwidth", 80, "display.width", 200):
+            print(summarize_occurrences(results).to_string(index=False))
+        print(f"{len(results)} occurrence(s) in {elapsed * 1000:.1f} ms")
+    index.close()
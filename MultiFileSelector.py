@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import filedialog
+from ReportReader import REPORT_FILE_TYPES
 
 
 class MultiFileSelector:
@@ -8,7 +9,8 @@ class MultiFileSelector:
 
     """
 
-    def __init__(self, master, test_callback, error_callback, max_files=20):
+    def __init__(self, master, test_callback, error_callback, max_files=20, diff_callback=None,
+                 slice_callback=None):
         """
         Initialize the MultiFileSelector class with GUI components.
 
@@ -21,6 +23,9 @@ class MultiFileSelector:
 
         self.test_callback = test_callback
         self.error_callback = error_callback
+        self.diff_callback = diff_callback
+        self.slice_callback = slice_callback
+        self.html_output_var = tk.BooleanVar()
 
         self.label = tk.Label(self.frame, text="Select up to 20 files:")
         self.label.grid(row=0, column=0)
@@ -43,11 +48,29 @@ class MultiFileSelector:
         )
         self.error_button.grid(row=2, column=1)
 
+        self.html_output_checkbox = tk.Checkbutton(
+            self.frame, text="HTML/JSON Output", variable=self.html_output_var
+        )
+        self.html_output_checkbox.grid(row=2, column=2)
+
+        self.diff_button = None
+        if self.diff_callback:
+            self.diff_button = tk.Button(
+                self.frame, text="Regression Diff", command=self.run_diff_analysis, state="disabled"
+            )
+            self.diff_button.grid(row=3, column=0, columnspan=2)
+
+        if self.slice_callback:
+            self.slice_button = tk.Button(
+                self.frame, text="Slice Saved Results", command=self.run_slice_analysis
+            )
+            self.slice_button.grid(row=4, column=0, columnspan=2)
+
     def select_files(self):
         """
         Open a file dialog to select multiple files and update the file list.
         """
-        selected_files = filedialog.askopenfilenames(filetypes=[("HTML Files", "*.html")])
+        selected_files = filedialog.askopenfilenames(filetypes=REPORT_FILE_TYPES)
 
         for filepath in selected_files:
             if len(self.filepaths) < self.max_files:
@@ -58,17 +81,37 @@ class MultiFileSelector:
         if self.filepaths:
             self.test_button["state"] = "normal"
             self.error_button["state"] = "normal"
+        if self.diff_button and len(self.filepaths) > 1:
+            self.diff_button["state"] = "normal"
 
         self.file_list_label.config(text="\n".join(self.filepaths))
 
+    def output_format(self):
+        """
+        Return the selected output format, "html" or "excel".
+        """
+        return "html" if self.html_output_var.get() else "excel"
+
     def run_test_analysis(self):
         """
         Run the test statistics analysis using the selected files.
         """
-        self.test_callback(self.filepaths)
+        self.test_callback(self.filepaths, self.output_format())
 
     def run_error_analysis(self):
         """
         Run the error statistics analysis using the selected files.
         """
-        self.error_callback(self.filepaths)
+        self.error_callback(self.filepaths, self.output_format())
+
+    def run_diff_analysis(self):
+        """
+        Run the regression diff of the last selected file against the files selected before it.
+        """
+        self.diff_callback(self.filepaths[:-1], self.filepaths[-1])
+
+    def run_slice_analysis(self):
+        """
+        Re-render the test statistics of a previous run for a slice of its results.
+        """
+        self.slice_callback(self.output_format())
@@ -1,10 +1,19 @@
 import pandas as pd
 from collections import defaultdict
-from openpyxl.drawing.image import Image
 from openpyxl.styles import Font
-import matplotlib.pyplot as plt
 import os
-from Utils import add_campaign_details_rows, extract_campaign_details, parse_html
+import time
+from Aggregates import StabilityAggregate, merge_aggregates
+from Charts import ChartJob, chart_timings, cyclic_summary_plot_png, summary_plot_png
+from Checkpoint import checkpointed_aggregates
+from ReportExtraction import extract_reports
+from ResultsCube import RESULTS_CUBE_FILE, ResultsCube
+from SheetExport import export_full_tables, write_sheet
+from HtmlReport import svg_stacked_bar_chart, write_html_report, write_json_summary
+from Utils import campaign_details_rows
+from FlakinessIndex import FLAKINESS_INDEX_FILE, FlakinessIndex
+
+PARSE_REGIONS = ("campaign", "tests")
 
 
 def extract_messages_from_files(filepaths):
@@ -12,56 +21,12 @@ def extract_messages_from_files(filepaths):
     Extract messages from multiple files and organize them by test case and date.
 
     """
-    all_results = defaultdict(
-        lambda: defaultdict(
-            lambda: {"Pass": 0, "Fail": 0, "Error": 0, "Warning": 0, "Total": 0}
-        )
-    )
-    campaign_details = {}
-    dates = []
-
-
-    for filepath in filepaths:
-        soup = parse_html(filepath)
-
-        campaign_date, details = extract_campaign_details(filepath, soup)
-        campaign_details[filepath] = details
-        dates.append(campaign_date)
-
-        for test_div in soup.find_all("div", attrs={"name": "test"}):
-            name_tag = test_div.find_next("b", text="Name")
-            valuation_tag = test_div.find_next("b", text="Valuation")
-            if name_tag and valuation_tag:
-                test_case_name = (
-                    name_tag.find_next_sibling(text=True)
-                    .strip()
-                    .replace(":", "")
-                    .strip()
-                )
-                valuation = (
-                    valuation_tag.find_next_sibling(text=True)
-                    .strip()
-                    .replace(":", "")
-                    .strip()
-                    .upper()
-                )
-                if test_case_name:
-                    all_results[test_case_name][campaign_date]["Total"] += 1
-                    if valuation == "PASS":
-                        all_results[test_case_name][campaign_date]["Pass"] += 1
-                    elif valuation == "FAIL":
-                        all_results[test_case_name][campaign_date]["Fail"] += 1
-                    elif valuation == "ERROR":
-                        all_results[test_case_name][campaign_date]["Error"] += 1
-                    elif valuation == "WARNING":
-                        all_results[test_case_name][campaign_date]["Warning"] += 1
-
-    return all_results, sorted(set(dates)), campaign_details
-
-
-def prepare_details_sheet_data(results, dates):
-    """
-    Prepare data for the "Details" sheet in the report.
+    return StabilityAggregate.from_extractions(extract_reports(filepaths, PARSE_REGIONS)).results()
+
+
+def prepare_details_sheet_data(results, dates, campaign_details=None):
+    """
+    Prepare data for the "Details" sheet in the report, with the campaign details rows below it when given.
 
     """
     test_case_data = []
@@ -93,11 +58,13 @@ def prepare_details_sheet_data(results, dates):
         )
         test_case_data.append(row)
 
+    if campaign_details is not None:
+        test_case_data.extend(campaign_details_rows(campaign_details, dates))
     return pd.DataFrame(test_case_data), date_columns
 
-def generate_summary_plot(date_columns, dates):
+def prepare_summary_plot_data(date_columns, dates):
     """
-    Generate a stacked bar chart for test case counts by date.
+    Sum the valuation counts of every test case per date.
 
     """
     plot_data = []
@@ -109,46 +76,23 @@ def generate_summary_plot(date_columns, dates):
         date_data["Date"] = date
         plot_data.append(date_data)
 
-    plot_df = pd.DataFrame(plot_data)
+    return pd.DataFrame(plot_data)
 
-    fig, ax = plt.subplots(figsize=(12, 6))
-    cumulative_bottom = pd.Series([0] * len(plot_df))
 
-    for category, color in zip(
-        ["Pass", "Fail", "Error", "Warning"], ["green", "red", "orange", "yellow"]
-    ):
-        bars = ax.bar(
-            plot_df["Date"],
-            plot_df[category],
-            color=color,
-            label=category,
-            bottom=cumulative_bottom,
-        )
-        for bar in bars:
-            if bar.get_height() > 0:
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2,
-                    bar.get_y() + bar.get_height() / 2,
-                    int(bar.get_height()),
-                    ha="center",
-                    va="center",
-                    fontsize=9,
-                    color="white",
-                )
-        cumulative_bottom += plot_df[category]
-
-    ax.legend()
-    ax.set_title("Test Case Counts by Date")
-    ax.set_xlabel("Dates")
-    ax.set_ylabel("Counts")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig("summary_plot.png")
-    plt.close()
-
-def generate_cyclic_summary_plot(results, dates, output_path, worksheet):
-    """
-    Generate a cyclic summary bar plot and add details to the worksheet.
+def generate_summary_plot(date_columns, dates):
+    """
+    Start rendering the stacked bar chart of test case counts by date.
+
+    """
+    plot_df = prepare_summary_plot_data(date_columns, dates)
+    series = {
+        category: [int(value) for value in plot_df[category]] for category in ["Pass", "Fail", "Error", "Warning"]
+    }
+    return ChartJob(summary_plot_png, list(plot_df["Date"]), series)
+
+def prepare_cyclic_summary_data(results, dates):
+    """
+    Count and list the passed and failed test cases per date.
 
     """
     cyclic_data = defaultdict(lambda: {"Pass": 0, "Fail": 0})
@@ -165,40 +109,29 @@ def generate_cyclic_summary_plot(results, dates, output_path, worksheet):
                     cyclic_data[date]["Pass"] += 1
                     passed_failed_details[date]["Pass"].append(test_case)
 
+    return cyclic_data, passed_failed_details
+
+
+def generate_cyclic_summary_plot(cyclic_data):
+    """
+    Start rendering the cyclic summary bar plot.
+
+    """
     cyclic_df = pd.DataFrame.from_dict(cyclic_data, orient="index").reset_index()
     cyclic_df.columns = ["Date", "Pass", "Fail"]
+    return ChartJob(
+        cyclic_summary_plot_png,
+        list(cyclic_df["Date"]),
+        [int(value) for value in cyclic_df["Pass"]],
+        [int(value) for value in cyclic_df["Fail"]],
+    )
+
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    x = range(len(cyclic_df["Date"]))
-    cumulative_bottom = [0] * len(cyclic_df)
-
-    for category, color in zip(["Pass", "Fail"], ["green", "red"]):
-        heights = cyclic_df[category]
-        bars = ax.bar(x, heights, color=color, bottom=cumulative_bottom, label=category)
-
-        for i, bar in enumerate(bars):
-            if bar.get_height() > 0:
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2,
-                    cumulative_bottom[i] + bar.get_height() / 2,
-                    int(bar.get_height()),
-                    ha="center",
-                    va="center",
-                    fontsize=9,
-                    color="white",
-                )
-        cumulative_bottom = [sum(val) for val in zip(cumulative_bottom, heights)]
-
-    ax.set_xticks(x)
-    ax.set_xticklabels(cyclic_df["Date"], rotation=45, ha="right")
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Count")
-    ax.set_title("Cyclic Summary by Date")
-    ax.legend()
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
+def write_cyclic_summary_details(worksheet, dates, passed_failed_details):
+    """
+    Write the passed and failed scripts of each date below the cyclic summary plot.
 
+    """
     row_idx = 36
     for date in dates:
         worksheet.cell(row=row_idx, column=1, value=f"Date: {date}").font = Font(bold=True)
@@ -212,28 +145,147 @@ def generate_cyclic_summary_plot(results, dates, output_path, worksheet):
         worksheet.cell(row=row_idx, column=2, value=", ".join(passed_failed_details[date]["Fail"]))
         row_idx += 2
 
-def generate_multi_file_summary(filepaths, save_path):
+def generate_multi_file_summary(filepaths, save_path, extractions=None, output_format="excel"):
     """
-    Generate a summary report for multiple files.
+    Generate a summary report for multiple files, or for already extracted reports.
+
+    Runs over files are checkpointed per file in save_path, so an interrupted run resumes where it
+    stopped; files that fail are listed in a "Skipped Inputs" sheet. The results are also saved as a
+    ResultsCube in save_path for render_results_slice. Returns the tables of the report by name.
+
+    """
+    skipped_inputs = None
+    if extractions is None:
+        aggregates, skipped_inputs = checkpointed_aggregates(filepaths, save_path, StabilityAggregate, PARSE_REGIONS)
+    else:
+        aggregates = [StabilityAggregate.from_extractions([extraction]) for extraction in extractions]
+    aggregate = merge_aggregates(aggregates) if aggregates else StabilityAggregate()
+    ResultsCube.from_aggregates(aggregates, aggregate).save(os.path.join(save_path, RESULTS_CUBE_FILE))
+    flakiness_index = update_flakiness_index(save_path, aggregates)
+    return render_multi_file_summary(aggregate, save_path, output_format, skipped_inputs, flakiness_index)
+
+
+def update_flakiness_index(save_path, aggregates):
+    """
+    Fold StabilityAggregates of one report each into the flakiness index saved in save_path, and
+    return the index.
+
+    Reports already in the index are not counted again, so this is safe to call on every run over
+    overlapping files.
 
     """
-    results, dates, campaign_details = extract_messages_from_files(filepaths)
-    details_df, date_columns = prepare_details_sheet_data(results, dates)
-    add_campaign_details_rows(details_df, campaign_details, dates)
+    index_path = os.path.join(save_path, FLAKINESS_INDEX_FILE)
+    flakiness_index = FlakinessIndex.load(index_path)
+    flakiness_index.add_aggregates(aggregates)
+    flakiness_index.save(index_path)
+    return flakiness_index
+
+
+def render_results_slice(cube_folder, save_path, since=None, until=None, benches=None, failing_only=False,
+                         output_format="excel"):
+    """
+    Re-render the summary report for a slice of a saved run (date range, benches, failing test cases
+    only) from its ResultsCube, without reading the reports again. The flakiness index of the run is
+    left as it is; the Flakiness sheet covers the slice only.
+
+    """
+    started = time.time()
+    cube = ResultsCube.load(os.path.join(cube_folder, RESULTS_CUBE_FILE))
+    cube_slice = cube.select(since=since, until=until, benches=benches, failing_only=failing_only)
+    flakiness_index = FlakinessIndex()
+    flakiness_index.add_cube(cube_slice)
+    render_multi_file_summary(cube_slice, save_path, output_format, flakiness_index=flakiness_index)
+    print(
+        f"Rendered {len(cube_slice.test_cases)} test case(s) over {len(cube_slice.dates)} date(s) "
+        f"in {time.time() - started:.2f} s"
+    )
+    return cube_slice
+
+
+def render_multi_file_summary(aggregate, save_path, output_format="excel", skipped_inputs=None,
+                              flakiness_index=None):
+    """
+    Write the summary report (Excel, or HTML with a JSON summary) from a possibly merged stability aggregate
+    or a ResultsCube, and return its tables by name.
+
+    The Flakiness sheet shows flakiness_index; without one, it is built from these results alone with
+    one report per date. The saved flakiness index is never changed here.
+
+    """
+    results, dates, campaign_details = aggregate.results()
+    details_df, date_columns = prepare_details_sheet_data(results, dates, campaign_details)
+
+    if flakiness_index is None:
+        flakiness_index = FlakinessIndex()
+        flakiness_index.add_results(results, dates)
+
+    tables = {"Details": details_df, "Flakiness": flakiness_index.to_dataframe()}
+    if skipped_inputs is not None and not skipped_inputs.empty:
+        tables["Skipped Inputs"] = skipped_inputs
+
+    if output_format == "html":
+        write_multi_file_html(save_path, results, dates, date_columns, tables)
+        return tables
+
+    cyclic_data, passed_failed_details = prepare_cyclic_summary_data(results, dates)
+    summary_plot = generate_summary_plot(date_columns, dates)
+    cyclic_plot = generate_cyclic_summary_plot(cyclic_data)
+    assembly_started = time.time()
 
     output_file = os.path.join(save_path, "MultiFileAnalysis_Summary.xlsx")
+    export_full_tables(output_file, tables)
+
     with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-        details_df.to_excel(writer, sheet_name="Details", index=False)
+        for sheet_name, data_frame in tables.items():
+            write_sheet(writer, output_file, data_frame, sheet_name)
 
-        generate_summary_plot(date_columns, dates)
         summary_plot_sheet = writer.book.create_sheet("Summary Plot")
-        summary_img = Image("summary_plot.png")
-        summary_plot_sheet.add_image(summary_img, "A1")
-
-        cyclic_plot_path = "cyclic_summary_plot.png"
         cyclic_plot_sheet = writer.book.create_sheet("Cyclic Summary Plot")
-        generate_cyclic_summary_plot(results, dates, cyclic_plot_path, cyclic_plot_sheet)
-        cyclic_img = Image(cyclic_plot_path)
-        cyclic_plot_sheet.add_image(cyclic_img, "A1")
+        write_cyclic_summary_details(cyclic_plot_sheet, dates, passed_failed_details)
+
+        assembly_finished = time.time()
+        summary_plot_sheet.add_image(summary_plot.image(), "A1")
+        cyclic_plot_sheet.add_image(cyclic_plot.image(), "A1")
+
+    print(f"Summary report saved to {output_file}")
+    print(chart_timings([summary_plot, cyclic_plot], assembly_started, assembly_finished))
+    return tables
+
+
+def write_multi_file_html(save_path, results, dates, date_columns, tables):
+    """
+    Write the summary report as a self-contained HTML page and a JSON summary.
+
+    """
+    counts_by_category = {
+        category: [sum(counts[category] for counts in date_columns[date]) for date in dates]
+        for category in ["Pass", "Fail", "Error", "Warning"]
+    }
+    cyclic_data, passed_failed_details = prepare_cyclic_summary_data(results, dates)
+    cyclic_dates = list(cyclic_data)
+
+    output_file = os.path.join(save_path, "MultiFileAnalysis_Summary.html")
+    write_html_report(
+        output_file,
+        "Multi File Analysis",
+        charts=[
+            svg_stacked_bar_chart("Test Case Counts by Date", dates, counts_by_category),
+            svg_stacked_bar_chart(
+                "Cyclic Summary by Date", cyclic_dates,
+                {category: [cyclic_data[date][category] for date in cyclic_dates] for category in ["Pass", "Fail"]},
+            ),
+        ],
+        tables=list(tables.items()),
+    )
+    write_json_summary(os.path.join(save_path, "MultiFileAnalysis_Summary.json"), {
+        "dates": dates,
+        "counts_by_date": {
+            date: {category: values[idx] for category, values in counts_by_category.items()}
+            for idx, date in enumerate(dates)
+        },
+        "scripts_by_date": {date: passed_failed_details[date] for date in cyclic_dates},
+        "details": tables["Details"].to_dict(orient="records"),
+        "skipped_inputs": tables["Skipped Inputs"].to_dict(orient="records") if "Skipped Inputs" in tables else [],
+    })
 
     print(f"Summary report saved to {output_file}")
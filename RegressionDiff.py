@@ -0,0 +1,138 @@
+import json
+import os
+import re
+import sys
+import pandas as pd
+from ReportExtraction import extract_reports
+
+PARSE_REGIONS = ("campaign", "titles", "valuations", "issues")
+FAILING_VALUATIONS = frozenset(("Failure", "Error"))
+NUMBER_PATTERN = re.compile(r"\d+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_message(message):
+    """
+    Normalize an issue message so that reruns of the same problem hash to the same key.
+
+    """
+    message = message.split(":", 1)[-1].strip().lower()
+    message = NUMBER_PATTERN.sub("#", message)
+    return WHITESPACE_PATTERN.sub(" ", message)
+
+
+def collect_keys(extractions):
+    """
+    Collect valuations per (test case, stimulation) and issue messages per normalized message.
+
+    """
+    valuations = {}
+    messages = {}
+    dates = []
+    for extraction in extractions:
+        dates.append(extraction.campaign_date)
+        for stimulation, test_case in extraction.passes:
+            valuations.setdefault((test_case, stimulation), set()).add("Pass")
+        for stimulation, test_case in extraction.warnings:
+            valuations.setdefault((test_case, stimulation), set()).add("Warning")
+        for issue in extraction.issues:
+            valuations.setdefault((issue["test_case"], issue["stimulation"]), set()).add(issue["type"])
+            entry = messages.setdefault(
+                normalize_message(issue["message"]),
+                {"message": issue["message"], "type": issue["type"], "test_cases": set()},
+            )
+            entry["test_cases"].add(issue["test_case"])
+    return valuations, messages, sorted(set(dates))
+
+
+def diff_extractions(baseline_extractions, candidate_extractions):
+    """
+    Compare baseline and candidate reports and return the regression diff tables as row lists.
+
+    """
+    baseline_valuations, baseline_messages, baseline_dates = collect_keys(baseline_extractions)
+    candidate_valuations, candidate_messages, candidate_dates = collect_keys(candidate_extractions)
+
+    new_failures = []
+    valuation_changes = []
+    for (test_case, stimulation), valuations in candidate_valuations.items():
+        baseline = baseline_valuations.get((test_case, stimulation), set())
+        if valuations & FAILING_VALUATIONS and not baseline & FAILING_VALUATIONS:
+            new_failures.append({
+                "Test Case": test_case,
+                "Stimulation": stimulation,
+                "Valuation": ", ".join(sorted(valuations & FAILING_VALUATIONS)),
+                "Baseline": ", ".join(sorted(baseline)) or "--",
+            })
+        if baseline and baseline != valuations:
+            valuation_changes.append({
+                "Test Case": test_case,
+                "Stimulation": stimulation,
+                "Baseline": ", ".join(sorted(baseline)),
+                "Candidate": ", ".join(sorted(valuations)),
+            })
+
+    fixed_tests = []
+    for (test_case, stimulation), baseline in baseline_valuations.items():
+        valuations = candidate_valuations.get((test_case, stimulation))
+        if valuations and baseline & FAILING_VALUATIONS and not valuations & FAILING_VALUATIONS:
+            fixed_tests.append({
+                "Test Case": test_case,
+                "Stimulation": stimulation,
+                "Baseline": ", ".join(sorted(baseline & FAILING_VALUATIONS)),
+                "Candidate": ", ".join(sorted(valuations)),
+            })
+
+    new_messages = [
+        {
+            "Message": entry["message"].split(":", 1)[-1].strip(),
+            "Category": entry["type"],
+            "Associated Test Cases": "; ".join(sorted(entry["test_cases"])),
+        }
+        for key, entry in candidate_messages.items() if key not in baseline_messages
+    ]
+
+    return {
+        "Baseline Dates": baseline_dates,
+        "Candidate Dates": candidate_dates,
+        "New Failures": new_failures,
+        "Fixed Tests": fixed_tests,
+        "New Messages": new_messages,
+        "Valuation Changes": valuation_changes,
+    }
+
+
+def generate_regression_diff(baseline_files, candidate_files, save_path):
+    """
+    Generate an Excel and a JSON report of what changed between baseline and candidate reports.
+
+    """
+    diff = diff_extractions(
+        extract_reports(baseline_files, PARSE_REGIONS), extract_reports(candidate_files, PARSE_REGIONS)
+    )
+    sheets = {
+        "New Failures": ["Test Case", "Stimulation", "Valuation", "Baseline"],
+        "Fixed Tests": ["Test Case", "Stimulation", "Baseline", "Candidate"],
+        "New Messages": ["Message", "Category", "Associated Test Cases"],
+        "Valuation Changes": ["Test Case", "Stimulation", "Baseline", "Candidate"],
+    }
+
+    output_file = os.path.join(save_path, "RegressionDiff_Summary.xlsx")
+    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
+        summary = [("Baseline Dates", ", ".join(diff["Baseline Dates"])),
+                   ("Candidate Dates", ", ".join(diff["Candidate Dates"]))]
+        summary += [(sheet_name, len(diff[sheet_name])) for sheet_name in sheets]
+        pd.DataFrame(summary, columns=["Category", "Count"]).to_excel(writer, sheet_name="Summary", index=False)
+        for sheet_name, columns in sheets.items():
+            pd.DataFrame(diff[sheet_name], columns=columns).to_excel(writer, sheet_name=sheet_name, index=False)
+
+    json_file = os.path.join(save_path, "RegressionDiff_Summary.json")
+    with open(json_file, "w", encoding="utf-8") as f:
+        json.dump(diff, f, indent=1)
+
+    print(f"Regression diff saved to {output_file} and {json_file}")
+    return diff
+
+
+if __name__ == "__main__":
+    generate_regression_diff(sys.argv[1:-2], [sys.argv[-2]], sys.argv[-1])
@@ -0,0 +1,37 @@
+from ReportExtraction import extract_report
+from SingleDayAnalysis import PARSE_REGIONS as SINGLE_DAY_REGIONS, analyze
+from CyclicRunAnalysis import PARSE_REGIONS as CYCLIC_REGIONS, analyze_cyclic_run
+from MultipleFileAnalysis import PARSE_REGIONS as TEST_STATISTICS_REGIONS, generate_multi_file_summary
+from ErrorStatistics import PARSE_REGIONS as ERROR_STATISTICS_REGIONS, generate_error_statistics
+
+
+def analyze_report(html_file, save_path, single_day=True, cyclic=False, test_statistics=False, error_statistics=False,
+                   output_format="excel"):
+    """
+    Parse a report once and generate every requested report from the same extraction result.
+
+    Only the regions the requested reports need are parsed. Returns the tables of each generated
+    report by name: "Single Day", "Cyclic", "Test Statistics" and "Error Statistics".
+
+    """
+    regions = []
+    for requested, report_regions in (
+        (single_day, SINGLE_DAY_REGIONS),
+        (cyclic, CYCLIC_REGIONS),
+        (test_statistics, TEST_STATISTICS_REGIONS),
+        (error_statistics, ERROR_STATISTICS_REGIONS),
+    ):
+        if requested:
+            regions += [region for region in report_regions if region not in regions]
+    extraction = extract_report(html_file, regions=regions)
+
+    tables = {}
+    if single_day:
+        tables["Single Day"] = analyze(html_file, save_path, extraction, output_format)
+    if cyclic:
+        tables["Cyclic"] = analyze_cyclic_run(html_file, save_path, extraction, output_format)
+    if test_statistics:
+        tables["Test Statistics"] = generate_multi_file_summary([html_file], save_path, [extraction], output_format)
+    if error_statistics:
+        tables["Error Statistics"] = generate_error_statistics([html_file], save_path, [extraction], output_format)
+    return tables
@@ -0,0 +1,199 @@
+import datetime
+import glob
+import json
+import os
+import re
+import sys
+from bs4 import BeautifulSoup
+from ReportReader import (
+    DECODE_ERRORS,
+    decode_report,
+    expand_inputs,
+    open_report_stream,
+    report_stat,
+    source_file,
+)
+from Utils import extract_campaign_details
+
+CATALOG_FILE = "report_catalog.json"
+PRESCAN_CHUNK_SIZE = 64 * 1024
+PRESCAN_MAX_BYTES = 4 * 1024 * 1024
+REPORT_PATTERNS = ("*.html", "*.htm", "*.html.gz", "*.htm.gz", "*.zip")
+CAMPAIGN_START_PATTERN = re.compile(
+    rb"""<div[^>]*(?:data-tab\s*=\s*["']?campaign|class\s*=\s*["']content active["'])""", re.IGNORECASE
+)
+DIV_TAG_PATTERN = re.compile(rb"<(/?)div\b[^>]*>", re.IGNORECASE)
+CAMPAIGN_FIELDS = ("Campaign date", "ENNA version", "Python version", "Train")
+CAMPAIGN_FIELD_PATTERN = re.compile(rb"<td[^>]*>\s*([^<]*?)\s*</td>\s*<td[^>]*>.*?</td>", re.IGNORECASE | re.DOTALL)
+SPLIT_MARKER_BYTES = 256
+
+
+def read_report_head(filepath, fields=CAMPAIGN_FIELDS, chunk_size=PRESCAN_CHUNK_SIZE, max_bytes=PRESCAN_MAX_BYTES):
+    """
+    Read a report only up to the end of its campaign section.
+
+    Reading stops once every one of fields has a row in the section, at the end of the section, or
+    after max_bytes. With fields None the whole section is read.
+
+    """
+    head = b""
+    campaign_start = -1
+    div_pos = row_pos = 0
+    depth = 0
+    missing = None if fields is None else {field.encode("utf-8") for field in fields}
+    with open_report_stream(filepath) as f:
+        while len(head) < max_bytes:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            # Re-scan a little of the previous chunk so markers split across chunks are still found.
+            scan_from = max(0, len(head) - SPLIT_MARKER_BYTES)
+            head += chunk
+            if campaign_start < 0:
+                match = CAMPAIGN_START_PATTERN.search(head, scan_from)
+                if not match:
+                    continue
+                campaign_start = div_pos = row_pos = match.start()
+
+            section_end = None
+            for match in DIV_TAG_PATTERN.finditer(head, div_pos):
+                depth += -1 if match.group(1) else 1
+                div_pos = match.end()
+                if not depth:
+                    section_end = div_pos
+                    break
+            if missing is not None:
+                for match in CAMPAIGN_FIELD_PATTERN.finditer(head, row_pos, section_end or len(head)):
+                    missing.discard(match.group(1))
+                    row_pos = match.end()
+                    if not missing:
+                        return head[:row_pos]
+            if section_end:
+                return head[:section_end]
+    return head
+
+
+def prescan_report(filepath, errors=DECODE_ERRORS):
+    """
+    Extract the campaign date and details of a report from its head, without a full parse.
+
+    """
+    soup = BeautifulSoup(decode_report(read_report_head(filepath), errors), "html.parser")
+    return extract_campaign_details(filepath, soup)
+
+
+class ReportCatalog:
+    """
+    Sidecar catalog of report metadata, refreshed by prescanning only new or changed files.
+
+    """
+
+    def __init__(self, path=None):
+        """
+        Initialize the catalog, loading the entries stored at path if it exists.
+
+        """
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def update(self, filepaths):
+        """
+        Prescan the reports whose size or modification time changed since they were catalogued.
+
+        """
+        for filepath in expand_inputs(list(map(os.path.abspath, filepaths))):
+            try:
+                stat = report_stat(filepath)
+            except OSError as exc:
+                print(f"Skipping unreadable file {filepath}: {exc}")
+                continue
+            entry = self.entries.get(filepath)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                continue
+            campaign_date, details = prescan_report(filepath)
+            self.entries[filepath] = {
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                **details,
+                "Campaign Date": campaign_date,
+            }
+
+    def update_folder(self, folder, patterns=REPORT_PATTERNS):
+        """
+        Catalog every report in a folder, including .html.gz reports and the reports in .zip archives,
+        and drop the entries of the reports no longer there.
+
+        """
+        filepaths = sorted({filepath for pattern in patterns for filepath in glob.glob(os.path.join(folder, pattern))})
+        self.update(filepaths)
+        folder = os.path.abspath(folder)
+        present = set(expand_inputs(list(map(os.path.abspath, filepaths))))
+        for filepath in [path for path in self.entries if path not in present]:
+            if os.path.dirname(source_file(filepath)) == folder:
+                del self.entries[filepath]
+
+    def save(self):
+        """
+        Write the catalog back to its sidecar file.
+
+        """
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1)
+
+    def select(self, bench=None, since=None, until=None):
+        """
+        Return the catalogued reports for a bench and date range (inclusive, YYYY-MM-DD), ordered by date.
+
+        """
+        selected = []
+        for filepath, entry in self.entries.items():
+            date = entry["Campaign Date"]
+            if date == "Unknown Date":
+                continue
+            if bench is not None and entry["Testbench"] != bench:
+                continue
+            if (since is not None and date < since) or (until is not None and date > until):
+                continue
+            selected.append((date, filepath))
+        return [filepath for date, filepath in sorted(selected)]
+
+    def select_recent(self, days, bench=None, today=None):
+        """
+        Return the reports of the last given number of days, ordered by date.
+
+        """
+        today = today or datetime.date.today()
+        since = (today - datetime.timedelta(days=days)).isoformat()
+        return self.select(bench=bench, since=since)
+
+    def campaign_details(self, filepaths):
+        """
+        Return (sorted dates, campaign details per file) for catalogued reports, as used by campaign_details_rows.
+
+        Used by the command line listing; the analyses take their campaign details from the full parse.
+
+        """
+        filepaths = [os.path.abspath(filepath) for filepath in filepaths]
+        details = {filepath: self.entries[filepath] for filepath in filepaths if filepath in self.entries}
+        dates = sorted({entry["Campaign Date"] for entry in details.values()})
+        return dates, details
+
+
+if __name__ == "__main__":
+    folder = sys.argv[1]
+    bench = sys.argv[2] if len(sys.argv) > 2 else None
+    days = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+
+    catalog = ReportCatalog(os.path.join(folder, CATALOG_FILE))
+    catalog.update_folder(folder)
+    catalog.save()
+    dates, campaign_details = catalog.campaign_details(catalog.select_recent(days, bench=bench))
+    for path, details in campaign_details.items():
+        print(
+            f"{details['Campaign Date']}  {details['Testbench']}  ENNA {details['ENNA Version']}  "
+            f"Python {details['Python Version']}  Train {details['Train']}  {path}"
+        )
+    print(f"{len(campaign_details)} report(s) over {len(dates)} date(s)")
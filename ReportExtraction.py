@@ -0,0 +1,234 @@
+import bisect
+from collections import Counter
+from ReportReader import ReportPrefetcher, expand_inputs
+from Utils import (
+    ISSUE_FIELDS_PATTERN,
+    TIMESTAMP_STRIP_PATTERN,
+    parse_html,
+    parse_issues,
+    extract_campaign_details,
+    extract_campaign_table,
+    extract_test_valuations,
+    find_closest_stimulation,
+    find_closest_test_case,
+    SourceLineIndex
+)
+
+PARSE_REGIONS = ("campaign", "titles", "tests", "valuations", "issues")
+ISSUE_FIELDS = ("stimulation", "test_case", "message", "type", "timestamp", "previous_actions")
+EVENT_FIELDS = ("stimulation", "test_case", "timestamp")
+SHARED_FIELDS = frozenset(("stimulation", "test_case", "type", "timestamp", "previous_actions"))
+
+
+class RecordColumns:
+    """
+    Append-only records of a report, kept column by column.
+
+    Each field is a list, and the values that repeat across rows (stimulations, test cases, types,
+    timestamps, previous actions) are stored once and shared by their rows, so a record costs a slot
+    per field instead of a tuple or dict of its own. Iterating yields the records as tuples in field
+    order.
+
+    """
+
+    def __init__(self, fields):
+        """
+        Initialize empty columns for the given fields.
+
+        """
+        self.fields = fields
+        self.columns = {field: [] for field in fields}
+        self.shared = {field: {} for field in fields if field in SHARED_FIELDS}
+
+    def append(self, record):
+        """
+        Add a record given as a tuple in field order.
+
+        """
+        for field, value in zip(self.fields, record):
+            shared = self.shared.get(field)
+            if shared is not None:
+                value = shared.setdefault(value, value)
+            self.columns[field].append(value)
+
+    def __len__(self):
+        return len(self.columns[self.fields[0]])
+
+    def __iter__(self):
+        return zip(*self.columns.values())
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
+class IssueColumns(RecordColumns):
+    """
+    Issue records as returned by parse_issues, kept column by column; iterating yields them as dicts.
+
+    """
+
+    def __init__(self):
+        """
+        Initialize empty issue columns.
+
+        """
+        super().__init__(ISSUE_FIELDS)
+
+    @classmethod
+    def from_records(cls, issues):
+        """
+        Return issues as IssueColumns, converting a list of issue dicts.
+
+        """
+        if isinstance(issues, IssueColumns):
+            return issues
+        columns = cls()
+        for issue in issues:
+            columns.append(issue)
+        return columns
+
+    def append(self, issue):
+        """
+        Add an issue dict.
+
+        """
+        super().append([issue[field] for field in ISSUE_FIELDS])
+
+    def __iter__(self):
+        return (dict(zip(ISSUE_FIELDS, row)) for row in super().__iter__())
+
+
+class ExtractionResult:
+    """
+    Everything the analyses need from one report, extracted from a single parse with duplicates kept.
+
+    Passes and warnings are kept as {(stimulation, test case): count} in first-seen order and
+    cycle_counts as {(cycle, stimulation, test case, valuation): count}, so memory grows with
+    distinct keys rather than with repetitions. Issues and events are kept column by column (see
+    RecordColumns). Report generators build their tables straight from these records (see
+    ReportFrames), applying their own dedup policy on the way. events holds the (stimulation, test
+    case, timestamp) of every timestamped info and issue span in document order.
+
+    """
+
+    def __init__(self, filepath):
+        """
+        Initialize an empty result for the given report file.
+
+        """
+        self.filepath = filepath
+        self.campaign_date = "Unknown Date"
+        self.campaign_details = {}
+        self.campaign_table = {}
+        self.issues = IssueColumns()
+        self.events = RecordColumns(EVENT_FIELDS)
+        self.passes = {}
+        self.warnings = {}
+        self.test_valuations = []
+        self.cycles = 0
+        self.cycle_counts = Counter()
+
+
+def detect_cycles(stimulations):
+    """
+    Return the cycle number (from 1) of each stimulation title.
+
+    A cycle ends when a stimulation name comes back that was already run in the current cycle.
+
+    """
+    cycles = []
+    cycle = 1
+    seen = set()
+    for div, name in stimulations:
+        if name in seen:
+            cycle += 1
+            seen = set()
+        seen.add(name)
+        cycles.append(cycle)
+    return cycles
+
+
+def extract_report(filepath, content=None, regions=PARSE_REGIONS, on_stage=None):
+    """
+    Parse a report once and extract its campaign details, issues, passes, warnings and test valuations.
+
+    Only the given regions are parsed, so parts an analysis does not need stay empty. on_stage, if given,
+    is called with "parse" and then "extract" as the work progresses.
+
+    """
+    if on_stage:
+        on_stage("parse")
+    soup = parse_html(filepath, content, regions=regions)
+    if on_stage:
+        on_stage("extract")
+    result = ExtractionResult(filepath)
+
+    result.campaign_date, result.campaign_details = extract_campaign_details(filepath, soup)
+    result.campaign_table = extract_campaign_table(soup)
+    result.test_valuations = extract_test_valuations(soup)
+
+    stimulations = SourceLineIndex(
+        (div, div.find("span", class_="highlight").get_text(strip=True))
+        for div in soup.find_all("div") if "title" in div.get("class", []) and div.find("span", class_="highlight")
+    )
+    test_cases = SourceLineIndex(
+        (div, div.get_text(strip=True).split()[0])
+        for div in soup.find_all("div") if "title" in div.get("class", []) and "test" in div.get("class", [])
+    )
+    stimulation_cycles = detect_cycles(stimulations)
+    result.cycles = stimulation_cycles[-1] if stimulation_cycles else 0
+
+    def cycle_at(reference_line):
+        idx = bisect.bisect_left(stimulations.lines, reference_line)
+        return stimulation_cycles[idx - 1] if idx > 0 else 0
+
+    for tag in soup.find_all("span", class_=True):
+        issue = parse_issues(tag, stimulations)
+        if issue:
+            result.issues.append(issue)
+            result.events.append((issue["stimulation"], issue["test_case"], issue["timestamp"]))
+            cycle = cycle_at(tag.sourceline)
+            result.cycle_counts[(cycle, issue["stimulation"], issue["test_case"], issue["type"])] += 1
+        elif tag["class"][0] == "text-info":
+            fields = ISSUE_FIELDS_PATTERN.match(tag.get_text(strip=True))
+            if fields:
+                result.events.append((
+                    find_closest_stimulation(stimulations, tag.sourceline),
+                    find_closest_test_case(test_cases, tag.sourceline),
+                    TIMESTAMP_STRIP_PATTERN.sub("", fields.group(1).strip()),
+                ))
+
+    for div in soup.find_all("div", class_="content"):
+        text = div.text
+        if "Valuation" not in text:
+            continue
+        is_pass = "PASS" in text
+        is_warning = "WARNING" in text
+        if not (is_pass or is_warning):
+            continue
+        stimulation = find_closest_stimulation(stimulations, div.sourceline)
+        test_case = find_closest_test_case(test_cases, div.sourceline)
+        cycle = cycle_at(div.sourceline)
+        key = (stimulation, test_case)
+        if is_pass:
+            result.passes[key] = result.passes.get(key, 0) + 1
+            result.cycle_counts[(cycle, stimulation, test_case, "Pass")] += 1
+        if is_warning:
+            result.warnings[key] = result.warnings.get(key, 0) + 1
+            result.cycle_counts[(cycle, stimulation, test_case, "Warning")] += 1
+
+    return result
+
+
+def extract_reports(filepaths, regions=PARSE_REGIONS):
+    """
+    Extract several reports, reading ahead while each one is parsed and skipping unreadable files.
+
+    .zip archives among filepaths are read member by member.
+
+    """
+    for filepath, content, error in ReportPrefetcher(expand_inputs(filepaths)):
+        if error:
+            print(f"Skipping unreadable file {filepath}: {error}")
+            continue
+        yield extract_report(filepath, content, regions)
@@ -0,0 +1,139 @@
+import re
+from collections import Counter
+import pandas as pd
+from ReportExtraction import IssueColumns
+
+ISSUE_COLUMNS = [
+    "Test Case", "Type", "Stimulation", "Message", "Time", "Jira Ticket", "Jira Status", "Comments", "Previous Actions",
+]
+VALUATION_COLUMNS = ["Test Case", "Stimulation", "Message"]
+HELPER_TEST_CASE_PATTERN = re.compile(r"^\d{2}_\d{2}$")
+
+
+def group_by_stimulation(records, stimulation):
+    """
+    Reorder records so those of a stimulation follow each other, stimulations in first-seen order.
+
+    Only references are moved; stimulation(record) returns the stimulation of a record.
+
+    """
+    groups = {}
+    for record in records:
+        groups.setdefault(stimulation(record), []).append(record)
+    return [record for group in groups.values() for record in group]
+
+
+def blank_repeats(records, test_case, adjacent=True):
+    """
+    Yield (shown test case, record) with repeated test cases shown as "": repeats of the previous record
+    when adjacent is set, otherwise of any earlier record.
+
+    """
+    previous = None
+    seen = set()
+    for record in records:
+        value = test_case(record)
+        repeated = value == previous if adjacent else value in seen
+        previous = value
+        seen.add(value)
+        yield "" if repeated else value, record
+
+
+def drop_repeated_rows(rows):
+    """
+    Yield the rows not identical to an earlier one; the rows seen are only held while iterating.
+
+    """
+    seen = set()
+    for row in rows:
+        if row not in seen:
+            seen.add(row)
+            yield row
+
+
+def clean_message(message):
+    """
+    Keep the part of a message after its first ':'.
+
+    """
+    if ":" in message:
+        return message.split(":", 1)[1].strip()
+    return message
+
+
+def issue_frame(issues, dedup_test_cases=False, dedup_rows=False, clean_messages=False, adjacent_blanks=True,
+                exclude_helpers=False):
+    """
+    Build the Issues table from issue records in one pass, in its final shape.
+
+    issues are IssueColumns, or issue dicts that are put in columns first. Rows are grouped by
+    stimulation, as row positions into the columns; dedup_test_cases keeps the first issue per
+    (stimulation, test case) and dedup_rows drops rows identical to an earlier one. Repeated test cases
+    are blanked (see blank_repeats) and, with exclude_helpers, rows whose shown test case is a helper
+    step (NN_NN) are left out. Returns (table, row count per issue type).
+
+    """
+    issues = IssueColumns.from_records(issues)
+    column = issues.columns
+    rows = range(len(issues))
+    if dedup_test_cases:
+        first_rows = {}
+        for row in rows:
+            first_rows.setdefault((column["stimulation"][row], column["test_case"][row]), row)
+        rows = first_rows.values()
+    rows = group_by_stimulation(rows, column["stimulation"].__getitem__)
+
+    rows = (
+        (column["test_case"][row], column["type"][row], column["stimulation"][row],
+         clean_message(column["message"][row]) if clean_messages else column["message"][row],
+         column["timestamp"][row], column["previous_actions"][row])
+        for row in rows
+    )
+    if dedup_rows:
+        rows = drop_repeated_rows(rows)
+
+    columns = {name: [] for name in ISSUE_COLUMNS if name not in ("Jira Ticket", "Jira Status", "Comments")}
+    type_counts = Counter()
+    for shown_test_case, row in blank_repeats(rows, lambda row: row[0], adjacent_blanks):
+        if exclude_helpers and HELPER_TEST_CASE_PATTERN.match(shown_test_case):
+            continue
+        test_case, issue_type, stimulation, message, timestamp, previous_actions = row
+        columns["Test Case"].append(shown_test_case)
+        columns["Type"].append(issue_type)
+        columns["Stimulation"].append(stimulation)
+        columns["Message"].append(message)
+        columns["Time"].append(timestamp)
+        columns["Previous Actions"].append(previous_actions)
+        type_counts[issue_type] += 1
+
+    blank_column = [""] * len(columns["Test Case"])
+    table = pd.DataFrame(
+        {
+            name: columns[name] if name in columns else blank_column
+            for name in ISSUE_COLUMNS
+        },
+        columns=ISSUE_COLUMNS,
+    )
+    return table, type_counts
+
+
+def valuation_frame(keys, adjacent_blanks=True, skip_first_row=False):
+    """
+    Build a Passes or Warnings table from (stimulation, test case) keys, grouped by stimulation.
+
+    Repeated test cases are blanked (see blank_repeats); skip_first_row leaves out the first row after
+    blanking.
+
+    """
+    keys = group_by_stimulation(keys, lambda key: key[0])
+    rows = list(blank_repeats(keys, lambda key: key[1], adjacent_blanks))
+    if skip_first_row:
+        rows = rows[1:]
+    return pd.DataFrame(
+        {
+            "Test Case": [shown_test_case for shown_test_case, key in rows],
+            "Stimulation": [key[0] for shown_test_case, key in rows],
+            "Message": [""] * len(rows),
+        },
+        columns=VALUATION_COLUMNS,
+    )
@@ -0,0 +1,178 @@
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from Aggregates import save_aggregate
+from ReportExtraction import extract_report
+from ReportReader import DEFAULT_MAX_INFLIGHT_BYTES, read_report_bytes, report_size
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+FILE_TIMEOUT = 600
+FILE_MEMORY_LIMIT = 4 * 1024 * 1024 * 1024
+STAGES = ("start", "read", "parse", "extract", "aggregate")
+
+
+def _limit_memory(memory_limit):
+    """
+    Cap the address space of the current process at its present size plus memory_limit bytes.
+
+    Only possible where the resource module exists (not on Windows).
+
+    """
+    if resource is None or not memory_limit:
+        return
+    baseline = 0
+    try:
+        with open("/proc/self/statm", "r") as f:
+            baseline = int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError):
+        pass
+    limit = baseline + memory_limit
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _read_ahead(reader, filepath):
+    # Reads the next report in the background, unless it is over the in-flight budget of a ReportPrefetcher.
+    try:
+        if report_size(filepath) > DEFAULT_MAX_INFLIGHT_BYTES:
+            return None
+        return filepath, reader.submit(read_report_bytes, filepath)
+    except Exception:
+        return None
+
+
+def _worker_loop(connection, stage, aggregate_class, regions, memory_limit):
+    reader = ThreadPoolExecutor(max_workers=1)
+    # Start the read-ahead thread before the limit, which its stack might not fit under.
+    reader.submit(int).result()
+    _limit_memory(memory_limit)
+    prefetched = None
+
+    def set_stage(name):
+        stage.value = STAGES.index(name)
+
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        filepath, output_path, next_filepath = task
+        try:
+            set_stage("read")
+            future = prefetched[1] if prefetched and prefetched[0] == filepath else None
+            prefetched = None
+            content = future.result() if future else read_report_bytes(filepath)
+            if next_filepath:
+                prefetched = _read_ahead(reader, next_filepath)
+            extraction = extract_report(filepath, content, regions, on_stage=set_stage)
+            set_stage("aggregate")
+            save_aggregate(aggregate_class.from_extractions([extraction]), output_path)
+            connection.send(None)
+        except MemoryError:
+            content = extraction = prefetched = None
+            # Start the next file in a fresh worker rather than in a heap left fragmented at its limit.
+            connection.send(
+                {"stage": STAGES[stage.value], "error": "MemoryError: memory limit exceeded", "restart": True}
+            )
+            return
+        except Exception as exc:
+            connection.send({"stage": STAGES[stage.value], "error": f"{type(exc).__name__}: {exc}"})
+
+
+class IsolatedExtractor:
+    """
+    Extract reports one at a time in a separate worker process with a wall-clock and a memory limit.
+
+    The worker reads and parses a report and writes its aggregate to a file, so nothing large crosses
+    the process boundary. Given the next report, it reads that one in a background thread while it
+    parses the current one; the read-ahead counts against the same memory limit. A worker that
+    exceeds timeout seconds is killed, and one that dies or runs out of memory is replaced, so one
+    pathological report cannot stall or crash the batch. Failures are returned as {"stage", "error"},
+    the stage being the last one of STAGES the worker reached.
+
+    """
+
+    def __init__(self, aggregate_class, regions, timeout=None, memory_limit=None):
+        """
+        Initialize the extractor; the worker process is started on first use.
+
+        The limits default to FILE_TIMEOUT seconds and FILE_MEMORY_LIMIT bytes; set either constant to
+        None to disable that limit.
+
+        """
+        self.aggregate_class = aggregate_class
+        self.regions = regions
+        self.timeout = FILE_TIMEOUT if timeout is None else timeout
+        self.memory_limit = FILE_MEMORY_LIMIT if memory_limit is None else memory_limit
+        self.process = None
+        self.connection = None
+        self.stage = None
+
+    def _start(self):
+        self.stage = multiprocessing.Value("i", 0)
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_worker_loop,
+            args=(child_connection, self.stage, self.aggregate_class, self.regions, self.memory_limit),
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+
+    def _stop(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+        self.process = None
+
+    def run(self, filepath, output_path, next_filepath=None):
+        """
+        Extract one report and write its aggregate to output_path; return None, or the failure.
+
+        next_filepath, if given, is the report that will be run next, read ahead by the worker.
+
+        """
+        if self.process is None or not self.process.is_alive():
+            if self.process is not None:
+                self._stop()
+            self._start()
+        self.stage.value = 0
+        self.connection.send((filepath, output_path, next_filepath))
+
+        if not self.connection.poll(self.timeout):
+            stage = STAGES[self.stage.value]
+            self._stop()
+            return {"stage": stage, "error": f"Timed out after {self.timeout} s"}
+        try:
+            failure = self.connection.recv()
+        except EOFError:
+            stage = STAGES[self.stage.value]
+            self.process.join()
+            exitcode = self.process.exitcode
+            self._stop()
+            return {"stage": stage, "error": f"Worker exited with code {exitcode}"}
+        if failure is not None and failure.pop("restart", False):
+            self._stop()
+        return failure
+
+    def close(self):
+        """
+        Stop the worker process.
+
+        """
+        if self.process is None:
+            return
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        self._stop()
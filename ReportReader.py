@@ -0,0 +1,263 @@
+import codecs
+import gzip
+import mmap
+import os
+import re
+import struct
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_AHEAD = 4
+DEFAULT_MAX_INFLIGHT_BYTES = 256 * 1024 * 1024
+DEFAULT_ENCODING = "utf-8"
+DECODE_ERRORS = "replace"
+SNIFF_BYTES = 4096
+
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+REPORT_EXTENSIONS = (".html", ".htm")
+ARCHIVE_EXTENSION = ".zip"
+GZIP_EXTENSION = ".gz"
+REPORT_FILE_TYPES = [("Reports", "*.html *.htm *.html.gz *.htm.gz *.zip"), ("HTML Files", "*.html *.htm")]
+META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:\-]+)""", re.IGNORECASE)
+
+
+def split_archive_member(filepath):
+    """
+    Split an "archive.zip/member.html" path into (archive, member), or return (filepath, None).
+
+    """
+    idx = filepath.lower().find(ARCHIVE_EXTENSION + "/")
+    if idx < 0 or os.path.exists(filepath):
+        return filepath, None
+    return filepath[:idx + len(ARCHIVE_EXTENSION)], filepath[idx + len(ARCHIVE_EXTENSION) + 1:]
+
+
+def source_file(filepath):
+    """
+    Return the file on disk holding a report: the archive for an archive member, else filepath itself.
+
+    """
+    return split_archive_member(filepath)[0]
+
+
+def report_stat(filepath):
+    """
+    Stat the file on disk holding a report, so archive members change when their archive does.
+
+    """
+    return os.stat(source_file(filepath))
+
+
+def expand_inputs(filepaths):
+    """
+    Replace every .zip archive among filepaths by "archive.zip/member" paths of the reports it holds.
+
+    Other paths, including .gz reports, are kept as they are. Unreadable archives are kept too, so
+    reading them reports the error like for any other input.
+
+    """
+    expanded = []
+    for filepath in filepaths:
+        if not filepath.lower().endswith(ARCHIVE_EXTENSION):
+            expanded.append(filepath)
+            continue
+        try:
+            with zipfile.ZipFile(filepath) as archive:
+                members = [
+                    info.filename for info in archive.infolist()
+                    if not info.is_dir() and info.filename.lower().endswith(REPORT_EXTENSIONS)
+                ]
+        except (OSError, zipfile.BadZipFile):
+            expanded.append(filepath)
+            continue
+        expanded.extend(f"{filepath}/{member}" for member in members)
+    return expanded
+
+
+def open_report_stream(filepath):
+    """
+    Open a report as a binary stream, decompressing .gz reports and archive members as they are read.
+
+    """
+    archive_path, member = split_archive_member(filepath)
+    if member is not None:
+        archive = zipfile.ZipFile(archive_path)
+        try:
+            stream = archive.open(member)
+        except (KeyError, zipfile.BadZipFile) as exc:
+            archive.close()
+            raise OSError(f"Cannot open {member} in {archive_path}: {exc}") from exc
+        # The member stream keeps the archive file open until it is closed itself.
+        archive.close()
+    elif filepath.lower().endswith(ARCHIVE_EXTENSION):
+        # expand_inputs keeps only the archives it could not list.
+        raise OSError(f"Cannot read archive {filepath}")
+    else:
+        stream = open(filepath, "rb")
+    if member is None and filepath.lower().endswith(GZIP_EXTENSION):
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    return stream
+
+
+def is_compressed(filepath):
+    """
+    Return True if the report is an archive member or a .gz file, which cannot be memory-mapped.
+
+    """
+    return split_archive_member(filepath)[1] is not None or filepath.lower().endswith(GZIP_EXTENSION)
+
+
+def report_size(filepath):
+    """
+    Return the uncompressed size of a report, read from the archive directory or the gzip trailer.
+
+    """
+    archive_path, member = split_archive_member(filepath)
+    if member is not None:
+        with zipfile.ZipFile(archive_path) as archive:
+            return archive.getinfo(member).file_size
+    if filepath.lower().endswith(GZIP_EXTENSION):
+        with open(filepath, "rb") as f:
+            f.seek(-4, os.SEEK_END)
+            # The gzip trailer stores the uncompressed size modulo 2**32.
+            return struct.unpack("<I", f.read(4))[0]
+    return os.path.getsize(filepath)
+
+
+def read_report_bytes(filepath):
+    """
+    Read the raw bytes of a report file, decompressing .gz reports and archive members in memory.
+
+    Corrupt compressed data is raised as OSError, like any other unreadable file.
+
+    """
+    with open_report_stream(filepath) as f:
+        try:
+            return f.read()
+        except (zipfile.BadZipFile, zlib.error, EOFError) as exc:
+            raise OSError(f"Corrupt compressed report {filepath}: {exc}") from exc
+
+
+def open_report(filepath):
+    """
+    Memory-map a report for reading without copying it into memory.
+
+    Empty files cannot be mapped and are returned as empty bytes. Compressed reports are decompressed
+    into memory instead.
+
+    """
+    if is_compressed(filepath):
+        return read_report_bytes(filepath)
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def detect_encoding(data, default=DEFAULT_ENCODING):
+    """
+    Detect the encoding of a report from its BOM or meta charset, looking only at the first bytes.
+
+    """
+    head = bytes(data[:SNIFF_BYTES])
+    for bom, encoding in BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+    match = META_CHARSET_PATTERN.search(head)
+    if match:
+        encoding = match.group(1).decode("ascii")
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            pass
+    return default
+
+
+def decode_report(data, errors=DECODE_ERRORS, encoding=None):
+    """
+    Decode report bytes (bytes, memoryview or mmap) straight from the buffer.
+
+    errors is passed to the codec, so malformed bytes can be replaced or ignored instead of raising.
+
+    """
+    encoding = encoding or detect_encoding(data)
+    with memoryview(data) as view:
+        return str(view, encoding, errors)
+
+
+def _timed_read(reader, filepath):
+    start = time.perf_counter()
+    try:
+        content = reader(filepath)
+        error = None
+    except OSError as exc:
+        content = None
+        error = exc
+    return content, error, time.perf_counter() - start
+
+
+class ReportPrefetcher:
+    """
+    Read-ahead loader that fetches the next reports in a thread pool while the current one is parsed.
+
+    Iterating yields (filepath, content, error) in input order. Unreadable files are yielded with
+    content None and the OSError instead of aborting the loop.
+
+    """
+
+    def __init__(self, filepaths, max_ahead=DEFAULT_MAX_AHEAD, max_inflight_bytes=DEFAULT_MAX_INFLIGHT_BYTES,
+                 reader=read_report_bytes):
+        """
+        Initialize the prefetcher with the read-ahead depth, the in-flight byte budget and the reader.
+
+        """
+        self.filepaths = list(filepaths)
+        self.max_ahead = max(1, max_ahead)
+        self.max_inflight_bytes = max_inflight_bytes
+        self.reader = reader
+        self.metrics = {}
+
+    def __iter__(self):
+        pending = deque()
+        inflight_bytes = 0
+        next_idx = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_ahead) as executor:
+            while next_idx < len(self.filepaths) or pending:
+                while next_idx < len(self.filepaths) and len(pending) < self.max_ahead:
+                    filepath = self.filepaths[next_idx]
+                    try:
+                        size = report_size(filepath)
+                    except (OSError, KeyError, zipfile.BadZipFile):
+                        size = 0
+                    # Always keep at least one read in flight so an oversized file cannot stall the loop.
+                    if pending and inflight_bytes + size > self.max_inflight_bytes:
+                        break
+                    pending.append((filepath, size, executor.submit(_timed_read, self.reader, filepath)))
+                    inflight_bytes += size
+                    next_idx += 1
+
+                filepath, size, future = pending.popleft()
+                content, error, read_time = future.result()
+                inflight_bytes -= size
+                self.metrics[filepath] = {
+                    "bytes": len(content) if content is not None else 0,
+                    "read_time": read_time,
+                }
+                yield filepath, content, error
+
+    def total_read_time(self):
+        """
+        Sum of the per-file read times recorded so far.
+
+        """
+        return sum(metric["read_time"] for metric in self.metrics.values())
@@ -0,0 +1,190 @@
+import glob
+import hashlib
+import os
+import sys
+import time
+import pandas as pd
+from Aggregates import ErrorAggregate, StabilityAggregate, merge_aggregates
+from ErrorStatistics import render_error_statistics
+from MultipleFileAnalysis import render_multi_file_summary, update_flakiness_index
+from ReportExtraction import extract_report
+from ReportReader import read_report_bytes, report_size
+
+PARSE_REGIONS = ("campaign", "tests", "issues")
+GENERATED_OUTPUTS = ("MultiFileAnalysis_Summary.html", "ErrorStatistics_Summary.html")
+
+
+class ReportWatcher:
+    """
+    Watch a drop folder and regenerate the stability and error statistics as reports arrive.
+
+    A file is picked up once its size and modification time have been stable for settle_time seconds,
+    and re-extracted only if its content hash changed. Each report keeps its own aggregates, so a new or
+    changed file is merged with the others instead of reprocessing the whole window. Only the reports of
+    the latest window campaign dates are kept. The watcher's own HTML outputs are never picked up, so
+    save_path may be the watched folder. A report that cannot be read or extracted is listed in a
+    "Skipped Inputs" sheet until it changes, and watching goes on.
+
+    """
+
+    def __init__(self, folder, save_path, pattern="*.html", settle_time=30, window=30, output_format="excel"):
+        """
+        Initialize a watcher for the reports in folder matching pattern.
+
+        """
+        self.folder = folder
+        self.save_path = save_path
+        self.pattern = pattern
+        self.settle_time = settle_time
+        self.window = window
+        self.output_format = output_format
+        self.outputs = {os.path.abspath(os.path.join(save_path, name)) for name in GENERATED_OUTPUTS}
+        self.signatures = {}
+        self.pending = {}
+        self.reports = {}
+        self.skipped = {}
+
+    def _settled(self, filepath, signature, now):
+        pending = self.pending.get(filepath)
+        if pending is None or pending[0] != signature:
+            self.pending[filepath] = (signature, now)
+            return False
+        return now - pending[1] >= self.settle_time
+
+    def _skip(self, filepath, error, stage):
+        try:
+            size = report_size(filepath)
+        except Exception:
+            size = None
+        message = f"{type(error).__name__}: {error}"
+        self.skipped[filepath] = {"stage": stage, "size": size, "error": message}
+        print(f"Skipping {filepath} ({stage} stage, {size} bytes): {message}")
+
+    def _ingest(self, filepath, signature):
+        try:
+            content = read_report_bytes(filepath)
+        except OSError as exc:
+            self._skip(filepath, exc, "read")
+            return False
+        digest = hashlib.sha1(content).hexdigest()
+        previous = self.signatures.get(filepath)
+        self.signatures[filepath] = (signature, digest)
+        if previous and previous[1] == digest:
+            return False
+
+        try:
+            extraction = extract_report(filepath, content, PARSE_REGIONS)
+        except Exception as exc:
+            self._skip(filepath, exc, "extract")
+            self.reports.pop(filepath, None)
+            return True
+        self.skipped.pop(filepath, None)
+        self.reports[filepath] = {
+            "date": extraction.campaign_date,
+            "stability": StabilityAggregate.from_extractions([extraction]),
+            "errors": ErrorAggregate.from_extractions([extraction]),
+        }
+        return True
+
+    def _evict(self):
+        dates = sorted({report["date"] for report in self.reports.values() if report["date"] != "Unknown Date"})
+        kept_dates = set(dates[-self.window:])
+        for filepath in [path for path, report in self.reports.items() if report["date"] not in kept_dates]:
+            del self.reports[filepath]
+
+    def poll_once(self, now=None):
+        """
+        Scan the folder once, extract settled new or changed reports and regenerate the outputs if needed.
+
+        Returns the reports that were (re-)extracted or dropped.
+
+        """
+        now = time.time() if now is None else now
+        filepaths = set(map(os.path.abspath, glob.glob(os.path.join(self.folder, self.pattern)))) - self.outputs
+        changed = []
+
+        for filepath in sorted(filepaths):
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            signature = (stat.st_mtime, stat.st_size)
+            known = self.signatures.get(filepath)
+            if known and known[0] == signature:
+                self.pending.pop(filepath, None)
+                continue
+            if not self._settled(filepath, signature, now):
+                continue
+            del self.pending[filepath]
+            if self._ingest(filepath, signature):
+                changed.append(filepath)
+
+        for filepath in set(self.signatures) - filepaths:
+            del self.signatures[filepath]
+            if self.reports.pop(filepath, None) or self.skipped.pop(filepath, None):
+                changed.append(filepath)
+        for filepath in set(self.pending) - filepaths:
+            del self.pending[filepath]
+        for filepath in set(self.skipped) - filepaths:
+            del self.skipped[filepath]
+
+        if changed:
+            self._evict()
+            self.regenerate()
+        return changed
+
+    def skipped_inputs(self):
+        """
+        Return the reports that could not be extracted with their stage, size and error as a table.
+
+        """
+        return pd.DataFrame(
+            [(filepath, failure["stage"], failure["size"], failure["error"])
+             for filepath, failure in sorted(self.skipped.items())],
+            columns=["File", "Stage", "Size (bytes)", "Error"],
+        )
+
+    def regenerate(self):
+        """
+        Write the stability and error statistics for the reports currently in the window.
+
+        The reports are folded into the flakiness index saved in save_path, which counts each report
+        once however often it is regenerated.
+
+        """
+        if not self.reports:
+            return
+        reports = list(self.reports.values())
+        stability = [report["stability"] for report in reports]
+        skipped_inputs = self.skipped_inputs()
+        render_multi_file_summary(
+            merge_aggregates(stability), self.save_path, self.output_format, skipped_inputs,
+            update_flakiness_index(self.save_path, stability),
+        )
+        render_error_statistics(
+            merge_aggregates([report["errors"] for report in reports]), self.save_path, self.output_format,
+            skipped_inputs,
+        )
+
+    def run(self, interval=60):
+        """
+        Poll the folder every interval seconds until interrupted.
+
+        """
+        print(f"Watching {self.folder} for {self.pattern} (Ctrl+C to stop)")
+        try:
+            while True:
+                changed = self.poll_once()
+                if changed:
+                    print(f"Updated reports for {len(changed)} changed file(s)")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("Stopped watching")
+
+
+if __name__ == "__main__":
+    folder = sys.argv[1]
+    save_path = sys.argv[2] if len(sys.argv) > 2 else folder
+    interval = int(sys.argv[3]) if len(sys.argv) > 3 else 60
+
+    ReportWatcher(folder, save_path).run(interval)
@@ -0,0 +1,179 @@
+import json
+import sys
+import numpy as np
+import pandas as pd
+from Aggregates import merge_aggregates
+
+VALUATIONS = ("Pass", "Fail", "Error", "Warning", "Total")
+RESULTS_CUBE_FILE = "results_cube"
+UNKNOWN_BENCH = "N/A"
+
+
+class ResultsCube:
+    """
+    Dense test case x date x bench x valuation counts of a multi-file run.
+
+    Every dimension is integer-encoded by its label list, so filtering and rolling up are numpy
+    indexing and sums instead of a new parse. The cube is saved as a .npy array next to a JSON file of
+    labels and opens memory-mapped, and results() has the shape of StabilityAggregate.results(), so a
+    slice renders through render_multi_file_summary like a fresh run.
+
+    """
+
+    def __init__(self, counts, test_cases, dates, benches, files, campaign_details):
+        """
+        Wrap a counts array of shape (test cases, dates, benches, VALUATIONS) and its labels.
+
+        files maps each report to its [date, bench]; campaign_details maps it to its campaign details.
+
+        """
+        self.counts = counts
+        self.test_cases = list(test_cases)
+        self.dates = list(dates)
+        self.benches = list(benches)
+        self.files = files
+        self.campaign_details = campaign_details
+
+    @classmethod
+    def from_aggregates(cls, aggregates, merged=None):
+        """
+        Build a cube from StabilityAggregates of one report each, such as the checkpoints of a run.
+
+        merged is their merge when the caller already has it, so they are not merged a second time.
+
+        """
+        if not aggregates:
+            return cls(np.zeros((0, 0, 0, len(VALUATIONS)), dtype=np.int32), [], [], [], {}, {})
+        if merged is None:
+            merged = merge_aggregates(aggregates)
+        results, dates, campaign_details = merged.results()
+        files = {}
+        for aggregate in aggregates:
+            if len(aggregate.campaign_details) != 1:
+                raise ValueError("ResultsCube needs one aggregate per report")
+            filepath, details = next(iter(aggregate.campaign_details.items()))
+            files[filepath] = [next(iter(aggregate.dates)), details.get("Testbench", UNKNOWN_BENCH)]
+
+        test_cases = list(results)
+        benches = sorted({bench for date, bench in files.values()})
+        test_case_idx = {test_case: idx for idx, test_case in enumerate(test_cases)}
+        date_idx = {date: idx for idx, date in enumerate(dates)}
+        bench_idx = {bench: idx for idx, bench in enumerate(benches)}
+
+        counts = np.zeros((len(test_cases), len(dates), len(benches), len(VALUATIONS)), dtype=np.int32)
+        for aggregate in aggregates:
+            date, bench = files[next(iter(aggregate.campaign_details))]
+            for test_case, date_counts in aggregate.counts.items():
+                counts[test_case_idx[test_case], date_idx[date], bench_idx[bench]] += [
+                    date_counts[date][valuation] for valuation in VALUATIONS
+                ]
+        return cls(counts, test_cases, dates, benches, dict(sorted(files.items())), campaign_details)
+
+    def select(self, since=None, until=None, benches=None, test_cases=None, failing_only=False):
+        """
+        Return the cube restricted to a date range (inclusive, YYYY-MM-DD), benches and test cases.
+
+        With failing_only, only test cases with a failure or error in the selection are kept. Dates,
+        benches and test cases left without any run are dropped.
+
+        """
+        def keep_date(date):
+            if since is None and until is None:
+                return True
+            if date == "Unknown Date":
+                return False
+            return (since is None or date >= since) and (until is None or date <= until)
+
+        files = {
+            filepath: [date, bench] for filepath, (date, bench) in self.files.items()
+            if keep_date(date) and (benches is None or bench in benches)
+        }
+        dates = [date for date in self.dates if any(date == file_date for file_date, bench in files.values())]
+        bench_labels = [
+            bench for bench in self.benches if any(bench == file_bench for date, file_bench in files.values())
+        ]
+        date_idx = [self.dates.index(date) for date in dates]
+        bench_idx = [self.benches.index(bench) for bench in bench_labels]
+        counts = self.counts[:, date_idx][:, :, bench_idx]
+
+        runs = counts.sum(axis=(1, 2))
+        keep = runs[:, VALUATIONS.index("Total")] > 0
+        if test_cases is not None:
+            keep &= np.isin(self.test_cases, list(test_cases))
+        if failing_only:
+            keep &= runs[:, VALUATIONS.index("Fail")] + runs[:, VALUATIONS.index("Error")] > 0
+        test_case_idx = np.flatnonzero(keep)
+
+        return ResultsCube(
+            counts[test_case_idx],
+            [self.test_cases[idx] for idx in test_case_idx],
+            dates,
+            bench_labels,
+            files,
+            {filepath: self.campaign_details[filepath] for filepath in files},
+        )
+
+    def roll_up(self, *dimensions):
+        """
+        Sum the counts over every dimension not named ("Test Case", "Date", "Bench") and return them as a
+        table with one column per valuation.
+
+        """
+        axes = {"Test Case": (0, self.test_cases), "Date": (1, self.dates), "Bench": (2, self.benches)}
+        summed = self.counts.sum(axis=tuple(axis for name, (axis, labels) in axes.items() if name not in dimensions))
+        kept = [name for name in axes if name in dimensions]
+        index = pd.MultiIndex.from_product([axes[name][1] for name in kept], names=kept)
+        return pd.DataFrame(summed.reshape(-1, len(VALUATIONS)), index=index, columns=VALUATIONS).reset_index()
+
+    def results(self):
+        """
+        Return (results, sorted dates, campaign details) like StabilityAggregate.results().
+
+        """
+        by_date = self.counts.sum(axis=2)
+        total = VALUATIONS.index("Total")
+        results = {}
+        for idx, test_case in enumerate(self.test_cases):
+            results[test_case] = {
+                self.dates[date]: dict(zip(VALUATIONS, map(int, by_date[idx, date])))
+                for date in np.flatnonzero(by_date[idx, :, total])
+            }
+        return results, list(self.dates), dict(self.campaign_details)
+
+    def save(self, path):
+        """
+        Write the counts to path.npy and the labels to path.json.
+
+        """
+        np.save(path + ".npy", np.ascontiguousarray(self.counts))
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump({
+                "test_cases": self.test_cases, "dates": self.dates, "benches": self.benches,
+                "files": self.files, "campaign_details": self.campaign_details,
+            }, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Open a cube written by save, memory-mapping the counts unless mmap is False.
+
+        """
+        with open(path + ".json", "r", encoding="utf-8") as f:
+            labels = json.load(f)
+        counts = np.load(path + ".npy", mmap_mode="r" if mmap else None)
+        return cls(
+            counts, labels["test_cases"], labels["dates"], labels["benches"],
+            labels["files"], labels["campaign_details"],
+        )
+
+
+if __name__ == "__main__":
+    from MultipleFileAnalysis import render_results_slice
+
+    cube_folder, save_path = sys.argv[1], sys.argv[2]
+    bench = sys.argv[3] if len(sys.argv) > 3 and sys.argv[3] != "*" else None
+    since = sys.argv[4] if len(sys.argv) > 4 and sys.argv[4] != "*" else None
+    until = sys.argv[5] if len(sys.argv) > 5 and sys.argv[5] != "*" else None
+    failing_only = len(sys.argv) > 6 and sys.argv[6] == "failing"
+
+    render_results_slice(cube_folder, save_path, since, until, [bench] if bench else None, failing_only)
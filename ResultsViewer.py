@@ -0,0 +1,145 @@
+import tkinter as tk
+from tkinter import ttk
+from TableRows import TableRows
+
+VISIBLE_ROWS = 30
+COLUMN_WIDTH = 140
+WHEEL_ROWS = 3
+
+
+class VirtualTable:
+    """
+    Scrollable, sortable and filterable view of a table that only fills the rows on screen.
+
+    The Treeview holds VISIBLE_ROWS items whose values are replaced as the view scrolls, so scrolling
+    costs the same for any table length. Sorting and filtering work on the row positions of a
+    TableRows.
+
+    """
+
+    def __init__(self, master, table):
+        """
+        Initialize the view over a DataFrame.
+
+        """
+        self.rows = TableRows(table)
+        self.offset = 0
+
+        self.frame = tk.Frame(master)
+        self.frame.rowconfigure(1, weight=1)
+        self.frame.columnconfigure(1, weight=1)
+
+        self.filter_label = tk.Label(self.frame, text="Filter:")
+        self.filter_label.grid(row=0, column=0)
+
+        self.filter_entry = tk.Entry(self.frame, width=50)
+        self.filter_entry.grid(row=0, column=1, sticky="we")
+        self.filter_entry.bind("<Return>", lambda event: self.apply_filter())
+
+        self.filter_button = tk.Button(self.frame, text="Apply", command=self.apply_filter)
+        self.filter_button.grid(row=0, column=2)
+
+        self.count_label = tk.Label(self.frame, text="", anchor="e")
+        self.count_label.grid(row=0, column=3, sticky="e")
+
+        columns = [str(column) for column in self.rows.table.columns]
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", height=VISIBLE_ROWS)
+        for idx, column in enumerate(columns):
+            self.tree.heading(column, text=column, command=lambda idx=idx: self.sort(idx))
+            self.tree.column(column, width=COLUMN_WIDTH, stretch=False)
+        for item in range(VISIBLE_ROWS):
+            self.tree.insert("", "end", iid=str(item), values=())
+        self.tree.grid(row=1, column=0, columnspan=4, sticky="nsew")
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.scroll)
+        self.scrollbar.grid(row=1, column=4, sticky="ns")
+        self.x_scrollbar = ttk.Scrollbar(self.frame, orient="horizontal", command=self.tree.xview)
+        self.x_scrollbar.grid(row=2, column=0, columnspan=4, sticky="we")
+        self.tree.configure(xscrollcommand=self.x_scrollbar.set)
+
+        self.tree.bind(
+            "<MouseWheel>",
+            lambda event: self.scroll("scroll", -WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS, "units")
+        )
+        self.tree.bind("<Button-4>", lambda event: self.scroll("scroll", -WHEEL_ROWS, "units"))
+        self.tree.bind("<Button-5>", lambda event: self.scroll("scroll", WHEEL_ROWS, "units"))
+        self.tree.bind("<Prior>", lambda event: self.scroll("scroll", -1, "pages"))
+        self.tree.bind("<Next>", lambda event: self.scroll("scroll", 1, "pages"))
+
+        self.refresh()
+
+    def show_first_rows(self):
+        """
+        Scroll back to the first row after the rows were filtered or sorted.
+
+        """
+        self.offset = 0
+        self.refresh()
+
+    def apply_filter(self):
+        """
+        Keep only the rows with a cell containing the filter text, ignoring case.
+
+        """
+        self.rows.set_filter(self.filter_entry.get())
+        self.show_first_rows()
+
+    def sort(self, idx):
+        """
+        Sort by a column, or reverse the order when it is already the sort column.
+
+        """
+        self.rows.sort(idx)
+        self.show_first_rows()
+
+    def scroll(self, action, amount, unit=None):
+        """
+        Move the visible window of rows; called by the scrollbar with "moveto" or "scroll" arguments.
+
+        """
+        if action == "moveto":
+            offset = int(float(amount) * len(self.rows))
+        elif unit == "pages":
+            offset = self.offset + int(amount) * VISIBLE_ROWS
+        else:
+            offset = self.offset + int(amount)
+        self.offset = max(0, min(offset, len(self.rows) - VISIBLE_ROWS))
+        self.refresh()
+        return "break"
+
+    def refresh(self):
+        """
+        Fill the Treeview items with the rows of the visible window.
+
+        """
+        values = self.rows.window(self.offset, VISIBLE_ROWS)
+        for item in range(VISIBLE_ROWS):
+            self.tree.item(str(item), values=values[item] if item < len(values) else ())
+
+        if len(self.rows):
+            self.scrollbar.set(self.offset / len(self.rows), (self.offset + len(values)) / len(self.rows))
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_label.config(text=f"{len(self.rows)} of {len(self.rows.table)} rows")
+
+
+class ResultsViewer:
+    """
+    A window showing the tables of a finished analysis, one tab per table.
+
+    """
+
+    def __init__(self, master, title, tables):
+        """
+        Initialize the ResultsViewer with a VirtualTable per table name.
+
+        """
+        self.window = tk.Toplevel(master)
+        self.window.title(title)
+        self.notebook = ttk.Notebook(self.window)
+        self.notebook.pack(fill="both", expand=True)
+        self.views = {}
+        for name, table in tables.items():
+            view = VirtualTable(self.notebook, table)
+            self.notebook.add(view.frame, text=name)
+            self.views[name] = view
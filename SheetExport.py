@@ -0,0 +1,86 @@
+import math
+import os
+from itertools import islice
+import pandas as pd
+from openpyxl import Workbook
+
+EXCEL_MAX_ROWS = 1048576
+SHEET_ROW_LIMIT = EXCEL_MAX_ROWS - 1
+COLUMNAR_EXPORT = False
+
+
+def is_oversize(df, row_limit=SHEET_ROW_LIMIT):
+    """
+    Return True if the table does not fit on one Excel sheet below its header row.
+
+    """
+    return len(df) > row_limit
+
+
+def _excel_value(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def write_companion_workbook(path, df, sheet_name, row_limit=SHEET_ROW_LIMIT):
+    """
+    Stream a table into a write-only workbook, row_limit rows per numbered sheet, and return the sheet count.
+
+    """
+    workbook = Workbook(write_only=True)
+    rows = df.itertuples(index=False, name=None)
+    sheet_count = max(1, math.ceil(len(df) / row_limit))
+    for part in range(1, sheet_count + 1):
+        sheet = workbook.create_sheet(f"{sheet_name} {part}"[:31])
+        sheet.append(list(df.columns))
+        for row in islice(rows, row_limit):
+            sheet.append([_excel_value(value) for value in row])
+    workbook.save(path)
+    return sheet_count
+
+
+def write_sheet(writer, output_file, df, sheet_name, row_limit=SHEET_ROW_LIMIT):
+    """
+    Write a table to its sheet, or to a companion workbook of numbered sheets if it is too long for one.
+
+    The sheet in the main workbook then says where the rows went.
+
+    """
+    if not is_oversize(df, row_limit):
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return
+
+    companion_file = f"{os.path.splitext(output_file)[0]}_{sheet_name.replace(' ', '_')}.xlsx"
+    sheet_count = write_companion_workbook(companion_file, df, sheet_name, row_limit)
+    pd.DataFrame(
+        [(len(df), sheet_count, os.path.basename(companion_file))],
+        columns=["Rows", "Sheets", "Workbook"],
+    ).to_excel(writer, sheet_name=sheet_name, index=False)
+    print(f"{sheet_name}: {len(df)} rows written to {sheet_count} sheet(s) in {companion_file}")
+
+
+def export_full_tables(output_file, tables, row_limit=SHEET_ROW_LIMIT):
+    """
+    Export every table to a compressed columnar file if COLUMNAR_EXPORT is set or any table is oversize.
+
+    Parquet is written when pyarrow or fastparquet is installed and the table converts cleanly,
+    gzip-compressed CSV otherwise.
+    Returns the paths written.
+
+    """
+    if not COLUMNAR_EXPORT and not any(is_oversize(df, row_limit) for df in tables.values()):
+        return []
+
+    base = os.path.splitext(output_file)[0]
+    paths = []
+    for name, df in tables.items():
+        path = f"{base}_{name.replace(' ', '_')}"
+        try:
+            df.to_parquet(path + ".parquet", index=False)
+            paths.append(path + ".parquet")
+        except (ImportError, ValueError, TypeError):
+            df.to_csv(path + ".csv.gz", index=False, compression="gzip")
+            paths.append(path + ".csv.gz")
+    print(f"Full tables exported to {', '.join(paths)}")
+    return paths
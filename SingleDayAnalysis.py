@@ -1,152 +1,91 @@
+import os
+import time
 import pandas as pd
-from collections import defaultdict
-import matplotlib.pyplot as plt
-from openpyxl.drawing.image import Image
 from openpyxl.styles import Font
-from Utils import (
-    parse_html,
-    parse_issues,
-    process_nonduplicate
-)
+from Charts import ChartJob, chart_timings, pie_chart_png
+from HtmlReport import svg_pie_chart, write_html_report, write_json_summary
+from ReportExtraction import extract_report
+from ReportFrames import issue_frame, valuation_frame
+from SheetExport import export_full_tables, write_sheet
+from Timeline import TIMELINE_SHEETS, prepare_timeline_frames
 
-def extract_messages(html_file):
-    """
-    Extract messages from the provided HTML file.
+PARSE_REGIONS = ("campaign", "titles", "valuations", "issues")
 
-    """
-    soup = parse_html(html_file)
-
-    passes = defaultdict(lambda: {"stimulations": [], "test_cases": []})
-    issues = defaultdict(
-        lambda: {
-            "stimulations": [],
-            "test_cases": [],
-            "messages": [],
-            "types": [],
-            "times": [],
-            "previous_actions": []
-        }
-    )
-    warnings = defaultdict(lambda: {"stimulations": [], "test_cases": []})
-
-    stimulations = [
-        (div, div.find("span", class_="highlight").get_text(strip=True))
-        for div in soup.find_all("div") if "title" in div.get("class", []) and div.find("span", class_="highlight")
-    ]
-    test_cases = [
-        (div, div.get_text(strip=True).split()[0])
-        for div in soup.find_all("div") if "title" in div.get("class", []) and "test" in div.get("class", [])
-    ]
-
-    for tag in soup.find_all("span", class_=True):
-        issue = parse_issues(tag, stimulations)
-        if issue and issue["test_case"] not in issues[issue["stimulation"]]["test_cases"]:
-            issues[issue["stimulation"]]["stimulations"].append(issue["stimulation"])
-            issues[issue["stimulation"]]["test_cases"].append(issue["test_case"])
-            issues[issue["stimulation"]]["messages"].append(issue["message"])
-            issues[issue["stimulation"]]["types"].append(issue["type"])
-            issues[issue["stimulation"]]["times"].append(issue["timestamp"])
-            issues[issue["stimulation"]]["previous_actions"].append(issue["previous_actions"])
-
-    process_nonduplicate(soup, stimulations, test_cases, "PASS", passes)
-    process_nonduplicate(soup, stimulations, test_cases, "WARNING", warnings)
-
-    campaign_details = {}
-    campaign_section = soup.find("div", {"data-tab": "campaign"})
-    if campaign_section:
-        for row in campaign_section.find_all("tr"):
-            columns = row.find_all("td")
-            if len(columns) == 2:
-                key = columns[0].get_text(strip=True)
-                value = columns[1].get_text(strip=True)
-                campaign_details[key] = value
-
-    return passes, issues, warnings, campaign_details
-
-def clean_message(message):
-    """
-    Clean the message by extracting the relevant part after ':'.
 
+def extract_messages(html_file, extraction=None):
     """
-    if ':' in message:
-        return message.split(':', 1)[1].strip()
-    return message
+    Extract messages from the provided HTML file, or from an existing extraction result.
 
-def prepare_message_rows(data, is_pass=False):
-    """
-    Prepare rows for passes, warnings, or issues.
+    Passes and warnings are {(stimulation, test case): count}; issues are the extracted issue records.
 
     """
-    rows = []
-    last_test_case = None
-    for stim, info in data.items():
-        for i in range(len(info["test_cases"])):
-            test_case = info["test_cases"][i]
-            current_test_case = "" if test_case == last_test_case else test_case
-            if is_pass:
-                rows.append([current_test_case, stim, ""])
-            else:
-                type_value = info["types"][i]
-                message = clean_message(info["messages"][i]) if "messages" in info else ""
-                time = info["times"][i]
-                previous_actions = info["previous_actions"][i]
-                rows.append([current_test_case, type_value, stim, message, time, previous_actions])
-            last_test_case = test_case
-    return rows
-
-def generate_excel_report(html_file, passes, warnings, issues, campaign_details):
+    extraction = extraction or extract_report(html_file, regions=PARSE_REGIONS)
+
+    return extraction.passes, extraction.issues, extraction.warnings, extraction.campaign_table
+
+CAMPAIGN_INFO = [
+    ("Campaign Name", "Campaign name"),
+    ("Campaign Date", "Campaign date"),
+    ("Duration", "Duration"),
+    ("ENNA Version", "ENNA version"),
+    ("Python Version", "Python version"),
+]
+
+
+def prepare_report_frames(passes, warnings, issues):
     """
-     Generate an Excel report with passes, warnings, issues, and campaign details.
+    Build the Issues, Passes and Warnings tables and the category counts shared by all output formats.
 
-     """
-    issues_data_frame = pd.DataFrame(
-        prepare_message_rows(issues),
-        columns=["Test Case", "Type", "Stimulation", "Message", "Time", "Previous Actions"]
-    )
-    issues_data_frame.insert(5, "Jira Ticket", "")
-    issues_data_frame.insert(6, "Jira Status", "")
-    issues_data_frame.insert(7, "Comments", "")
+    Each table is built once in its final shape: one issue per stimulation and test case with helper
+    steps left out, and passes and warnings without the first valuation of the run.
 
-    passes_data_frame = pd.DataFrame(
-        prepare_message_rows(passes, is_pass=True),
-        columns=["Test Case", "Stimulation", "Message"]
+    """
+    issues_data_frame, type_counts = issue_frame(
+        issues, dedup_test_cases=True, clean_messages=True, exclude_helpers=True
     )
+    passes_data_frame = valuation_frame(passes, skip_first_row=True)
+    warnings_data_frame = valuation_frame(warnings, skip_first_row=True)
 
-    warnings_data_frame = pd.DataFrame(
-        prepare_message_rows(warnings, is_pass=True),
-        columns=["Test Case", "Stimulation", "Message"]
-    )
-    pattern = r"^\d{2}_\d{2}$"
-    issues_data_frame = issues_data_frame[~issues_data_frame["Test Case"].str.match(pattern, na=False)]
+    category_counts = {
+        "Passes": len(passes_data_frame),
+        "Warnings": len(warnings_data_frame),
+        "Failures": type_counts["Failure"],
+        "Errors": type_counts["Error"],
+    }
+    return issues_data_frame, passes_data_frame, warnings_data_frame, category_counts
 
-    if not passes_data_frame.empty:
-        passes_data_frame = passes_data_frame.iloc[1:]
 
-    if not warnings_data_frame.empty:
-        warnings_data_frame = warnings_data_frame.iloc[1:]
+def generate_excel_report(html_file, passes, warnings, issues, campaign_details, timeline_frames=()):
+    """
+     Generate an Excel report with passes, warnings, issues, campaign details and the timeline tables.
 
-    output_file = html_file + "_summary.xlsx"
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+     Returns the tables by sheet name.
 
-        issues_data_frame.to_excel(writer, sheet_name="Issues", index=False)
-        passes_data_frame.to_excel(writer, sheet_name="Passes", index=False)
-        warnings_data_frame.to_excel(writer, sheet_name="Warnings", index=False)
+     """
+    issues_data_frame, passes_data_frame, warnings_data_frame, category_counts = prepare_report_frames(
+        passes, warnings, issues
+    )
+
+    fixed_categories = ["Passes", "Warnings", "Failures", "Errors"]
+    fixed_colors = {"Passes": "green", "Warnings": "yellow", "Failures": "orange", "Errors": "red"}
+    category_counts = {key: category_counts.get(key, 0) for key in fixed_categories}
+
+    sorted_counts = [(key, category_counts[key]) for key in fixed_categories]
+    categories = [x[0] for x in sorted_counts]
+    counts = [x[1] for x in sorted_counts]
+    colors = [fixed_colors[category] for category in categories]
+    pie_chart = ChartJob(pie_chart_png, "Message Summary", categories, counts, colors)
+    assembly_started = time.time()
 
-        category_counts = {
-            "Passes": len(passes_data_frame),
-            "Warnings": len(warnings_data_frame),
-            "Failures": len(issues_data_frame[issues_data_frame["Type"] == "Failure"]),
-            "Errors": len(issues_data_frame[issues_data_frame["Type"] == "Error"]),
-        }
+    output_file = html_file + "_summary.xlsx"
+    tables = {"Issues": issues_data_frame, "Passes": passes_data_frame, "Warnings": warnings_data_frame}
+    tables.update(zip(TIMELINE_SHEETS, timeline_frames))
+    export_full_tables(output_file, tables)
 
-        fixed_categories = ["Passes", "Warnings", "Failures", "Errors"]
-        fixed_colors = {"Passes": "green", "Warnings": "yellow", "Failures": "orange", "Errors": "red"}
-        category_counts = {key: category_counts.get(key, 0) for key in fixed_categories}
+    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
 
-        sorted_counts = [(key, category_counts[key]) for key in fixed_categories]
-        categories = [x[0] for x in sorted_counts]
-        counts = [x[1] for x in sorted_counts]
-        colors = [fixed_colors[category] for category in categories]
+        for sheet_name, data_frame in tables.items():
+            write_sheet(writer, output_file, data_frame, sheet_name)
 
         summary_data = pd.DataFrame(sorted_counts, columns=["Category", "Count"])
         summary_data.to_excel(writer, sheet_name="Summary", index=False, startrow=6)
@@ -154,34 +93,59 @@ def generate_excel_report(html_file, passes, warnings, issues, campaign_details)
         workbook = writer.book
         summary_sheet = workbook["Summary"]
 
-        campaign_info = [
-            ("Campaign Name", "Campaign name"),
-            ("Campaign Date", "Campaign date"),
-            ("Duration", "Duration"),
-            ("ENNA Version", "ENNA version"),
-            ("Python Version", "Python version"),
-        ]
-
-        for row, (label, key) in enumerate(campaign_info, start=1):
+        for row, (label, key) in enumerate(CAMPAIGN_INFO, start=1):
             summary_sheet.cell(row=row, column=1, value=label).font = Font(bold=True)
             summary_sheet.cell(row=row, column=2, value=campaign_details.get(key, "N/A"))
 
-        plt.figure(figsize=(5, 5))
-        plt.pie(counts, labels=categories, colors=colors, autopct='%1.1f%%', startangle=140)
-        plt.title("Message Summary")
-        plt.savefig("pie_chart.png")
-        plt.close()
-
-        img = Image("pie_chart.png")
-        summary_sheet.add_image(img, "E7")
+        assembly_finished = time.time()
+        summary_sheet.add_image(pie_chart.image(), "E7")
 
     print(f"Excel report with filtered data and pie chart written to {output_file}")
+    print(chart_timings([pie_chart], assembly_started, assembly_finished))
+    return tables
+
+def generate_html_report(output_file, passes, warnings, issues, campaign_details, timeline_frames=()):
+    """
+    Generate an HTML report and a JSON summary with passes, warnings, issues, and campaign details.
+
+    Returns the tables by name.
+
+    """
+    issues_data_frame, passes_data_frame, warnings_data_frame, category_counts = prepare_report_frames(
+        passes, warnings, issues
+    )
+    campaign_rows = [(label, campaign_details.get(key, "N/A")) for label, key in CAMPAIGN_INFO]
+    tables = {"Issues": issues_data_frame, "Passes": passes_data_frame, "Warnings": warnings_data_frame}
+    tables.update(zip(TIMELINE_SHEETS, timeline_frames))
+
+    write_html_report(
+        output_file,
+        "Single Day Analysis",
+        summary_rows=campaign_rows + list(category_counts.items()),
+        charts=[svg_pie_chart("Message Summary", category_counts)],
+        tables=list(tables.items()),
+    )
+    write_json_summary(os.path.splitext(output_file)[0] + ".json", {
+        "campaign": dict(campaign_rows),
+        "counts": category_counts,
+        "issues": issues_data_frame.to_dict(orient="records"),
+        "timeline": {name: df.to_dict(orient="records") for name, df in zip(TIMELINE_SHEETS, timeline_frames)},
+    })
+
+    print(f"HTML report and JSON summary written to {output_file}")
+    return tables
 
-def analyze(html_file, save_path):
+def analyze(html_file, save_path, extraction=None, output_format="excel"):
     """
-    Analyze the HTML file and generate a report.
+    Analyze the HTML file and generate a report in Excel or HTML/JSON format; returns its tables by name.
 
     """
-    passes, issues, warnings, campaign_details = extract_messages(html_file)
-    output_file = f"{save_path}/{html_file.split('/')[-1]}_summary.xlsx"
-    generate_excel_report(output_file, passes, warnings, issues, campaign_details)
\ No newline at end of file
+    extraction = extraction or extract_report(html_file, regions=PARSE_REGIONS)
+    passes, issues, warnings, campaign_details = extract_messages(html_file, extraction)
+    timeline_frames = prepare_timeline_frames(extraction.events)
+    if output_format == "html":
+        output_file = f"{save_path}/{html_file.split('/')[-1]}_summary.html"
+        return generate_html_report(output_file, passes, warnings, issues, campaign_details, timeline_frames)
+    else:
+        output_file = f"{save_path}/{html_file.split('/')[-1]}_summary.xlsx"
+        return generate_excel_report(output_file, passes, warnings, issues, campaign_details, timeline_frames)
@@ -1,5 +1,7 @@
+import os
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, simpledialog
+from ReportReader import ARCHIVE_EXTENSION, REPORT_FILE_TYPES, expand_inputs
 
 
 class SingleFileSelector:
@@ -7,7 +9,7 @@ class SingleFileSelector:
     A GUI class for selecting a single file for analysis and specifying a folder to save the report.
 
     """
-    def __init__(self, master, run_function, cyclic_run_function):
+    def __init__(self, master, run_function, cyclic_run_function, quick_look_function=None):
         """
         Initialize the SingleFileSelector with GUI components.
 
@@ -15,7 +17,9 @@ class SingleFileSelector:
         self.master = master
         self.run_function = run_function
         self.cyclic_run_function = cyclic_run_function
+        self.quick_look_function = quick_look_function
         self.cyclic_run_var = tk.BooleanVar()
+        self.html_output_var = tk.BooleanVar()
         self.frame = tk.Frame(self.master)
         self.frame.grid(row=0, column=0)
 
@@ -44,6 +48,13 @@ class SingleFileSelector:
         )
         self.cyclic_run_checkbox.grid(row=2, column=0, columnspan=2)
 
+        self.html_output_checkbox = tk.Checkbutton(
+            self.frame,
+            text="HTML/JSON Output",
+            variable=self.html_output_var
+        )
+        self.html_output_checkbox.grid(row=2, column=2)
+
         self.run_button = tk.Button(
             self.frame,
             text="Run",
@@ -51,18 +62,50 @@ class SingleFileSelector:
         )
         self.run_button.grid(row=3, column=0, columnspan=3)
 
+        if self.quick_look_function:
+            self.quick_look_button = tk.Button(
+                self.frame,
+                text="Quick Look",
+                command=self.execute_quick_look
+            )
+            self.quick_look_button.grid(row=4, column=0, columnspan=3)
+
         self.filepath = ""
         self.savepath = ""
 
     def select_file(self):
         """
         Open a file dialog to select a single file and update the file entry widget.
+
+        For a .zip archive, the report inside it is selected, asking which one when it holds several.
         """
-        self.filepath = filedialog.askopenfilename()
+        self.filepath = filedialog.askopenfilename(filetypes=REPORT_FILE_TYPES)
+        if self.filepath and self.filepath.lower().endswith(ARCHIVE_EXTENSION):
+            self.filepath = self.select_archive_member(self.filepath)
         if self.filepath:
             self.file_entry.delete(0, tk.END)
             self.file_entry.insert(0, self.filepath)
 
+    def select_archive_member(self, archive):
+        """
+        Return the "archive.zip/member" path of the report to analyze in an archive, or "" if none is chosen.
+        """
+        members = expand_inputs([archive])
+        if members == [archive]:
+            messagebox.showerror("Archive Unreadable", f"The archive '{archive}' could not be read.")
+            return ""
+        if not members:
+            messagebox.showerror("No Report", f"The archive '{archive}' holds no HTML report.")
+            return ""
+        if len(members) == 1:
+            return members[0]
+        names = "\n".join(f"{idx}: {os.path.basename(member)}" for idx, member in enumerate(members, 1))
+        choice = simpledialog.askinteger(
+            "Select Report", f"The archive holds {len(members)} reports:\n{names}\n\nReport number:",
+            minvalue=1, maxvalue=len(members), parent=self.master
+        )
+        return members[choice - 1] if choice else ""
+
     def select_save_path(self):
         """
         Open a folder dialog to select a save folder and update the save entry widget.
@@ -79,9 +122,23 @@ class SingleFileSelector:
         """
         if self.filepath and self.savepath:
             cyclic_run = self.cyclic_run_var.get()
-            self.run_function(self.filepath, self.savepath, cyclic_run=cyclic_run)
+            output_format = "html" if self.html_output_var.get() else "excel"
+            self.run_function(self.filepath, self.savepath, cyclic_run=cyclic_run, output_format=output_format)
         else:
             messagebox.showwarning(
                 "Input Missing",
                 "Please select a file and a save folder before proceeding."
             )
+
+    def execute_quick_look(self):
+        """
+        Show the summary counts and campaign details of the selected file without generating a report.
+
+        """
+        if self.filepath:
+            self.quick_look_function(self.filepath)
+        else:
+            messagebox.showwarning(
+                "Input Missing",
+                "Please select a file before proceeding."
+            )
@@ -0,0 +1,116 @@
+import numbers
+import numpy as np
+import pandas as pd
+
+
+def _sort_key(value):
+    # Numbers first, then the other values grouped by type, so values of different types never meet.
+    if isinstance(value, numbers.Number):
+        return 0, "", value
+    return 1, type(value).__name__, value
+
+
+def factorize_sorted(column):
+    """
+    Encode a column as integer codes ordered like its values, with -1 for missing values.
+
+    Returns (codes, uniques). A column mixing values that cannot be compared, such as dates and
+    numbers, is ordered numbers first and then by type; as text when that still fails.
+
+    """
+    try:
+        codes, uniques = pd.factorize(column, sort=True)
+    except TypeError:
+        codes, uniques = pd.factorize(column)
+        try:
+            order = sorted(range(len(uniques)), key=lambda idx: _sort_key(uniques[idx]))
+        except TypeError:
+            order = sorted(range(len(uniques)), key=lambda idx: str(uniques[idx]))
+        order = np.array(order, dtype=np.intp)
+        ranks = np.empty(len(order), dtype=np.intp)
+        ranks[order] = np.arange(len(order))
+        codes = np.where(codes >= 0, ranks[np.maximum(codes, 0)], -1)
+        uniques = uniques[order]
+    return (codes.astype(np.int32) if len(uniques) < 2 ** 31 else codes), uniques
+
+
+class TableRows:
+    """
+    The row positions of a table shown after filtering and sorting, independent of any widget.
+
+    Each column is factorized once into integer codes: a sort is a stable argsort of the codes and a
+    filter tests every distinct value once and selects the rows through the codes.
+
+    """
+
+    def __init__(self, table):
+        """
+        Initialize the rows over a DataFrame, all shown in table order.
+
+        """
+        self.table = table.reset_index(drop=True)
+        self.rows = np.arange(len(self.table))
+        self.codes = {}
+        self.sort_column = None
+        self.descending = False
+        self.filter_text = ""
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _codes(self, idx):
+        if idx not in self.codes:
+            self.codes[idx] = factorize_sorted(self.table.iloc[:, idx])
+        return self.codes[idx]
+
+    def _matching_rows(self):
+        if not self.filter_text:
+            return np.arange(len(self.table))
+        mask = np.zeros(len(self.table), dtype=bool)
+        for idx in range(len(self.table.columns)):
+            codes, uniques = self._codes(idx)
+            # One entry per distinct value, plus False for the missing values coded -1.
+            matches = np.fromiter(
+                (self.filter_text in str(value).lower() for value in uniques), dtype=bool, count=len(uniques)
+            )
+            mask |= np.append(matches, False)[codes]
+        return np.flatnonzero(mask)
+
+    def update(self):
+        """
+        Recompute the row positions from the filter and the sort column.
+
+        """
+        rows = self._matching_rows()
+        if self.sort_column is not None:
+            codes = self._codes(self.sort_column)[0][rows]
+            rows = rows[np.argsort(-codes if self.descending else codes, kind="stable")]
+        self.rows = rows
+
+    def set_filter(self, text):
+        """
+        Keep only the rows with a cell containing the text, ignoring case; all rows when it is empty.
+
+        """
+        self.filter_text = text.strip().lower()
+        self.update()
+
+    def sort(self, idx):
+        """
+        Sort by a column, or reverse the order when it is already the sort column.
+
+        """
+        self.descending = not self.descending if self.sort_column == idx else False
+        self.sort_column = idx
+        self.update()
+
+    def window(self, offset, count):
+        """
+        Return the cells of count rows from offset as text, "" for missing values.
+
+        """
+        window = self.table.iloc[self.rows[offset:offset + count]]
+        return [
+            ["" if pd.isna(value) else str(value) for value in values]
+            for values in window.itertuples(index=False, name=None)
+        ]
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from ReportExtraction import RecordColumns
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+UTC_OFFSET_PATTERN = r"[+-]\d{2}:?\d{2}$"
+NANOSECONDS = 10 ** 9
+SLOWEST_STEPS = 20
+TIMELINE_SHEETS = ("Timeline", "Test Case Durations", "Slowest Steps")
+
+
+def build_timeline(events):
+    """
+    Parse the event timestamps once into a time-ordered event table.
+
+    events are the (stimulation, test case, timestamp) of the timestamped info and issue spans of a
+    report, so passing runs have a timeline too, as records or as the RecordColumns of an
+    ExtractionResult, whose columns are used as they are. Timestamps are left as
+    "YYYY-MM-DDHH:MM:SS"; a "T" is put back between date and time so pandas can take its ISO 8601
+    fast path instead of parsing each string with strptime. Timestamps in another ISO 8601 shape,
+    such as with fractional seconds, are parsed in a second pass, and the number of events left out
+    with an unreadable timestamp is printed.
+
+    Times are the bench's wall-clock time as written in the report: a UTC offset is dropped without
+    converting, since most events have none and could not be converted. They are kept to the
+    nanosecond.
+
+    """
+    if isinstance(events, RecordColumns):
+        stimulations, test_cases, timestamps = events.columns.values()
+    else:
+        stimulations, test_cases, timestamps = zip(*events) if events else ((), (), ())
+    timestamps = pd.Series(timestamps, dtype=object).astype(str)
+    timestamps = timestamps.str[:10] + "T" + timestamps.str[10:]
+    times = pd.to_datetime(timestamps, format=TIMESTAMP_FORMAT, errors="coerce").astype("datetime64[ns]")
+    unread = times.isna()
+    if unread.any():
+        times[unread] = pd.to_datetime(
+            timestamps[unread].str.replace(UTC_OFFSET_PATTERN, "", regex=True), format="ISO8601", errors="coerce"
+        ).astype("datetime64[ns]")
+    dropped = int(times.isna().sum())
+    if dropped:
+        print(f"Timeline: left out {dropped} of {len(times)} event(s) with an unreadable timestamp")
+
+    timeline = pd.DataFrame({"Stimulation": stimulations, "Test Case": test_cases, "Time": times})
+    timeline = timeline.dropna(subset=["Time"])
+    return timeline.sort_values("Time", kind="stable").reset_index(drop=True)
+
+
+def step_durations(timeline, key):
+    """
+    Split the timeline into steps, runs of consecutive events with the same key, and time them.
+
+    A step lasts until the next step starts; the gap is the idle time between its last event and
+    the next step.
+
+    """
+    columns = [key, "Start", "End", "Events", "Duration (s)", "Gap To Next (s)"]
+    if timeline.empty:
+        return pd.DataFrame(columns=columns)
+
+    values = timeline[key].to_numpy()
+    times = timeline["Time"].to_numpy()
+    nanoseconds = times.astype("datetime64[ns]").astype(np.int64)
+
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    ends = np.r_[starts[1:], len(values)] - 1
+    next_starts = np.r_[nanoseconds[starts[1:]], nanoseconds[-1]]
+    gaps = np.r_[nanoseconds[starts[1:]] - nanoseconds[ends[:-1]], 0]
+
+    return pd.DataFrame({
+        key: values[starts],
+        "Start": times[starts],
+        "End": times[ends],
+        "Events": ends - starts + 1,
+        "Duration (s)": (next_starts - nanoseconds[starts]) / NANOSECONDS,
+        "Gap To Next (s)": gaps / NANOSECONDS,
+    }, columns=columns)
+
+
+def prepare_timeline_frames(events):
+    """
+    Build the stimulation timeline, the per-test-case durations and the slowest test case steps from
+    the events of an ExtractionResult.
+
+    """
+    timeline = build_timeline(events)
+    stimulation_steps = step_durations(timeline, "Stimulation")
+    test_case_steps = step_durations(timeline, "Test Case")
+
+    test_case_durations = (
+        test_case_steps.groupby("Test Case", sort=False)["Duration (s)"]
+        .agg(["sum", "count", "max"])
+        .rename(columns={"sum": "Total Duration (s)", "count": "Steps", "max": "Longest Step (s)"})
+        .sort_values("Total Duration (s)", ascending=False, kind="stable")
+        .reset_index()
+    )
+    total = test_case_durations["Total Duration (s)"].sum()
+    test_case_durations["Share (%)"] = (
+        (test_case_durations["Total Duration (s)"] / total * 100).round(2) if total else 0.0
+    )
+
+    slowest_steps = (
+        test_case_steps.sort_values("Duration (s)", ascending=False, kind="stable")
+        .head(SLOWEST_STEPS)
+        .reset_index(drop=True)
+    )
+    return stimulation_steps, test_case_durations, slowest_steps
@@ -1,26 +1,173 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+import bisect
+import mmap
 import re
+import time
 import pandas as pd
-import matplotlib.pyplot as plt
-from openpyxl.drawing.image import Image
 from openpyxl.styles import Font
+from Charts import ChartJob, pie_chart_png
 from collections import defaultdict
+from ReportReader import DECODE_ERRORS, decode_report, open_report
 
 
-def parse_html(filepath):
+REGION_RULES = {
+    "campaign": lambda name, attrs, classes: name == "div" and (
+        ("content" in classes and "active" in classes) or attrs.get("data-tab") == "campaign"
+    ),
+    "titles": lambda name, attrs, classes: name == "div" and "title" in classes,
+    "tests": lambda name, attrs, classes: name == "div" and attrs.get("name") == "test",
+    "valuations": lambda name, attrs, classes: name == "div" and "content" in classes,
+    "issues": lambda name, attrs, classes: name == "span" and any(
+        class_name in ("text-error", "text-fail", "text-info") for class_name in classes
+    ),
+}
+
+
+class RegionStrainer(SoupStrainer):
+    """
+    Parse filter that only builds tree nodes for the report regions an analysis needs.
+
+    Matching elements are built with their whole subtree and keep their source lines; everything
+    else, including scripts, styles and log lines outside those regions, is skipped.
+
+    """
+
+    def __init__(self, regions):
+        super().__init__()
+        self.rules = [REGION_RULES[region] for region in regions]
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        attrs = attrs or {}
+        classes = attrs.get("class", [])
+        if isinstance(classes, str):
+            classes = classes.split()
+        return any(rule(name, attrs, classes) for rule in self.rules)
+
+    def allow_string_creation(self, string):
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs=None):
+        # Used instead of allow_tag_creation by BeautifulSoup releases before 4.13.
+        return self.allow_tag_creation(None, markup_name, markup_attrs or {})
+
+
+class RegionSoup(BeautifulSoup):
     """
-    Parse the HTML content from a file.
+    Tree built through a RegionStrainer that remembers where the skipped elements were.
 
+    Kept elements whose enclosing elements were skipped end up side by side at the top of the tree.
+    Each of them records the skipped element it sat in (source_parent, 0 for the document) and how
+    many skipped spans came before it in that element (skipped_spans), so source_siblings can walk
+    the siblings it has in a full parse.
+
+    """
+
+    def reset(self):
+        super().reset()
+        self.open_regions = []
+        self.region_parents = {0: None}
+        self.span_counts = defaultdict(int)
+
+    def handle_starttag(self, name, *args, **kwargs):
+        top_level = len(self.tagStack) <= 1
+        tag = super().handle_starttag(name, *args, **kwargs)
+        if top_level:
+            parent = self.open_regions[-1][1] if self.open_regions else 0
+            if tag is not None:
+                tag.source_parent = parent
+                tag.skipped_spans = self.span_counts[parent]
+            else:
+                if name == "span":
+                    self.span_counts[parent] += 1
+                if not self.builder.can_be_empty_element(name):
+                    region = len(self.region_parents)
+                    self.region_parents[region] = parent
+                    self.open_regions.append((name, region))
+        return tag
+
+    def handle_endtag(self, name, nsprefix=None):
+        if len(self.tagStack) <= 1:
+            # Closes the most recent skipped element of that name, and any left open inside it.
+            for idx in range(len(self.open_regions) - 1, -1, -1):
+                if self.open_regions[idx][0] == name:
+                    del self.open_regions[idx:]
+                    break
+        super().handle_endtag(name, nsprefix)
+
+    def encloses(self, region, other):
+        """
+        Tell whether skipped element other sits inside skipped element region, at any depth.
+
+        """
+        # Elements are numbered as they open, so an enclosing element always has a lower number.
+        while other is not None and other > region:
+            other = self.region_parents[other]
+        return other == region
+
+
+# Stands for spans that were skipped between two kept siblings; it has no class.
+SKIPPED_SPAN = Tag(name="span")
+
+
+def source_siblings(tag, forward=False):
     """
-    with open(filepath, "r", encoding="utf-8") as f:
-        html = f.read()
-    soup = BeautifulSoup(html, "html.parser")
+    Yield the siblings the tag has in a full parse of its report, nearest first.
+
+    In a RegionSoup, kept elements that sat deeper than the tag are passed over, the walk stops at
+    the first one from outside the tag's original parent, and SKIPPED_SPAN is yielded where spans
+    that were not built came between two siblings.
+
+    """
+    siblings = tag.next_siblings if forward else tag.previous_siblings
+    soup = tag.parent
+    if not isinstance(soup, RegionSoup):
+        yield from siblings
+        return
+    parent, spans = tag.source_parent, tag.skipped_spans
+    for sibling in siblings:
+        if sibling.source_parent != parent:
+            if soup.encloses(parent, sibling.source_parent):
+                continue
+            return
+        if sibling.skipped_spans != spans:
+            yield SKIPPED_SPAN
+            spans = sibling.skipped_spans
+        yield sibling
+
+
+def parse_html(filepath, content=None, errors=DECODE_ERRORS, timings=None, regions=None):
+    """
+    Parse the HTML content from a file, or from its already-read bytes when given.
+
+    The file is memory-mapped and decoded in place using the encoding declared by its BOM or
+    meta charset. Read, decode and parse times are stored in timings when a dict is passed.
+    When regions (keys of REGION_RULES) are given, only those parts of the report are built, in a
+    RegionSoup.
+
+    """
+    start = time.perf_counter()
+    data = content if content is not None else open_report(filepath)
+    read_done = time.perf_counter()
+    try:
+        html = decode_report(data, errors)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    decode_done = time.perf_counter()
+    if regions:
+        soup = RegionSoup(html, "html.parser", parse_only=RegionStrainer(regions))
+    else:
+        soup = BeautifulSoup(html, "html.parser")
+    if timings is not None:
+        timings["read"] = read_done - start
+        timings["decode"] = decode_done - read_done
+        timings["parse"] = time.perf_counter() - decode_done
     return soup
 
 
-def add_campaign_details_rows(df, campaign_details, dates):
+def campaign_details_rows(campaign_details, dates):
     """
-    Add campaign details rows to a DataFrame for reporting.
+    Build the campaign details rows listed below the per-date tables of the multi-file reports.
 
     """
     campaign_row = {"Test Case": "Campaign Details", **{date: "" for date in dates}}
@@ -29,19 +176,20 @@ def add_campaign_details_rows(df, campaign_details, dates):
     enna_version_row = {"Test Case": "ENNA Version", **{date: "" for date in dates}}
     train_row = {"Test Case": "Train", **{date: "" for date in dates}}
 
+    date_set = set(dates)
     for filepath, details in campaign_details.items():
-        for date in dates:
-            if date in filepath:
-                bench_row[date] = details.get("Testbench", "N/A")
-                python_version_row[date] = details.get("Python Version", "N/A")
-                enna_version_row[date] = details.get("ENNA Version", "N/A")
-                train_row[date] = details.get("Train", "N/A")
+        campaign_date = details.get("Campaign Date")
+        if campaign_date in date_set:
+            matched_dates = [campaign_date]
+        else:
+            matched_dates = [date for date in dates if date in filepath]
+        for date in matched_dates:
+            bench_row[date] = details.get("Testbench", "N/A")
+            python_version_row[date] = details.get("Python Version", "N/A")
+            enna_version_row[date] = details.get("ENNA Version", "N/A")
+            train_row[date] = details.get("Train", "N/A")
 
-    df.loc[len(df)] = campaign_row
-    df.loc[len(df)] = bench_row
-    df.loc[len(df)] = python_version_row
-    df.loc[len(df)] = enna_version_row
-    df.loc[len(df)] = train_row
+    return [campaign_row, bench_row, python_version_row, enna_version_row, train_row]
 
 
 def extract_campaign_details(filepath, soup):
@@ -73,15 +221,97 @@ def extract_campaign_details(filepath, soup):
 
     if not campaign_date:
         campaign_date = "Unknown Date"
+    campaign_details["Campaign Date"] = campaign_date
 
     return campaign_date, campaign_details
 
 
+def extract_campaign_table(soup):
+    """
+    Extract every key/value row of the campaign tab.
+
+    """
+    campaign_table = {}
+    campaign_section = soup.find("div", {"data-tab": "campaign"})
+    if campaign_section:
+        for row in campaign_section.find_all("tr"):
+            columns = row.find_all("td")
+            if len(columns) == 2:
+                key = columns[0].get_text(strip=True)
+                value = columns[1].get_text(strip=True)
+                campaign_table[key] = value
+    return campaign_table
+
+
+def extract_test_valuations(soup):
+    """
+    Extract the (test case name, valuation) of every test block in the HTML.
+
+    """
+    test_valuations = []
+    for test_div in soup.find_all("div", attrs={"name": "test"}):
+        name_tag = test_div.find_next("b", string="Name")
+        valuation_tag = test_div.find_next("b", string="Valuation")
+        if name_tag and valuation_tag:
+            test_case_name = (
+                name_tag.find_next_sibling(string=True)
+                .strip()
+                .replace(":", "")
+                .strip()
+            )
+            valuation = (
+                valuation_tag.find_next_sibling(string=True)
+                .strip()
+                .replace(":", "")
+                .strip()
+                .upper()
+            )
+            if test_case_name:
+                test_valuations.append((test_case_name, valuation))
+    return test_valuations
+
+
+class SourceLineIndex(list):
+    """
+    List of (div, name) pairs in document order that also keeps their source lines for bisection.
+
+    """
+
+    def __init__(self, entries):
+        super().__init__(entries)
+        self.lines = [div.sourceline for div, name in self]
+
+    @classmethod
+    def from_lines(cls, entries):
+        """
+        Build the index from (source line, name) pairs found without a parse tree.
+
+        """
+        index = cls(())
+        index.extend(entries)
+        index.lines = [line for line, name in index]
+        return index
+
+
 def find_closest_test_case(test_cases, reference_line):
     """
     Find the closest test case based on the reference line in the HTML.
 
     """
+    lines = getattr(test_cases, "lines", None)
+    if lines is not None:
+        if not lines:
+            return "Unknown Test Case"
+        idx = bisect.bisect_left(lines, reference_line)
+        if idx == len(lines):
+            return test_cases[bisect.bisect_left(lines, lines[-1])][1]
+        if idx > 0:
+            # On a tie the earlier entry wins, as in the linear scan below.
+            lower = bisect.bisect_left(lines, lines[idx - 1])
+            if reference_line - lines[lower] <= lines[idx] - reference_line:
+                return test_cases[lower][1]
+        return test_cases[idx][1]
+
     closest_test_case = "Unknown Test Case"
     min_distance = float("inf")
     for test_div, test_id in test_cases:
@@ -97,23 +327,34 @@ def find_closest_stimulation(stimulations, reference_line):
      Find the closest stimulation based on the reference line in the HTML.
 
      """
+    lines = getattr(stimulations, "lines", None)
+    if lines is not None:
+        idx = bisect.bisect_left(lines, reference_line)
+        return stimulations[idx - 1][1] if idx > 0 else "Unknown Stimulation"
+
     for stim_div, stim_name in reversed(stimulations):
         if stim_div.sourceline < reference_line:
             return stim_name
     return "Unknown Stimulation"
 
 
+ISSUE_CLASSES = frozenset(("text-error", "text-fail"))
+ISSUE_FIELDS_PATTERN = re.compile(r"^([^|]*)\|[^|]*\|([^|]*)(?:\|([^|]*))?")
+TIMESTAMP_STRIP_PATTERN = re.compile(r"[ a-zA-Z]")
+TEST_CASE_PATTERN = re.compile(r"(\d{2,}_[A-Za-z0-9_]+)")
+
+
 def extract_previous_actions(tag):
     """
     Extract previous actions from the HTML tag.
 
     """
     previous_actions = []
-    for sibling in tag.find_previous_siblings():
+    for sibling in source_siblings(tag):
         if sibling.name == "span" and "text-info" in sibling.get("class", []):
             previous_actions.append(sibling.get_text(strip=True))
-        if len(previous_actions) >= 3:
-            break
+            if len(previous_actions) >= 3:
+                break
     return "; ".join(previous_actions[::-1])
 
 
@@ -121,30 +362,29 @@ def parse_issues(tag, stimulations):
     """
     Parse issue details (e.g., errors or failures) from an HTML tag.
 
+    Spans are rejected on their class before any text is extracted, and continuation spans of
+    long messages are joined while walking forward, stopping at the first non-error span.
+
     """
     class_name = tag["class"][0]
-    if class_name not in ["text-error", "text-fail"]:
+    if class_name not in ISSUE_CLASSES:
         return None
 
-    text = tag.get_text(strip=True)
-    parts = text.split('|')
-    if len(parts) >= 4:
-        message = parts[3].strip()
-        timestamp = re.sub(r"[ a-zA-Z]", "", parts[0].strip())
-    elif len(parts) >= 3:
-        message = parts[2].strip()
-        timestamp = re.sub(r"[ a-zA-Z]", "", parts[0].strip())
-    else:
+    fields = ISSUE_FIELDS_PATTERN.match(tag.get_text(strip=True))
+    if not fields:
         return None
+    message = (fields.group(3) if fields.group(3) is not None else fields.group(2)).strip()
+    timestamp = TIMESTAMP_STRIP_PATTERN.sub("", fields.group(1).strip())
 
     if len(message) > 200:
-        for sibling in tag.find_next_siblings("span"):
-            if sibling["class"][0] == "text-error":
-                message += f" {sibling.get_text(strip=True)}"
-            else:
+        for sibling in source_siblings(tag, forward=True):
+            if sibling.name != "span":
+                continue
+            if sibling.get("class", [None])[0] != "text-error":
                 break
+            message += f" {sibling.get_text(strip=True)}"
 
-    test_case_match = re.search(r"(\d{2,}_[A-Za-z0-9_]+)", message)
+    test_case_match = TEST_CASE_PATTERN.search(message)
     if not test_case_match:
         return None
     test_case_name = test_case_match.group(1)
@@ -162,75 +402,26 @@ def parse_issues(tag, stimulations):
     }
 
 
-def process_content(soup, stimulations, test_cases, keyword, target_dict):
-    for div in soup.find_all("div", class_="content"):
-        if "Valuation" in div.text and keyword in div.text:
-            stimulation = find_closest_stimulation(stimulations, div.sourceline)
-            test_case = find_closest_test_case(test_cases, div.sourceline)
-            # Always add to target_dict, regardless of duplicates
-            target_dict[stimulation]["stimulations"].append(stimulation)
-            target_dict[stimulation]["test_cases"].append(test_case)
-
-
-def process_nonduplicate(soup, stimulations, test_cases, keyword, target_dict):
-    for div in soup.find_all("div", class_="content"):
-        if "Valuation" in div.text and keyword in div.text:
-            stimulation = find_closest_stimulation(stimulations, div.sourceline)
-
-            test_case = find_closest_test_case(test_cases, div.sourceline)
-
-            if stimulation not in target_dict or test_case not in target_dict[stimulation]["test_cases"]:
-                target_dict[stimulation]["stimulations"].append(stimulation)
-                target_dict[stimulation]["test_cases"].append(test_case)
+def summary_piechart_job(category_counts):
+    """
+    Start rendering the summary pie chart of category counts.
 
-    for stim_key, stim_data in target_dict.items():
-        stim_data["stimulations"] = list(set(stim_data["stimulations"]))
-        stim_data["test_cases"] = list(set(stim_data["test_cases"]))
+    """
+    return ChartJob(
+        pie_chart_png, "Summary", list(category_counts.keys()), list(category_counts.values()),
+        ["green", "yellow", "orange", "red"]
+    )
 
 
-def prepare_message_rows(data, is_pass=False, retain_duplicates=False):
-    rows = []
-    seen_entries = set()
-    for stim, info in data.items():
-        for i in range(len(info["test_cases"])):
-            test_case = info["test_cases"][i]
-            stimulation = stim
-            if is_pass:
-                row = (test_case, stimulation, "")
-            else:
-                row = (
-                    test_case,
-                    info["types"][i],
-                    stimulation,
-                    info["messages"][i] if "messages" in info else "",
-                    info["times"][i],
-                    info["previous_actions"][i],
-                )
-
-            if retain_duplicates or row not in seen_entries:
-                rows.append(row)
-                seen_entries.add(row)
-    return rows
-
-
-def generate_summary_piechart(writer, category_counts, sheet_name="Summary"):
+def generate_summary_piechart(writer, category_counts, sheet_name="Summary", chart=None, anchor="A1"):
     """
-    Generate a pie chart and write it to the summary sheet.
+    Write the pie chart, rendered by chart or right away, and the category counts to the summary sheet.
 
     """
-    categories = list(category_counts.keys())
-    counts = list(category_counts.values())
-    colors = ["green", "yellow", "orange", "red"]
-
-    plt.figure(figsize=(5, 5))
-    plt.pie(counts, labels=categories, colors=colors, autopct='%1.1f%%', startangle=140)
-    plt.title("Summary")
-    plt.savefig("pie_chart.png")
-    plt.close()
+    chart = chart or summary_piechart_job(category_counts)
 
     summary_sheet = writer.book.create_sheet(sheet_name)
-    img = Image("pie_chart.png")
-    summary_sheet.add_image(img, "A1")
+    summary_sheet.add_image(chart.image(), anchor)
 
     for idx, (category, count) in enumerate(category_counts.items(), start=2):
         summary_sheet.cell(row=idx, column=1, value=category).font = Font(bold=True)
@@ -1,55 +1,121 @@
+import os
+import time
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, simpledialog
 from SingleFileSelector import SingleFileSelector
 from MultiFileSelector import MultiFileSelector
-from SingleDayAnalysis import analyze
-from CyclicRunAnalysis import analyze_cyclic_run
-from MultipleFileAnalysis import generate_multi_file_summary
+from ResultsViewer import ResultsViewer
+from SingleDayAnalysis import CAMPAIGN_INFO
+from QuickLook import quick_look
+from ReportAnalysis import analyze_report
+from MultipleFileAnalysis import generate_multi_file_summary, render_results_slice
 from ErrorStatistics import generate_error_statistics
+from RegressionDiff import generate_regression_diff
 
 
-def analyse_single(filepath, savepath, cyclic_run=False):
+def analyse_single(filepath, savepath, cyclic_run=False, output_format="excel"):
     """
-    Analyze a single file and generate a report.
+    Analyze a single file, generate a report and show its tables.
 
     """
-    if cyclic_run:
-        analyze_cyclic_run(filepath, savepath)
-    else:
-        analyze(filepath, savepath)
+    tables = analyze_report(
+        filepath, savepath, single_day=not cyclic_run, cyclic=cyclic_run, output_format=output_format
+    )["Cyclic" if cyclic_run else "Single Day"]
 
     messagebox.showinfo(
         "Report Generated",
         f"The report for the file '{filepath}' has been successfully saved to '{savepath}'."
     )
+    ResultsViewer(root, f"Results - {os.path.basename(filepath)}", tables)
+
+
+def quick_look_single(filepath):
+    """
+    Show the summary counts and campaign details of a file, scanned without a full analysis.
+
+    """
+    started = time.perf_counter()
+    try:
+        category_counts, campaign_details = quick_look(filepath)
+    except Exception as exc:
+        messagebox.showerror("Quick Look", f"The file '{filepath}' could not be scanned:\n{exc}")
+        return
+    lines = [f"{label}: {campaign_details.get(key, 'N/A')}" for label, key in CAMPAIGN_INFO]
+    lines += [f"{category}: {count}" for category, count in category_counts.items()]
+    messagebox.showinfo(
+        "Quick Look",
+        "\n".join(lines) + f"\n\nScanned in {time.perf_counter() - started:.2f} s."
+    )
 
 
-def analyse_test_statistics(filepaths):
+def analyse_test_statistics(filepaths, output_format="excel"):
     """
-    Analyze multiple files for test statistics and generate a summary report.
+    Analyze multiple files for test statistics, generate a summary report and show its tables.
 
     """
     savepath = filedialog.askdirectory(title="Select Folder to Save Test Statistics Report")
     if savepath:
-        generate_multi_file_summary(filepaths, savepath)
+        tables = generate_multi_file_summary(filepaths, savepath, output_format=output_format)
         messagebox.showinfo(
             "Reports Generated",
             f"The test statistics report has been successfully saved to '{savepath}'."
         )
+        ResultsViewer(root, "Results - Test Statistics", tables)
 
 
-def analyse_error_statistics(filepaths):
+def analyse_error_statistics(filepaths, output_format="excel"):
     """
-    Analyze multiple files for error statistics and generate a summary report.
+    Analyze multiple files for error statistics, generate a summary report and show its tables.
 
     """
     savepath = filedialog.askdirectory(title="Select Folder to Save Error Statistics Report")
     if savepath:
-        generate_error_statistics(filepaths, savepath)
+        tables = generate_error_statistics(filepaths, savepath, output_format=output_format)
         messagebox.showinfo(
             "Reports Generated",
             f"The error statistics report has been successfully saved to '{savepath}'."
         )
+        ResultsViewer(root, "Results - Error Statistics", tables)
+
+
+def analyse_regression_diff(baseline_filepaths, candidate_filepath):
+    """
+    Compare a candidate file against baseline files and generate a regression diff report.
+
+    """
+    savepath = filedialog.askdirectory(title="Select Folder to Save Regression Diff Report")
+    if savepath:
+        diff = generate_regression_diff(baseline_filepaths, [candidate_filepath], savepath)
+        messagebox.showinfo(
+            "Reports Generated",
+            f"{len(diff['New Failures'])} new failures and {len(diff['Fixed Tests'])} fixed tests.\n"
+            f"The regression diff report has been successfully saved to '{savepath}'."
+        )
+
+
+def analyse_results_slice(output_format="excel"):
+    """
+    Re-render the test statistics of a previous run for a bench, date range or failing test cases only.
+
+    """
+    cube_folder = filedialog.askdirectory(title="Select Folder of a Previous Test Statistics Report")
+    if not cube_folder:
+        return
+    bench = simpledialog.askstring("Slice Results", "Bench (empty for all):")
+    since = simpledialog.askstring("Slice Results", "From date YYYY-MM-DD (empty for all):")
+    until = simpledialog.askstring("Slice Results", "To date YYYY-MM-DD (empty for all):")
+    failing_only = messagebox.askyesno("Slice Results", "Only test cases that failed?")
+    savepath = filedialog.askdirectory(title="Select Folder to Save Sliced Test Statistics Report")
+    if savepath:
+        cube_slice = render_results_slice(
+            cube_folder, savepath, since=since or None, until=until or None,
+            benches=[bench] if bench else None, failing_only=failing_only, output_format=output_format,
+        )
+        messagebox.showinfo(
+            "Reports Generated",
+            f"{len(cube_slice.test_cases)} test cases over {len(cube_slice.dates)} dates.\n"
+            f"The sliced test statistics report has been successfully saved to '{savepath}'."
+        )
 
 
 def select_mode():
@@ -67,14 +133,19 @@ def select_mode():
         fileselector = SingleFileSelector(
             root,
             run_function=analyse_single,
-            cyclic_run_function=lambda filepath, savepath: analyse_single(filepath, savepath, cyclic_run=True)
+            cyclic_run_function=lambda filepath, savepath, output_format="excel": analyse_single(
+                filepath, savepath, cyclic_run=True, output_format=output_format
+            ),
+            quick_look_function=quick_look_single
         )
     else:
         global multifileselector
         multifileselector = MultiFileSelector(
             root,
             test_callback=analyse_test_statistics,
-            error_callback=analyse_error_statistics
+            error_callback=analyse_error_statistics,
+            diff_callback=analyse_regression_diff,
+            slice_callback=analyse_results_slice
         )
 
 
@@ -0,0 +1,47 @@
+"""
+Extraction time, peak memory and counter sizes of a long synthetic cyclic run, and the time to build
+the cyclic report tables from its per-cycle counters.
+
+Run with: python tests/bench_cyclic_run.py [cycles]   (10000 for the full-size run)
+
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from CyclicRunAnalysis import PARSE_REGIONS, prepare_cycle_frames, prepare_report_frames
+from ReportExtraction import extract_report
+from report_generator import make_report
+
+
+if __name__ == "__main__":
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = make_report(os.path.join(folder, "TB001_cyclic.html"), stimulations=2, tests=2, cycles=cycles)
+        print(f"{cycles} cycles, {cycles * 4} tests, {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+
+        started = time.perf_counter()
+        extraction = extract_report(path, regions=PARSE_REGIONS)
+        extracted = time.perf_counter()
+
+        # Traced separately: tracemalloc slows the parser down several times.
+        tracemalloc.start()
+        tables_started = time.perf_counter()
+        tables = prepare_report_frames(extraction.passes, extraction.warnings, extraction.issues)
+        cycle_tables = prepare_cycle_frames(extraction.cycle_counts)
+        built = time.perf_counter()
+        tables_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"  extraction {extracted - started:6.2f} s")
+        print(f"  tables     {built - tables_started:6.2f} s, peak {tables_peak / 2 ** 20:6.1f} MiB")
+        print(f"  detected cycles {extraction.cycles}, cycle counters {len(extraction.cycle_counts)} keys, "
+              f"pass counters {len(extraction.passes)} keys for {sum(extraction.passes.values())} passes, "
+              f"{len(extraction.issues)} issues")
+        print(f"  cycles table {len(cycle_tables[0])} rows, test case cycles table {len(cycle_tables[1])} rows")
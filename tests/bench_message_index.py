@@ -0,0 +1,59 @@
+"""
+Query latency of the message index over many generated reports: term, phrase and prefix queries,
+before and after merging its segments, and the time to build it.
+
+Run with: python tests/bench_message_index.py [reports] [tests per stimulation]
+
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from MessageIndex import MessageIndex
+from report_generator import make_report
+
+QUERIES = ("fail", "error message", '"fail message 3"', "mess*", "no_such_term")
+REPEATS = 20
+
+
+def time_queries(index):
+    for query in QUERIES:
+        started = time.perf_counter()
+        for _ in range(REPEATS):
+            results = index.search(query)
+        elapsed = (time.perf_counter() - started) / REPEATS
+        print(f"    {query:20} {elapsed * 1000:8.2f} ms ({len(results)} occurrences)")
+
+
+if __name__ == "__main__":
+    reports = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tests = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as folder:
+        first_day = datetime.date(2022, 1, 1)
+        paths = [
+            make_report(
+                os.path.join(folder, f"TB00{idx % 4 + 1}_{first_day + datetime.timedelta(days=idx)}.html"),
+                date=str(first_day + datetime.timedelta(days=idx)), seed=idx, tests=tests,
+            )
+            for idx in range(reports)
+        ]
+        print(f"{reports} reports, {reports * 3 * tests} tests")
+
+        index = MessageIndex(os.path.join(folder, "index"))
+        started = time.perf_counter()
+        index.update(paths)
+        index.wait_for_merge()
+        print(f"  indexing {time.perf_counter() - started:6.2f} s, {len(index.segments)} segments")
+        time_queries(index)
+
+        started = time.perf_counter()
+        index.merge()
+        print(f"  merge    {time.perf_counter() - started:6.2f} s, {len(index.segments)} segment")
+        time_queries(index)
+        index.close()
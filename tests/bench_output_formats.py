@@ -0,0 +1,65 @@
+"""
+End-to-end time of writing the four analyses as Excel workbooks and as HTML pages with JSON
+summaries, from the same extracted reports.
+
+Run with: python tests/bench_output_formats.py [reports] [tests per stimulation]
+
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from CyclicRunAnalysis import analyze_cyclic_run
+from ErrorStatistics import generate_error_statistics
+from MultipleFileAnalysis import generate_multi_file_summary
+from ReportExtraction import extract_report
+from SingleDayAnalysis import analyze
+from report_generator import make_report
+
+
+def write_all(paths, extractions, save_path, output_format):
+    timings = {}
+    started = time.perf_counter()
+    analyze(paths[0], save_path, extractions[0], output_format)
+    timings["single day"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    analyze_cyclic_run(paths[0], save_path, extractions[0], output_format)
+    timings["cyclic"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    generate_multi_file_summary(paths, save_path, extractions, output_format)
+    timings["test statistics"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    generate_error_statistics(paths, save_path, extractions, output_format)
+    timings["error statistics"] = time.perf_counter() - started
+    return timings
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    tests = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = [
+            make_report(os.path.join(folder, f"TB001_2024-12-{18 + idx}.html"), date=f"2024-12-{18 + idx}",
+                        seed=idx, tests=tests, cycles=2)
+            for idx in range(count)
+        ]
+        extractions = [extract_report(path) for path in paths]
+        results = {}
+        for output_format in ("excel", "html"):
+            save_path = os.path.join(folder, output_format)
+            os.makedirs(save_path)
+            results[output_format] = write_all(paths, extractions, save_path, output_format)
+
+        print(f"{count} reports, {tests} tests per stimulation")
+        for name in results["excel"]:
+            print(f"  {name:17} excel {results['excel'][name]:6.2f} s   html/json {results['html'][name]:6.2f} s")
+        print(f"  {'total':17} excel {sum(results['excel'].values()):6.2f} s   "
+              f"html/json {sum(results['html'].values()):6.2f} s")
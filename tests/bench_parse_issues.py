@@ -0,0 +1,46 @@
+"""
+Spans per second of parse_issues against the implementation it replaced, on a full and a region parse.
+
+Run with: python tests/bench_parse_issues.py [blocks]
+
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+from Utils import SourceLineIndex, parse_html, parse_issues
+from test_parse_issues import random_markup, reference_parse_issues, stimulations_of
+
+
+def spans_per_second(function, spans, stimulations, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for tag in spans:
+            function(tag, stimulations)
+        best = min(best, time.perf_counter() - started)
+    return len(spans) / best
+
+
+if __name__ == "__main__":
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    r = random.Random(0)
+    markup = "".join(random_markup(r) for _ in range(blocks))
+    soup = BeautifulSoup(markup, "html.parser")
+    spans = soup.find_all("span", class_=True)
+    stimulations = stimulations_of(soup)
+    region_soup = parse_html("report.html", markup.encode("utf-8"), regions=("titles", "issues"))
+    region_spans = region_soup.find_all("span", class_=True)
+
+    runs = [
+        ("reference, full parse", reference_parse_issues, spans, stimulations),
+        ("parse_issues, full parse", parse_issues, spans, SourceLineIndex(stimulations)),
+        ("parse_issues, region parse", parse_issues, region_spans, SourceLineIndex(stimulations_of(region_soup))),
+    ]
+    for label, function, tags, stimulation_index in runs:
+        print(f"  {label:28} {len(tags):6} spans {spans_per_second(function, tags, stimulation_index):9.0f} spans/s")
@@ -0,0 +1,42 @@
+"""
+Parse time and peak memory of a full parse against each region-restricted parse.
+
+Run with: python tests/bench_parse_regions.py [log lines per test]. Times include the tracemalloc overhead.
+
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Utils import parse_html
+from report_generator import make_report
+from test_region_parsing import REGION_SETS
+
+
+def measure(path, regions):
+    tracemalloc.start()
+    started = time.perf_counter()
+    soup = parse_html(path, regions=regions)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del soup
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    log_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_report(
+            os.path.join(directory, "TB001_2024-12-18.html"), stimulations=5, tests=10, seed=1, log_lines=log_lines
+        )
+        print(f"{os.path.getsize(path) / 1e6:.1f} MB report, {log_lines} log lines per test")
+        for regions in [None] + REGION_SETS:
+            elapsed, peak = measure(path, regions)
+            label = "full parse" if regions is None else ", ".join(regions)
+            print(f"  {label:45} {elapsed:6.2f} s {peak / 2 ** 20:7.1f} MiB")
@@ -0,0 +1,53 @@
+"""
+Wall time of extracting reports read through an artificially throttled source, one at a time and with
+ReportPrefetcher reading ahead while the current report is parsed.
+
+Run with: python tests/bench_prefetch.py [reports] [latency seconds] [MB/s]
+
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ReportExtraction import extract_report
+from ReportReader import ReportPrefetcher, read_report_bytes
+from report_generator import make_report
+
+
+def throttled_reader(latency, bandwidth):
+    def reader(filepath):
+        content = read_report_bytes(filepath)
+        time.sleep(latency + len(content) / bandwidth)
+        return content
+    return reader
+
+
+def run(filepaths, reader, max_ahead):
+    started = time.perf_counter()
+    prefetcher = ReportPrefetcher(filepaths, max_ahead=max_ahead, reader=reader)
+    for filepath, content, error in prefetcher:
+        extract_report(filepath, content)
+    return time.perf_counter() - started, prefetcher.total_read_time()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    bandwidth = float(sys.argv[3]) * 1024 * 1024 if len(sys.argv) > 3 else 10 * 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as folder:
+        filepaths = [
+            make_report(os.path.join(folder, f"TB001_{idx}.html"), seed=idx, stimulations=4, tests=20, log_lines=20)
+            for idx in range(count)
+        ]
+        size = sum(os.path.getsize(filepath) for filepath in filepaths)
+        print(f"{count} reports, {size / 1024 / 1024:.1f} MB, {latency * 1000:.0f} ms latency, "
+              f"{bandwidth / 1024 / 1024:.0f} MB/s")
+        reader = throttled_reader(latency, bandwidth)
+        for label, max_ahead in (("one at a time", 1), ("read ahead 4", 4)):
+            wall, read_time = run(filepaths, reader, max_ahead)
+            print(f"  {label:14} {wall:6.2f} s wall, {read_time:6.2f} s reading")
@@ -0,0 +1,44 @@
+"""
+Time of the regression diff between two generated reports: extraction, the diff itself and writing
+the Excel and JSON output.
+
+Run with: python tests/bench_regression_diff.py [stimulations] [tests per stimulation]
+
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from RegressionDiff import PARSE_REGIONS, diff_extractions, generate_regression_diff
+from ReportExtraction import extract_report
+from report_generator import make_report
+
+
+if __name__ == "__main__":
+    stimulations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    tests = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as folder:
+        baseline, candidate = (
+            make_report(os.path.join(folder, f"TB001_{date}.html"), date=date, seed=seed,
+                        stimulations=stimulations, tests=tests)
+            for seed, date in enumerate(("2024-12-18", "2024-12-19"))
+        )
+        print(f"{stimulations * tests} tests per report, {os.path.getsize(candidate) / 1024 / 1024:.1f} MB")
+
+        started = time.perf_counter()
+        extractions = [extract_report(path, regions=PARSE_REGIONS) for path in (baseline, candidate)]
+        extracted = time.perf_counter()
+        diff = diff_extractions(extractions[:1], extractions[1:])
+        diffed = time.perf_counter()
+        print(f"  extraction {extracted - started:6.2f} s")
+        print(f"  diff       {diffed - extracted:6.2f} s "
+              f"({len(diff['New Failures'])} new failures, {len(diff['Fixed Tests'])} fixed)")
+
+        started = time.perf_counter()
+        generate_regression_diff([baseline], [candidate], folder)
+        print(f"  end to end {time.perf_counter() - started:6.2f} s")
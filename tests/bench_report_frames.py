@@ -0,0 +1,52 @@
+"""
+Peak memory of building the single-day and cyclic report tables from extracted records, against the
+deep size of the tables built. A ratio near 1 or below means each table was built about once,
+without copies; below 1 as the message strings are shared with the extracted records.
+
+Run with: python tests/bench_report_frames.py [tests per stimulation] [cycles]
+
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import CyclicRunAnalysis
+import SingleDayAnalysis
+from ReportExtraction import extract_report
+from report_generator import make_report
+
+MIB = 1024 * 1024
+
+
+def measure(label, module, path):
+    extraction = extract_report(path, regions=module.PARSE_REGIONS)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    frames = module.prepare_report_frames(extraction.passes, extraction.warnings, extraction.issues)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = sum(frame.memory_usage(deep=True).sum() for frame in frames[:3])
+    rows = ", ".join(f"{len(frame)}" for frame in frames[:3])
+    print(f"  {label:10} {elapsed:6.2f} s, tables {size / MIB:7.1f} MiB ({rows} rows), "
+          f"peak {peak / MIB:7.1f} MiB, ratio {peak / size:4.2f}")
+
+
+if __name__ == "__main__":
+    tests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with tempfile.TemporaryDirectory() as folder:
+        single_day = make_report(os.path.join(folder, "TB001_single.html"), stimulations=10, tests=tests)
+        cyclic = make_report(os.path.join(folder, "TB001_cyclic.html"), stimulations=2, tests=20, cycles=cycles)
+        print(f"single day {os.path.getsize(single_day) / MIB:.1f} MB, cyclic {os.path.getsize(cyclic) / MIB:.1f} MB")
+
+        measure("single day", SingleDayAnalysis, single_day)
+        measure("cyclic", CyclicRunAnalysis, cyclic)
@@ -0,0 +1,61 @@
+"""
+Time to build the timeline, the step durations and the slowest steps from synthetic events, against
+timing the steps with a plain loop over parsed datetimes.
+
+Run with: python tests/bench_timeline.py [events]   (2000000 for the full-size run)
+
+"""
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ReportExtraction import EVENT_FIELDS, RecordColumns
+from Timeline import build_timeline, prepare_timeline_frames
+
+
+def synthetic_events(count, seed=0):
+    r = random.Random(seed)
+    start = datetime.datetime(2024, 12, 18, 8, 0, 0)
+    events = RecordColumns(EVENT_FIELDS)
+    seconds = 0
+    for idx in range(count):
+        seconds += r.choice((0, 1, 1, 2, 5))
+        stamp = (start + datetime.timedelta(seconds=seconds)).strftime("%Y-%m-%d%H:%M:%S")
+        events.append((f"Stimulation {idx // 5000 + 1}", f"{idx // 50 % 100 + 1:02d}_Test", stamp))
+    return events
+
+
+def loop_steps(events):
+    # Reference: parse each timestamp and time the stimulation steps one event at a time.
+    steps = {}
+    previous = None
+    for stimulation, test_case, stamp in events:
+        moment = datetime.datetime.strptime(stamp, "%Y-%m-%d%H:%M:%S")
+        if previous is not None and previous[0] != stimulation:
+            steps[previous[0]] = steps.get(previous[0], 0) + (moment - previous[1]).total_seconds()
+        if previous is None or previous[0] != stimulation:
+            previous = (stimulation, moment)
+    return steps
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    events = synthetic_events(count)
+    print(f"{count} events")
+
+    started = time.perf_counter()
+    timeline = build_timeline(events)
+    built = time.perf_counter()
+    stimulation_steps, test_case_durations, slowest_steps = prepare_timeline_frames(events)
+    prepared = time.perf_counter()
+    print(f"  build timeline    {built - started:6.2f} s")
+    print(f"  timeline frames   {prepared - built:6.2f} s "
+          f"({len(stimulation_steps)} stimulation steps, {len(test_case_durations)} test cases)")
+
+    started = time.perf_counter()
+    loop_steps(events)
+    print(f"  per-event loop    {time.perf_counter() - started:6.2f} s (stimulation steps only)")
@@ -0,0 +1,108 @@
+import random
+
+CAMPAIGN_ROWS = (
+    ("Campaign name", "Nightly"),
+    ("Campaign date", "{date} 09:59:05"),
+    ("Duration", "0:43:01"),
+    ("ENNA version", "2024.2.13"),
+    ("Python version", "3.12.3"),
+    ("Train", "SW xx"),
+)
+VALUATIONS = ("PASS", "PASS", "PASS", "FAIL", "ERROR", "WARNING")
+
+
+def report_markup(date="2024-12-18", stimulations=3, tests=4, cycles=1, seed=0, log_lines=0, variations=True):
+    """
+    Build the markup of a synthetic test report.
+
+    Each test case has a title, a test block with its valuation, and a log block of info, debug and
+    issue spans. With variations, log blocks also get issues in their own block, nested paragraphs,
+    line breaks, long messages continued over several spans, entities, comments and elements sharing
+    a line, so region-restricted and byte-scanning readers can be checked against a full parse.
+
+    """
+    r = random.Random(seed)
+    out = [
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>Report</title>',
+        '<style>body{font-family:sans}</style><script>var x = "<div class=\\"content\\">";</script></head><body>',
+        '<div class="content active" data-tab="campaign"><table>',
+    ]
+    out.extend(f"<tr><td>{key}</td><td>{value.format(date=date)}</td></tr>" for key, value in CAMPAIGN_ROWS)
+    out.append("</table></div>")
+
+    minute = 0
+    for cycle in range(cycles):
+        for stimulation in range(stimulations):
+            name = f"Stimulation {stimulation + 1}"
+            if variations and stimulation == 1:
+                name = f"Stim &amp; {stimulation + 1}"
+            out.append(f'<div class="title"><span class="highlight">{name}</span></div>')
+            for test in range(tests):
+                test_case = f"{test + 1:02d}_Test_{test + 1}"
+                if variations and test == 1 and r.random() < 0.3:
+                    test_case = "01_02"
+                title = f'<div class="title test">{test_case} description</div>'
+                if variations and r.random() < 0.2:
+                    title = (
+                        f'<div class="title test">{test_case} <i>desc</i> '
+                        '<!-- <div class="title test">99_X</div> --></div>'
+                    )
+                out.append(title)
+
+                valuation = r.choice(VALUATIONS)
+                separator = " " if variations and r.random() < 0.2 else "\n"
+                out.append(
+                    f'<div class="content" name="test">\n<b>Name</b>: {test_case}{separator}'
+                    f'<b>Valuation</b>: {valuation}\n</div>'
+                )
+
+                minute += 1
+                timestamp = f"{date} {10 + minute // 60:02d}:{minute % 60:02d}:{r.randint(0, 59):02d}"
+                out.extend(_log_block(r, test_case, valuation, timestamp, log_lines, variations))
+    out.append("</body></html>")
+    return "\n".join(out)
+
+
+def _log_block(r, test_case, valuation, timestamp, log_lines, variations):
+    lines = ['<div class="log">']
+    for action in range(r.randint(0, 4)):
+        lines.append(f'<span class="text-info">{timestamp} | INFO | Action {action}</span>')
+        if variations and r.random() < 0.2:
+            lines.append('<span class="text-debug">debug between actions</span><br>')
+    for _ in range(log_lines):
+        lines.append(f'<span class="text-debug">debug line {r.random()}</span>')
+    if variations and r.random() < 0.2:
+        lines.append(f'<p><span class="text-info">{timestamp} | INFO | nested action</span></p>')
+
+    if valuation in ("FAIL", "ERROR"):
+        class_name = "text-fail" if valuation == "FAIL" else "text-error"
+        message = f"{test_case}: {valuation.title()} message {r.randint(1, 3)}"
+        if variations and r.random() < 0.3:
+            message += " " + "x" * 210
+        issue = f'<span class="{class_name}">{timestamp} | {valuation} | x | {message}</span>'
+        if variations and r.random() < 0.3:
+            # An issue in a log block of its own: its previous actions must not come from the block above.
+            lines.append("</div>")
+            lines.append('<div class="log">')
+        lines.append(issue)
+        for _ in range(r.choice((0, 0, 1, 2)) if variations else 0):
+            if r.random() < 0.3:
+                lines.append('<span class="text-debug">debug inside a continuation</span>')
+            lines.append(f'<span class="text-error">continued {r.randint(1, 9)}</span>')
+        if variations and r.random() < 0.3:
+            lines.append(f'<span class="text-info">{timestamp} | INFO | after</span>')
+    lines.append("</div>")
+    if variations and r.random() < 0.2:
+        # A continuation-looking span right after the block belongs to the document, not the block.
+        lines.append('<span class="text-error">outside any block</span>')
+    return lines
+
+
+def make_report(path, **options):
+    """
+    Write a synthetic report (see report_markup) to path and return the path.
+
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(report_markup(**options))
+    return path
@@ -0,0 +1,52 @@
+import random
+import pytest
+import ErrorStatistics
+import MultipleFileAnalysis
+from Aggregates import ErrorAggregate, StabilityAggregate, merge_aggregates
+from ReportExtraction import extract_report
+from report_generator import make_report
+
+DATES = ("2024-12-18", "2024-12-19", "2024-12-20", "2024-12-21")
+
+
+@pytest.fixture(scope="module")
+def extractions(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("reports")
+    paths = [
+        make_report(
+            str(folder / f"TB00{idx % 3 + 1}_{DATES[idx % len(DATES)]}.html"), date=DATES[idx % len(DATES)],
+            stimulations=2, tests=3 + idx % 4, cycles=1 + idx % 2, seed=idx
+        )
+        for idx in range(10)
+    ]
+    return {
+        StabilityAggregate: [extract_report(path, regions=MultipleFileAnalysis.PARSE_REGIONS) for path in paths],
+        ErrorAggregate: [extract_report(path, regions=ErrorStatistics.PARSE_REGIONS) for path in paths],
+    }
+
+
+def outputs(aggregate):
+    return aggregate.results() if isinstance(aggregate, StabilityAggregate) else aggregate.error_analysis()
+
+
+@pytest.mark.parametrize("kind", (StabilityAggregate, ErrorAggregate), ids=lambda kind: kind.__name__)
+@pytest.mark.parametrize("seed", range(10))
+def test_sharded_merge_matches_single_run(extractions, kind, seed):
+    r = random.Random(seed)
+    single = outputs(kind.from_extractions(extractions[kind]))
+
+    shuffled = list(extractions[kind])
+    r.shuffle(shuffled)
+    cuts = sorted(r.sample(range(1, len(shuffled)), r.randint(0, 4)))
+    shards = [
+        # Checkpointed shards go through JSON, so round-trip them as well.
+        kind.from_dict(kind.from_extractions(shuffled[start:end]).to_dict())
+        for start, end in zip([0] + cuts, cuts + [len(shuffled)])
+    ]
+    r.shuffle(shards)
+    before = [shard.to_dict() for shard in shards]
+
+    assert outputs(merge_aggregates(shards)) == single
+    assert [shard.to_dict() for shard in shards] == before
+    if len(shards) > 1:
+        assert outputs(shards[0].merge(merge_aggregates(shards[1:]))) == single
@@ -0,0 +1,53 @@
+import io
+import numpy as np
+from matplotlib.image import imread
+import Charts
+
+
+def test_chart_pool_is_shut_down(monkeypatch):
+    monkeypatch.setattr(Charts, "CHART_WORKERS", 1)
+    monkeypatch.setattr(Charts, "_chart_pool", None)
+    pool = Charts.chart_pool()
+    job = Charts.ChartJob(Charts.pie_chart_png, "Summary", ["Passes", "Errors"], [3, 1], ["green", "red"])
+    assert job.png().startswith(b"\x89PNG")
+
+    Charts.shutdown_chart_pool()
+    assert Charts._chart_pool is None
+    assert pool._shutdown_thread
+
+
+def decoded(png):
+    return imread(io.BytesIO(png), format="png")
+
+
+CHARTS = [
+    (Charts.pie_chart_png, "Summary", ["Passes", "Warnings", "Errors"], [30, 4, 1], ["green", "yellow", "red"]),
+    (Charts.summary_plot_png, ["2024-12-18", "2024-12-19", "2024-12-20"], {
+        "Pass": [10, 12, 0], "Fail": [2, 0, 3], "Error": [1, 1, 0], "Warning": [0, 4, 2],
+    }),
+    (Charts.cyclic_summary_plot_png, ["2024-12-18", "2024-12-19"], [40, 38], [0, 2]),
+]
+
+
+def test_pooled_charts_match_inline_rendering(monkeypatch):
+    monkeypatch.setattr(Charts, "CHART_WORKERS", 1)
+    monkeypatch.setattr(Charts, "_chart_pool", None)
+    jobs = [Charts.ChartJob(*chart) for chart in CHARTS]
+    pooled = [job.png() for job in jobs]
+    assert Charts._chart_pool is not None
+    Charts.shutdown_chart_pool()
+
+    for (function, *args), png in zip(CHARTS, pooled):
+        inline = function(*args)
+        assert decoded(png).shape == decoded(inline).shape
+        assert np.array_equal(decoded(png), decoded(inline))
+
+
+def test_bar_segments_are_labelled_with_their_counts(monkeypatch):
+    figures = []
+    monkeypatch.setattr(Charts, "_figure_png", figures.append)
+    Charts.summary_plot_png(*CHARTS[1][1:])
+    Charts.cyclic_summary_plot_png(*CHARTS[2][1:])
+
+    labels = [[text.get_text() for text in figure.axes[0].texts if text.get_text()] for figure in figures]
+    assert labels == [["10", "12", "2", "3", "1", "1", "4", "2"], ["40", "38", "2"]]
@@ -0,0 +1,74 @@
+import gzip
+import os
+import zipfile
+import pytest
+import SingleDayAnalysis
+from ReportExtraction import extract_report, extract_reports
+from ReportReader import (
+    expand_inputs, is_compressed, open_report, read_report_bytes, report_size, report_stat, split_archive_member,
+)
+from report_generator import report_markup
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    markup = {date: report_markup(date=date, seed=idx).encode("utf-8")
+              for idx, date in enumerate(("2024-12-18", "2024-12-19", "2024-12-20"))}
+    plain = tmp_path / "TB001_2024-12-18.html"
+    plain.write_bytes(markup["2024-12-18"])
+    compressed = tmp_path / "TB001_2024-12-19.html.gz"
+    with gzip.open(compressed, "wb") as f:
+        f.write(markup["2024-12-19"])
+    archive = tmp_path / "TB001_reports.zip"
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as f:
+        f.writestr("run/TB001_2024-12-20.html", markup["2024-12-20"])
+        f.writestr("run/notes.txt", "not a report")
+        f.writestr("run/TB001_2024-12-18.html", markup["2024-12-18"])
+    return markup, str(plain), str(compressed), str(archive)
+
+
+def test_archives_expand_to_their_report_members(inputs):
+    markup, plain, compressed, archive = inputs
+    members = [archive + "/run/TB001_2024-12-20.html", archive + "/run/TB001_2024-12-18.html"]
+    assert expand_inputs([plain, compressed, archive]) == [plain, compressed, *members]
+    assert split_archive_member(members[0]) == (archive, "run/TB001_2024-12-20.html")
+    assert split_archive_member(compressed) == (compressed, None)
+    assert report_stat(members[0]).st_mtime == os.stat(archive).st_mtime
+    assert [is_compressed(path) for path in (plain, compressed, *members)] == [False, True, True, True]
+
+
+def test_compressed_reports_read_like_plain_ones(inputs):
+    markup, plain, compressed, archive = inputs
+    member = archive + "/run/TB001_2024-12-20.html"
+    assert read_report_bytes(compressed) == markup["2024-12-19"]
+    assert read_report_bytes(member) == markup["2024-12-20"]
+    assert open_report(compressed) == markup["2024-12-19"]
+    assert bytes(open_report(plain)) == markup["2024-12-18"]
+
+    dates = [extraction.campaign_date for extraction in extract_reports([compressed, archive, plain])]
+    assert dates == ["2024-12-19", "2024-12-20", "2024-12-18", "2024-12-18"]
+    same_as_plain = archive + "/run/TB001_2024-12-18.html"
+    assert extract_report(same_as_plain, regions=SingleDayAnalysis.PARSE_REGIONS).issues == extract_report(
+        plain, regions=SingleDayAnalysis.PARSE_REGIONS
+    ).issues
+
+
+def test_sizes_come_from_the_archive_directory_and_the_gzip_trailer(inputs):
+    markup, plain, compressed, archive = inputs
+    assert report_size(plain) == len(markup["2024-12-18"])
+    assert report_size(compressed) == len(markup["2024-12-19"]) != os.path.getsize(compressed)
+    assert report_size(archive + "/run/TB001_2024-12-20.html") == len(markup["2024-12-20"])
+
+
+def test_missing_members_and_corrupt_data_are_read_errors(inputs, tmp_path):
+    markup, plain, compressed, archive = inputs
+    with pytest.raises(OSError, match="Cannot open"):
+        read_report_bytes(archive + "/run/missing.html")
+    with pytest.raises(OSError, match="Cannot read archive"):
+        read_report_bytes(archive)
+
+    corrupt = tmp_path / "TB003_corrupt.html.gz"
+    corrupt.write_bytes(gzip.compress(b"<html>" * 100)[:-20])
+    with pytest.raises(OSError, match="Corrupt compressed report"):
+        read_report_bytes(str(corrupt))
+    assert list(extract_reports([str(corrupt), compressed]))[0].campaign_date == "2024-12-19"
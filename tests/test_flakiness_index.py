@@ -0,0 +1,93 @@
+import os
+import random
+import MultipleFileAnalysis
+from Aggregates import StabilityAggregate
+from FlakinessIndex import FLAKINESS_INDEX_FILE, FlakinessIndex
+from MultipleFileAnalysis import generate_multi_file_summary
+from ReportExtraction import extract_report
+from report_generator import make_report
+
+
+def row(index, test_case):
+    table = index.to_dataframe()
+    return table[table["Test Case"] == test_case].iloc[0].to_dict()
+
+
+def test_reports_of_the_same_date_all_count():
+    index = FlakinessIndex()
+    assert index.add_report("TB001_2024-12-02.html", "2024-12-02", {"01_A": "Pass"})
+    assert index.add_report("TB002_2024-12-02.html", "2024-12-02", {"01_A": "Fail"})
+    assert not index.add_report("TB002_2024-12-02.html", "2024-12-02", {"01_A": "Fail"})
+
+    assert row(index, "01_A")["Runs"] == 2
+    assert row(index, "01_A")["First Failure"] == "2024-12-02"
+
+
+def test_older_report_is_slotted_into_the_history():
+    index = FlakinessIndex()
+    index.add_report("run1_2024-12-02", "2024-12-02", {"01_A": "Pass"})
+    index.add_report("run1_2024-12-03", "2024-12-03", {"01_A": "Fail"})
+    index.add_report("run2_2024-12-01", "2024-12-01", {"01_A": "Fail"})
+    index.add_report("run2_2024-12-03", "2024-12-03", {"01_A": "Pass"})
+
+    entry = row(index, "01_A")
+    assert entry["Runs"] == 4
+    assert entry["Flips"] == 3
+    assert entry["Current Streak"] == "1 x Pass"
+    assert entry["First Failure"] == "2024-12-01"
+    assert entry["Last Failure"] == "2024-12-03"
+
+
+def test_arrival_order_does_not_matter(tmp_path):
+    r = random.Random(3)
+    reports = [
+        (f"TB00{bench}_{day}", f"2024-12-{day:02d}", {f"0{tc}_T": r.choice(["Pass", "Fail"]) for tc in range(1, 4)})
+        for day in range(1, 15) for bench in (1, 2)
+    ]
+    expected = FlakinessIndex(window=5)
+    for report in sorted(reports, key=lambda report: (report[1], report[0])):
+        expected.add_report(*report)
+
+    for seed in range(5):
+        shuffled = random.Random(seed).sample(reports, len(reports))
+        index = FlakinessIndex(window=5)
+        for report in shuffled:
+            index.add_report(*report)
+        assert index.to_dataframe().equals(expected.to_dataframe())
+
+        path = str(tmp_path / FLAKINESS_INDEX_FILE)
+        index.save(path)
+        assert FlakinessIndex.load(path).to_dataframe().equals(expected.to_dataframe())
+
+
+def test_changed_report_replaces_its_outcomes():
+    index = FlakinessIndex()
+    index.add_report("a", "2024-12-01", {"01_A": "Fail", "02_B": "Pass"})
+    index.add_report("b", "2024-12-02", {"01_A": "Pass"})
+    assert index.add_report("a", "2024-12-01", {"01_A": "Pass"})
+
+    assert row(index, "01_A")["Last Failure"] == "--"
+    assert "02_B" not in set(index.to_dataframe()["Test Case"])
+
+
+def test_rerunning_over_overlapping_files_counts_each_report_once(tmp_path):
+    paths = [
+        make_report(str(tmp_path / f"TB00{idx % 2 + 1}_{date}.html"), date=date, seed=idx, tests=5)
+        for idx, date in enumerate(("2024-12-18", "2024-12-18", "2024-12-19", "2024-12-17"))
+    ]
+    extractions = [extract_report(path, regions=MultipleFileAnalysis.PARSE_REGIONS) for path in paths]
+    save_path = str(tmp_path / "out")
+    os.makedirs(save_path)
+
+    generate_multi_file_summary(paths[:3], save_path, extractions=extractions[:3], output_format="html")
+    tables = generate_multi_file_summary(paths[1:], save_path, extractions=extractions[1:], output_format="html")
+
+    expected = FlakinessIndex()
+    expected.add_aggregates([StabilityAggregate.from_extractions([extraction]) for extraction in extractions])
+    assert tables["Flakiness"].equals(expected.to_dataframe())
+    assert FlakinessIndex.load(os.path.join(save_path, FLAKINESS_INDEX_FILE)).to_dataframe().equals(
+        expected.to_dataframe()
+    )
+    assert sum(tables["Flakiness"]["Runs"]) == sum(
+        1 for extraction in extractions for test_case in {name for name, valuation in extraction.test_valuations}
+    )
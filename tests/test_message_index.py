@@ -0,0 +1,51 @@
+import pytest
+import MessageIndex
+from report_generator import make_report
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(MessageIndex, "SEGMENT_FILES", 1)
+    paths = [
+        make_report(str(tmp_path / f"TB001_{date}.html"), date=date, seed=idx)
+        for idx, date in enumerate(("2024-12-18", "2024-12-19", "2024-12-20"))
+    ]
+    index = MessageIndex.MessageIndex(str(tmp_path / "index"))
+    index.update(paths)
+    yield index
+    index.close()
+
+
+def test_merge_closes_the_replaced_segments(index):
+    before = index.search("message")
+    old_segments = list(index.segments.values())
+    assert len(old_segments) == 3 and before
+
+    index.merge()
+    assert all(segment._docs_file.closed for segment in old_segments)
+    assert len(index.segments) == 1
+    assert index.search("message") == before
+
+
+def test_search_retries_when_a_merge_replaces_its_segments(index, monkeypatch):
+    expected = index.search("message")
+    segment = index.segments[index.manifest["segments"][0]]
+    docs = segment.docs
+
+    def docs_after_merge(doc_ids):
+        # The merge lands between taking the segments and reading their occurrences.
+        monkeypatch.setattr(segment, "docs", docs)
+        index.merge()
+        return docs(doc_ids)
+
+    monkeypatch.setattr(segment, "docs", docs_after_merge)
+    assert index.search("message") == expected
+    assert segment._docs_file.closed
+
+
+def test_close_closes_every_segment(index):
+    segments = list(index.segments.values())
+    index.close()
+    assert all(segment._docs_file.closed for segment in segments)
+    with pytest.raises(ValueError):
+        index.search("message")
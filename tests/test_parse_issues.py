@@ -0,0 +1,124 @@
+import random
+import re
+import pytest
+from bs4 import BeautifulSoup
+from Utils import SourceLineIndex, parse_html, parse_issues
+
+SPAN_CLASSES = ("text-error", "text-fail", "text-info", "text-debug", "text-error extra", "highlight")
+
+
+def reference_find_closest_stimulation(stimulations, reference_line):
+    for stim_div, stim_name in reversed(stimulations):
+        if stim_div.sourceline < reference_line:
+            return stim_name
+    return "Unknown Stimulation"
+
+
+def reference_extract_previous_actions(tag):
+    previous_actions = []
+    for sibling in tag.find_previous_siblings():
+        if sibling.name == "span" and "text-info" in sibling.get("class", []):
+            previous_actions.append(sibling.get_text(strip=True))
+        if len(previous_actions) >= 3:
+            break
+    return "; ".join(previous_actions[::-1])
+
+
+def reference_parse_issues(tag, stimulations):
+    # parse_issues as it was before the precompiled patterns and lazy sibling walks.
+    class_name = tag["class"][0]
+    if class_name not in ["text-error", "text-fail"]:
+        return None
+
+    text = tag.get_text(strip=True)
+    parts = text.split("|")
+    if len(parts) >= 4:
+        message = parts[3].strip()
+        timestamp = re.sub(r"[ a-zA-Z]", "", parts[0].strip())
+    elif len(parts) >= 3:
+        message = parts[2].strip()
+        timestamp = re.sub(r"[ a-zA-Z]", "", parts[0].strip())
+    else:
+        return None
+
+    if len(message) > 200:
+        for sibling in tag.find_next_siblings("span"):
+            if sibling["class"][0] == "text-error":
+                message += f" {sibling.get_text(strip=True)}"
+            else:
+                break
+
+    test_case_match = re.search(r"(\d{2,}_[A-Za-z0-9_]+)", message)
+    if not test_case_match:
+        return None
+
+    return {
+        "stimulation": reference_find_closest_stimulation(stimulations, tag.sourceline),
+        "test_case": test_case_match.group(1),
+        "message": message,
+        "type": "Error" if class_name == "text-error" else "Failure",
+        "timestamp": timestamp,
+        "previous_actions": reference_extract_previous_actions(tag),
+    }
+
+
+def random_text(r):
+    fields = [
+        r.choice(["2024-12-18 10:00:01", " 2024-12-18T10:00:02 ", "", "ts"]),
+        r.choice(["ERROR", "FAIL", ""]),
+        r.choice(["x", "01_Test_1 in field", ""]),
+        r.choice(["01_Test_1 failed", "Message for 12_Case_A", "no test case", "7_short", "x" * 205 + " 03_Long"]),
+        r.choice(["tail", "99_Extra"]),
+    ]
+    return " | ".join(fields[:r.randint(1, 5)])
+
+
+def random_markup(r):
+    out = ["<html><body>"]
+    for block in range(r.randint(1, 6)):
+        if r.random() < 0.5:
+            out.append(f'<div class="title"><span class="highlight">Stimulation {block}</span></div>')
+        out.append('<div class="log">')
+        for _ in range(r.randint(0, 12)):
+            span = f'<span class="{r.choice(SPAN_CLASSES)}">{random_text(r)}</span>'
+            if r.random() < 0.1:
+                span = f"<p>{span}</p>"
+            out.append(span + ("\n" if r.random() < 0.5 else ""))
+        out.append("</div>\n")
+    out.append("</body></html>")
+    return "".join(out)
+
+
+def stimulations_of(soup):
+    return [
+        (div, div.find("span", class_="highlight").get_text(strip=True))
+        for div in soup.find_all("div") if "title" in div.get("class", []) and div.find("span", class_="highlight")
+    ]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_parse_issues_matches_reference(seed):
+    markup = random_markup(random.Random(seed))
+    soup = BeautifulSoup(markup, "html.parser")
+    stimulations = stimulations_of(soup)
+    expected = [reference_parse_issues(tag, stimulations) for tag in soup.find_all("span", class_=True)]
+
+    assert [parse_issues(tag, stimulations) for tag in soup.find_all("span", class_=True)] == expected
+    indexed = SourceLineIndex(stimulations)
+    assert [parse_issues(tag, indexed) for tag in soup.find_all("span", class_=True)] == expected
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_parse_issues_on_region_parse_matches_reference(seed):
+    markup = random_markup(random.Random(seed))
+    soup = BeautifulSoup(markup, "html.parser")
+    stimulations = stimulations_of(soup)
+    expected = [
+        issue for issue in (reference_parse_issues(tag, stimulations) for tag in soup.find_all("span", class_=True))
+        if issue
+    ]
+
+    region_soup = parse_html("report.html", markup.encode("utf-8"), regions=("titles", "issues"))
+    region_stimulations = SourceLineIndex(stimulations_of(region_soup))
+    issues = [parse_issues(tag, region_stimulations) for tag in region_soup.find_all("span", class_=True)]
+    assert [issue for issue in issues if issue] == expected
@@ -0,0 +1,25 @@
+import pytest
+import SingleDayAnalysis
+from QuickLook import quick_look, scan_report
+from ReportExtraction import extract_report
+from SingleDayAnalysis import prepare_report_frames
+from report_generator import make_report
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_quick_look_counts_match_the_full_pipeline(tmp_path, seed):
+    path = make_report(
+        str(tmp_path / f"TB{seed:03d}_2024-12-18.html"), stimulations=1 + seed % 5, tests=1 + seed % 12,
+        cycles=1 + seed % 3, seed=seed, log_lines=seed % 2, variations=seed % 4 != 3
+    )
+    extraction = extract_report(path, regions=SingleDayAnalysis.PARSE_REGIONS)
+    category_counts, campaign_table = quick_look(path)
+
+    assert category_counts == prepare_report_frames(extraction.passes, extraction.warnings, extraction.issues)[3]
+    assert campaign_table == extraction.campaign_table
+
+    with open(path, "rb") as f:
+        passes, warnings, issues = scan_report(f.read())
+    assert passes == extraction.passes
+    assert warnings == extraction.warnings
+    assert issues == [dict(issue, previous_actions="") for issue in extraction.issues]
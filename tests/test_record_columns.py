@@ -0,0 +1,31 @@
+from ReportExtraction import EVENT_FIELDS, IssueColumns, RecordColumns, extract_report
+from ReportFrames import issue_frame
+from Timeline import build_timeline
+from report_generator import make_report
+
+
+def test_issue_columns_round_trip_and_share_repeated_values():
+    issues = [
+        {"stimulation": "S1", "test_case": "01_T", "message": f"01_T: boom {idx}", "type": "Error",
+         "timestamp": "2024-12-1810:00:0" + str(idx % 2), "previous_actions": ""}
+        for idx in range(6)
+    ]
+    columns = IssueColumns.from_records(issues)
+    assert len(columns) == 6
+    assert columns == issues
+    assert list(columns) == issues
+    assert IssueColumns.from_records(columns) is columns
+    for field in ("stimulation", "test_case", "type", "timestamp"):
+        assert len({id(value) for value in columns.columns[field]}) == len(set(columns.columns[field]))
+
+
+def test_extraction_keeps_issues_and_events_in_columns(tmp_path):
+    path = make_report(str(tmp_path / "TB001_2024-12-18.html"), seed=4, cycles=3)
+    extraction = extract_report(path)
+    assert isinstance(extraction.issues, IssueColumns)
+    assert isinstance(extraction.events, RecordColumns) and extraction.events.fields == EVENT_FIELDS
+
+    assert build_timeline(extraction.events).equals(build_timeline(list(extraction.events)))
+    table, type_counts = issue_frame(extraction.issues, dedup_rows=True)
+    expected, expected_counts = issue_frame(list(extraction.issues), dedup_rows=True)
+    assert table.equals(expected) and type_counts == expected_counts
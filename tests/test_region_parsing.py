@@ -0,0 +1,58 @@
+import pytest
+import CyclicRunAnalysis
+import ErrorStatistics
+import MessageIndex
+import MultipleFileAnalysis
+import RegressionDiff
+import ReportExtraction
+import ReportWatcher
+import SingleDayAnalysis
+from ReportExtraction import extract_report
+from report_generator import make_report
+
+REGION_SETS = sorted({
+    module.PARSE_REGIONS for module in (
+        CyclicRunAnalysis, ErrorStatistics, MessageIndex, MultipleFileAnalysis, RegressionDiff,
+        ReportExtraction, ReportWatcher, SingleDayAnalysis,
+    )
+})
+
+
+@pytest.mark.parametrize("regions", REGION_SETS, ids="-".join)
+@pytest.mark.parametrize("seed", range(12))
+def test_region_parse_matches_full_parse(tmp_path, regions, seed):
+    path = make_report(
+        str(tmp_path / "TB001_2024-12-18.html"), stimulations=2 + seed % 3, tests=3 + seed % 5,
+        cycles=1 + seed % 2, seed=seed, log_lines=seed % 3
+    )
+    full = extract_report(path, regions=None)
+    restricted = extract_report(path, regions=regions)
+
+    assert restricted.campaign_date == full.campaign_date
+    assert restricted.campaign_details == full.campaign_details
+    assert restricted.campaign_table == full.campaign_table
+    if "tests" in regions:
+        assert restricted.test_valuations == full.test_valuations
+    if "titles" in regions and "valuations" in regions:
+        assert restricted.passes == full.passes
+        assert restricted.warnings == full.warnings
+    if "issues" in regions:
+        expected = list(full.issues)
+        if "titles" not in regions:
+            # Without titles every issue is under "Unknown Stimulation".
+            expected = [dict(issue, stimulation="Unknown Stimulation") for issue in expected]
+        assert restricted.issues == expected
+
+
+def test_issue_in_its_own_log_block_has_no_previous_actions(tmp_path):
+    path = tmp_path / "TB001_2024-12-18.html"
+    path.write_text(
+        '<html><body><div class="log"><span class="text-info">step A1</span>'
+        '<span class="text-info">step A2</span></div>\n'
+        '<div class="log"><span class="text-error">2024-12-18 10:00:00 | ERROR | x | 01_Test_1 boom</span></div>'
+        "</body></html>"
+    )
+    for regions in REGION_SETS + [None]:
+        issues = extract_report(str(path), regions=regions).issues
+        if regions is None or "issues" in regions:
+            assert [issue["previous_actions"] for issue in issues] == [""]
@@ -0,0 +1,43 @@
+import os
+import pytest
+from CyclicRunAnalysis import analyze_cyclic_run
+from ErrorStatistics import generate_error_statistics
+from MultipleFileAnalysis import generate_multi_file_summary
+from ReportAnalysis import analyze_report
+from SingleDayAnalysis import analyze
+from report_generator import make_report
+
+
+def assert_same_tables(tables, expected):
+    assert list(tables) == list(expected)
+    for name in expected:
+        assert tables[name].equals(expected[name]), name
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_one_parse_gives_the_tables_of_each_analysis(tmp_path, seed):
+    path = make_report(str(tmp_path / "TB001_2024-12-18.html"), seed=seed, cycles=2)
+    folders = {name: tmp_path / name for name in ("shared", "single", "cyclic", "stats", "errors")}
+    for folder in folders.values():
+        os.makedirs(folder)
+
+    tables = analyze_report(
+        path, str(folders["shared"]), cyclic=True, test_statistics=True, error_statistics=True, output_format="html"
+    )
+    assert list(tables) == ["Single Day", "Cyclic", "Test Statistics", "Error Statistics"]
+    assert_same_tables(tables["Single Day"], analyze(path, str(folders["single"]), output_format="html"))
+    assert_same_tables(tables["Cyclic"], analyze_cyclic_run(path, str(folders["cyclic"]), output_format="html"))
+    assert_same_tables(
+        tables["Test Statistics"], generate_multi_file_summary([path], str(folders["stats"]), output_format="html")
+    )
+    assert_same_tables(
+        tables["Error Statistics"], generate_error_statistics([path], str(folders["errors"]), output_format="html")
+    )
+
+
+def test_only_the_requested_reports_are_written(tmp_path):
+    path = make_report(str(tmp_path / "TB001_2024-12-18.html"))
+    tables = analyze_report(path, str(tmp_path), single_day=False, cyclic=True, output_format="html")
+    assert list(tables) == ["Cyclic"]
+    outputs = sorted(name for name in os.listdir(tmp_path) if name.endswith("_summary.html"))
+    assert outputs == ["TB001_2024-12-18.html_cyclic_summary.html"]
@@ -0,0 +1,67 @@
+import gzip
+import os
+import zipfile
+from ReportCatalog import CATALOG_FILE, ReportCatalog, prescan_report, read_report_head
+from report_generator import make_report, report_markup
+
+SPLIT_CAMPAIGN = (
+    '<html><body><div class="content active" data-tab="campaign">'
+    "<table><tr><td>Campaign date</td><td>2024-12-18 09:59:05</td></tr>"
+    "<tr><td>ENNA version</td><td>2024.2.13</td></tr></table>"
+    "<div class=\"note\">Environment</div>"
+    "<table><tr><td>Python version</td><td>3.12.3</td></tr><tr><td>Train</td><td>SW 42</td></tr></table>"
+    "</div>"
+    '<div class="title"><span class="highlight">Stimulation 1</span></div>'
+    "</body></html>"
+)
+
+
+def test_fields_after_the_first_table_are_read(tmp_path):
+    path = tmp_path / "TB001_split.html"
+    path.write_text(SPLIT_CAMPAIGN, encoding="utf-8")
+
+    campaign_date, details = prescan_report(str(path))
+    assert campaign_date == "2024-12-18"
+    assert details["Python Version"] == "3.12.3"
+    assert details["Train"] == "SW 42"
+    for chunk_size in (5, 17, 64):
+        assert read_report_head(str(path), chunk_size=chunk_size) == read_report_head(str(path))
+
+
+def test_head_stops_at_the_fields_or_the_end_of_the_section(tmp_path):
+    path = make_report(str(tmp_path / "TB001_big.html"), stimulations=5, tests=20, log_lines=50)
+    head = read_report_head(path, chunk_size=1024)
+    assert head.endswith(b"<tr><td>Train</td><td>SW xx</td>")
+    assert len(head) < 4096 < os.path.getsize(path)
+
+    head = read_report_head(path, fields=("Campaign date", "No such field"), chunk_size=1024)
+    assert head.endswith(b"</table></div>")
+    assert len(head) < 4096
+
+
+def test_folder_catalog_covers_compressed_reports_and_drops_deleted_ones(tmp_path):
+    folder = tmp_path / "reports"
+    folder.mkdir()
+    plain = make_report(str(folder / "TB001_plain.html"), date="2024-12-18")
+    compressed = str(folder / "TB002_compressed.html.gz")
+    with gzip.open(compressed, "wt", encoding="utf-8") as f:
+        f.write(report_markup(date="2024-12-19"))
+    archive = str(folder / "TB003_archive.zip")
+    with zipfile.ZipFile(archive, "w") as f:
+        f.writestr("TB003_a.html", report_markup(date="2024-12-20"))
+        f.writestr("TB003_b.html", report_markup(date="2024-12-21"))
+
+    catalog = ReportCatalog(str(tmp_path / CATALOG_FILE))
+    catalog.update_folder(str(folder))
+    members = [os.path.abspath(archive) + "/TB003_a.html", os.path.abspath(archive) + "/TB003_b.html"]
+    assert set(catalog.entries) == {os.path.abspath(plain), os.path.abspath(compressed), *members}
+    assert catalog.select() == [os.path.abspath(plain), os.path.abspath(compressed), *members]
+    assert catalog.entries[os.path.abspath(compressed)]["Campaign Date"] == "2024-12-19"
+    catalog.save()
+
+    os.remove(plain)
+    with zipfile.ZipFile(archive, "w") as f:
+        f.writestr("TB003_a.html", report_markup(date="2024-12-20"))
+    catalog = ReportCatalog(str(tmp_path / CATALOG_FILE))
+    catalog.update_folder(str(folder))
+    assert set(catalog.entries) == {os.path.abspath(compressed), members[0]}
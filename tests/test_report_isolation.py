@@ -0,0 +1,67 @@
+import os
+import pytest
+import Checkpoint
+import ReportIsolation
+from Aggregates import ErrorAggregate, StabilityAggregate, load_aggregate
+from Checkpoint import checkpointed_aggregates
+from ErrorStatistics import PARSE_REGIONS
+from ReportIsolation import IsolatedExtractor
+from report_generator import make_report
+
+
+@pytest.fixture(scope="module")
+def reports(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("reports")
+    small = [
+        make_report(str(folder / f"TB001_{date}.html"), date=date, seed=idx)
+        for idx, date in enumerate(("2024-12-18", "2024-12-19", "2024-12-20"))
+    ]
+    # Deliberately oversized: about 50 MB of log lines, more than glibc may serve from memory the
+    # worker inherits, and seconds of parsing.
+    big = make_report(
+        str(folder / "TB002_2024-12-21.html"), date="2024-12-21", stimulations=2, tests=20, log_lines=22000
+    )
+    return small, big
+
+
+def test_oversized_report_times_out_and_the_next_one_runs(reports, tmp_path):
+    small, big = reports
+    extractor = IsolatedExtractor(ErrorAggregate, PARSE_REGIONS, timeout=0.5)
+    try:
+        failure = extractor.run(big, str(tmp_path / "big.json"), small[0])
+        assert failure["error"] == "Timed out after 0.5 s"
+        assert failure["stage"] in ("read", "parse", "extract")
+        assert extractor.run(small[0], str(tmp_path / "small.json")) is None
+    finally:
+        extractor.close()
+    assert load_aggregate(str(tmp_path / "small.json")).dates == {"2024-12-18"}
+
+
+@pytest.mark.skipif(ReportIsolation.resource is None, reason="memory limits need the resource module")
+def test_oversized_report_hits_the_memory_limit_and_the_next_one_runs(reports, tmp_path):
+    small, big = reports
+    extractor = IsolatedExtractor(ErrorAggregate, PARSE_REGIONS, timeout=60, memory_limit=16 * 1024 * 1024)
+    try:
+        failure = extractor.run(big, str(tmp_path / "big.json"), small[0])
+        assert failure is not None
+        assert "MemoryError" in failure["error"] or "exited" in failure["error"]
+        assert extractor.run(small[0], str(tmp_path / "small.json")) is None
+    finally:
+        extractor.close()
+    assert not os.path.exists(str(tmp_path / "big.json"))
+
+
+@pytest.mark.parametrize("kind", (StabilityAggregate, ErrorAggregate), ids=lambda kind: kind.__name__)
+def test_isolated_run_with_read_ahead_matches_in_process_run(reports, tmp_path, monkeypatch, kind):
+    small, big = reports
+    monkeypatch.setattr(ReportIsolation, "FILE_TIMEOUT", 0.5)
+    inputs = [small[0], big, small[1], small[2]]
+
+    monkeypatch.setattr(Checkpoint, "ISOLATE_FILES", True)
+    aggregates, skipped_inputs = checkpointed_aggregates(inputs, str(tmp_path / "isolated"), kind, PARSE_REGIONS)
+    assert skipped_inputs["File"].tolist() == [big]
+    assert skipped_inputs["Error"].tolist() == ["Timed out after 0.5 s"]
+
+    monkeypatch.setattr(Checkpoint, "ISOLATE_FILES", False)
+    expected, _ = checkpointed_aggregates(small, str(tmp_path / "in_process"), kind, PARSE_REGIONS)
+    assert [aggregate.to_dict() for aggregate in aggregates] == [aggregate.to_dict() for aggregate in expected]
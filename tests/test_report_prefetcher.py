@@ -0,0 +1,96 @@
+import threading
+import time
+import pytest
+from ReportReader import ReportPrefetcher, read_report_bytes
+
+
+def write_files(folder, sizes):
+    paths = []
+    for idx, size in enumerate(sizes):
+        path = folder / f"report_{idx}.html"
+        path.write_bytes(bytes([idx % 256]) * size)
+        paths.append(str(path))
+    return paths
+
+
+class TrackingReader:
+    # Records the bytes of the reads started but not consumed yet.
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.outstanding = 0
+        self.peak = 0
+
+    def __call__(self, filepath):
+        content = read_report_bytes(filepath)
+        with self.lock:
+            self.outstanding += len(content)
+            self.peak = max(self.peak, self.outstanding)
+        time.sleep(self.delay)
+        return content
+
+    def consumed(self, content):
+        with self.lock:
+            self.outstanding -= len(content)
+
+
+def test_results_come_back_in_input_order(tmp_path):
+    paths = write_files(tmp_path, [10, 20, 30, 40, 50, 60])
+    delays = {path: 0.05 - idx * 0.008 for idx, path in enumerate(paths)}
+
+    def reader(filepath):
+        # Later files finish first.
+        time.sleep(delays[filepath])
+        return read_report_bytes(filepath)
+
+    prefetcher = ReportPrefetcher(paths, max_ahead=4, reader=reader)
+    results = list(prefetcher)
+    assert [filepath for filepath, content, error in results] == paths
+    assert [len(content) for filepath, content, error in results] == [10, 20, 30, 40, 50, 60]
+    assert set(prefetcher.metrics) == set(paths)
+    assert prefetcher.total_read_time() >= sum(delays.values()) * 0.9
+
+
+def test_reads_stay_within_the_inflight_byte_budget(tmp_path):
+    paths = write_files(tmp_path, [400, 300, 300, 200, 500, 100, 100, 100])
+    reader = TrackingReader()
+    for filepath, content, error in ReportPrefetcher(paths, max_ahead=8, max_inflight_bytes=700, reader=reader):
+        assert error is None
+        reader.consumed(content)
+    assert 500 <= reader.peak <= 700
+
+
+def test_a_file_over_the_budget_is_still_read(tmp_path):
+    paths = write_files(tmp_path, [100, 5000, 100])
+    reader = TrackingReader()
+    results = []
+    for filepath, content, error in ReportPrefetcher(paths, max_ahead=4, max_inflight_bytes=1000, reader=reader):
+        results.append(len(content))
+        reader.consumed(content)
+    assert results == [100, 5000, 100]
+    assert reader.peak == 5000
+
+
+def test_unreadable_files_are_yielded_with_their_error(tmp_path):
+    paths = write_files(tmp_path, [10, 10])
+    missing = str(tmp_path / "missing.html")
+    results = list(ReportPrefetcher([paths[0], missing, paths[1]], max_ahead=2))
+    assert [filepath for filepath, content, error in results] == [paths[0], missing, paths[1]]
+    assert results[1][1] is None and isinstance(results[1][2], OSError)
+    assert results[0][2] is None and results[2][2] is None
+
+
+def test_a_reader_raising_another_error_stops_the_iteration(tmp_path):
+    paths = write_files(tmp_path, [10, 10, 10])
+
+    def reader(filepath):
+        if filepath == paths[1]:
+            raise ValueError("broken reader")
+        return read_report_bytes(filepath)
+
+    consumed = []
+    with pytest.raises(ValueError, match="broken reader"):
+        for filepath, content, error in ReportPrefetcher(paths, max_ahead=3, reader=reader):
+            consumed.append(filepath)
+    assert consumed == paths[:1]
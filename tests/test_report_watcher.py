@@ -0,0 +1,67 @@
+import os
+from FlakinessIndex import FLAKINESS_INDEX_FILE, FlakinessIndex
+from ReportWatcher import ReportWatcher
+from report_generator import make_report
+
+
+def test_watcher_ignores_its_own_html_outputs(tmp_path):
+    folder = str(tmp_path)
+    reports = {
+        os.path.abspath(make_report(os.path.join(folder, f"TB001_{date}.html"), date=date, seed=idx))
+        for idx, date in enumerate(("2024-12-18", "2024-12-19"))
+    }
+    watcher = ReportWatcher(folder, folder, settle_time=10, output_format="html")
+
+    assert watcher.poll_once(now=0) == []
+    assert set(watcher.poll_once(now=20)) == reports
+    assert os.path.exists(os.path.join(folder, "MultiFileAnalysis_Summary.html"))
+    assert os.path.exists(os.path.join(folder, "ErrorStatistics_Summary.html"))
+
+    assert watcher.poll_once(now=40) == []
+    assert watcher.poll_once(now=60) == []
+    assert set(watcher.reports) == reports
+
+
+def test_watcher_skips_a_bad_report_and_keeps_polling(tmp_path):
+    folder = str(tmp_path)
+    good = os.path.abspath(make_report(os.path.join(folder, "TB001_2024-12-18.html"), date="2024-12-18"))
+    bad = os.path.abspath(os.path.join(folder, "TB002_2024-12-18.html"))
+    with open(bad, "w", encoding="utf-8") as f:
+        f.write('<html><body><div class="content active"><table><tr><td>Campaign date</td><td></td></tr>')
+    watcher = ReportWatcher(folder, folder, settle_time=10, output_format="html")
+
+    watcher.poll_once(now=0)
+    assert set(watcher.poll_once(now=20)) == {good, bad}
+    assert set(watcher.reports) == {good}
+    skipped = watcher.skipped_inputs()
+    assert list(skipped["File"]) == [bad]
+    assert list(skipped["Stage"]) == ["extract"]
+    with open(os.path.join(folder, "MultiFileAnalysis_Summary.html"), encoding="utf-8") as f:
+        assert "Skipped Inputs" in f.read()
+
+    assert watcher.poll_once(now=40) == []
+    make_report(bad, date="2024-12-18", seed=1)
+    os.utime(bad, (100, 100))
+    watcher.poll_once(now=60)
+    assert set(watcher.poll_once(now=80)) == {bad}
+    assert set(watcher.reports) == {good, bad}
+    assert watcher.skipped_inputs().empty
+
+
+def test_watcher_counts_each_report_once_in_the_flakiness_index(tmp_path):
+    folder = str(tmp_path)
+    first = make_report(os.path.join(folder, "TB001_2024-12-18.html"), date="2024-12-18", seed=0)
+    watcher = ReportWatcher(folder, folder, settle_time=10, output_format="html")
+    watcher.poll_once(now=0)
+    watcher.poll_once(now=20)
+
+    second = make_report(os.path.join(folder, "TB002_2024-12-18.html"), date="2024-12-18", seed=1)
+    watcher.poll_once(now=40)
+    watcher.poll_once(now=60)
+    watcher.regenerate()
+
+    index = FlakinessIndex.load(os.path.join(folder, FLAKINESS_INDEX_FILE))
+    assert set(index.reports) == {os.path.abspath(first), os.path.abspath(second)}
+    expected = FlakinessIndex()
+    expected.add_aggregates([report["stability"] for report in watcher.reports.values()])
+    assert index.to_dataframe().equals(expected.to_dataframe())
@@ -0,0 +1,56 @@
+import os
+import numpy as np
+import Aggregates
+import MultipleFileAnalysis
+from Aggregates import StabilityAggregate
+from FlakinessIndex import FLAKINESS_INDEX_FILE
+from MultipleFileAnalysis import generate_multi_file_summary, render_results_slice
+from ReportExtraction import extract_report
+from ResultsCube import ResultsCube
+from report_generator import make_report
+
+DATES = ("2024-12-18", "2024-12-19", "2024-12-20", "2024-12-21")
+
+
+def make_reports(folder):
+    return [
+        make_report(os.path.join(folder, f"TB00{idx % 2 + 1}_{date}.html"), date=date, seed=idx, tests=5)
+        for idx, date in enumerate(DATES)
+    ]
+
+
+def test_slice_leaves_the_flakiness_index_alone(tmp_path):
+    paths = make_reports(str(tmp_path))
+    extractions = [extract_report(path, regions=MultipleFileAnalysis.PARSE_REGIONS) for path in paths]
+    save_path = str(tmp_path / "out")
+    os.makedirs(save_path)
+    generate_multi_file_summary(paths, save_path, extractions=extractions, output_format="html")
+    index_path = os.path.join(save_path, FLAKINESS_INDEX_FILE)
+    with open(index_path, "rb") as f:
+        saved_index = f.read()
+
+    slice_path = str(tmp_path / "slice")
+    os.makedirs(slice_path)
+    render_results_slice(save_path, slice_path, since="2024-12-20", output_format="html")
+    render_results_slice(save_path, save_path, until="2024-12-19", output_format="html")
+
+    with open(index_path, "rb") as f:
+        assert f.read() == saved_index
+    assert not os.path.exists(os.path.join(slice_path, FLAKINESS_INDEX_FILE))
+
+
+def test_cube_is_built_with_a_single_merge(tmp_path, monkeypatch):
+    paths = make_reports(str(tmp_path))
+    aggregates = [
+        StabilityAggregate.from_extractions([extract_report(path, regions=MultipleFileAnalysis.PARSE_REGIONS)])
+        for path in paths
+    ]
+    merged = Aggregates.merge_aggregates(aggregates)
+    expected = ResultsCube.from_aggregates(aggregates)
+
+    merges = []
+    monkeypatch.setattr("ResultsCube.merge_aggregates", lambda aggregates: merges.append(aggregates))
+    cube = ResultsCube.from_aggregates(aggregates, merged)
+    assert merges == []
+    assert np.array_equal(cube.counts, expected.counts)
+    assert cube.results() == expected.results()
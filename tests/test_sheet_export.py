@@ -0,0 +1,49 @@
+import os
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from SheetExport import SHEET_ROW_LIMIT, write_sheet
+
+ROWS = 2_000_000
+
+
+def test_two_million_rows_go_to_a_companion_workbook(tmp_path):
+    output_file = str(tmp_path / "Summary.xlsx")
+    df = pd.DataFrame({"Test Case": np.arange(ROWS) % 1000, "Count": np.arange(ROWS)})
+
+    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
+        write_sheet(writer, output_file, df, "Issue Rows")
+
+    main = load_workbook(output_file)
+    assert [[cell.value for cell in row] for row in main["Issue Rows"].iter_rows()] == [
+        ["Rows", "Sheets", "Workbook"], [ROWS, 2, "Summary_Issue_Rows.xlsx"]
+    ]
+
+    companion = load_workbook(str(tmp_path / "Summary_Issue_Rows.xlsx"), read_only=True)
+    assert companion.sheetnames == ["Issue Rows 1", "Issue Rows 2"]
+    totals = []
+    last_counts = []
+    for sheet in companion.worksheets:
+        rows = sheet.iter_rows(values_only=True)
+        assert next(rows) == ("Test Case", "Count")
+        count = 0
+        last = None
+        for last in rows:
+            count += 1
+        totals.append(count)
+        last_counts.append(last[1])
+    companion.close()
+    assert totals == [SHEET_ROW_LIMIT, ROWS - SHEET_ROW_LIMIT]
+    assert last_counts == [SHEET_ROW_LIMIT - 1, ROWS - 1]
+
+
+def test_table_within_the_row_limit_stays_on_its_sheet(tmp_path):
+    output_file = str(tmp_path / "Summary.xlsx")
+    df = pd.DataFrame({"Test Case": ["01_Test_1", "02_Test_2"], "Count": [1, float("nan")]})
+
+    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
+        write_sheet(writer, output_file, df, "Details", row_limit=2)
+
+    rows = [[cell.value for cell in row] for row in load_workbook(output_file)["Details"].iter_rows()]
+    assert rows == [["Test Case", "Count"], ["01_Test_1", 1], ["02_Test_2", None]]
+    assert not os.path.exists(str(tmp_path / "Summary_Details.xlsx"))
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from TableRows import TableRows, factorize_sorted
+
+
+def table():
+    return pd.DataFrame({
+        "Test Case": ["03_C", "01_A", "02_B", "01_A", None],
+        "Runs": [5, 12, 3, 12, 7],
+        "Message": ["Timeout", "fail message", None, "FAIL again", "ok"],
+    })
+
+
+def test_sort_is_stable_and_reverses_on_the_same_column():
+    rows = TableRows(table())
+    rows.sort(1)
+    assert rows.rows.tolist() == [2, 0, 4, 1, 3]
+    rows.sort(1)
+    assert rows.rows.tolist() == [1, 3, 4, 0, 2]
+    rows.sort(0)
+    assert rows.window(0, 5)[0] == ["", "7", "ok"]
+    assert [cells[0] for cells in rows.window(1, 4)] == ["01_A", "01_A", "02_B", "03_C"]
+
+
+def test_filter_ignores_case_and_keeps_the_sort():
+    rows = TableRows(table())
+    rows.sort(1)
+    rows.set_filter("  Fail ")
+    assert rows.rows.tolist() == [1, 3]
+    assert len(rows) == 2
+
+    rows.set_filter("12")
+    assert rows.rows.tolist() == [1, 3]
+    rows.set_filter("")
+    assert len(rows) == 5
+
+
+def test_a_filter_matching_nothing_leaves_no_rows():
+    rows = TableRows(table())
+    rows.set_filter("no such text")
+    assert len(rows) == 0
+    assert rows.window(0, 30) == []
+    rows.sort(2)
+    assert len(rows) == 0
+
+
+def test_mixed_type_columns_sort_and_filter():
+    mixed = pd.DataFrame({"Value": [pd.Timestamp("2024-12-18"), 10, "b", 2.5, None, "a", pd.Timestamp("2024-12-01")]})
+    codes, uniques = factorize_sorted(mixed["Value"])
+    assert list(uniques) == [2.5, 10, pd.Timestamp("2024-12-01"), pd.Timestamp("2024-12-18"), "a", "b"]
+    assert codes.tolist() == [3, 1, 5, 0, -1, 4, 2]
+
+    rows = TableRows(mixed)
+    rows.sort(0)
+    assert rows.rows.tolist() == [4, 3, 1, 6, 0, 5, 2]
+    rows.set_filter("2024-12")
+    assert rows.rows.tolist() == [6, 0]
+
+
+def test_codes_match_a_plain_sort_of_a_uniform_column():
+    values = pd.Series(np.random.default_rng(0).integers(0, 50, 1000))
+    codes, uniques = factorize_sorted(values)
+    assert codes.dtype == np.int32
+    assert (uniques[codes] == values).all()
+    rows = TableRows(values.to_frame())
+    rows.sort(0)
+    assert rows.rows.tolist() == values.sort_values(kind="stable").index.tolist()
@@ -0,0 +1,65 @@
+import SingleDayAnalysis
+from ReportExtraction import extract_report
+from Timeline import build_timeline, prepare_timeline_frames, step_durations
+from report_generator import make_report
+
+
+def test_passing_run_has_a_timeline(tmp_path):
+    path = tmp_path / "TB001_2024-12-18.html"
+    path.write_text(
+        '<html><body><div class="title"><span class="highlight">Stimulation 1</span></div>'
+        '<div class="title test">01_Test_1 description</div>\n'
+        '<span class="text-info">2024-12-18 10:00:00 | INFO | start</span>\n'
+        '<span class="text-info">2024-12-18 10:00:30 | INFO | stop</span>\n'
+        '<div class="title"><span class="highlight">Stimulation 2</span></div>\n'
+        '<span class="text-info">2024-12-18 10:01:00 | INFO | start</span>'
+        "</body></html>"
+    )
+    extraction = extract_report(str(path), regions=SingleDayAnalysis.PARSE_REGIONS)
+    assert not extraction.issues
+    stimulation_steps, test_case_durations, slowest_steps = prepare_timeline_frames(extraction.events)
+    assert stimulation_steps["Stimulation"].tolist() == ["Stimulation 1", "Stimulation 2"]
+    assert stimulation_steps["Duration (s)"].tolist() == [60, 0]
+    assert test_case_durations["Test Case"].tolist() == ["01_Test_1"]
+
+
+def test_events_cover_info_and_issue_spans(tmp_path):
+    path = make_report(str(tmp_path / "TB001_2024-12-18.html"), seed=3)
+    extraction = extract_report(path, regions=SingleDayAnalysis.PARSE_REGIONS)
+    assert len(extraction.events) > len(extraction.issues)
+    assert len(build_timeline(extraction.events)) == len(extraction.events)
+
+
+def test_unreadable_timestamps_are_counted(capsys):
+    timeline = build_timeline([
+        ("S1", "01_T", "2024-12-1810:00:01"),
+        ("S1", "01_T", "2024-12-1810:00:05.250"),
+        ("S2", "02_T", "2024-12-1810:01:00+01:00"),
+        ("S2", "02_T", "18/12/202410:02:00"),
+        ("S2", "02_T", ""),
+    ])
+    assert len(timeline) == 3
+    assert "left out 2 of 5 event(s)" in capsys.readouterr().out
+
+
+def test_offsets_are_dropped_so_aware_and_naive_times_share_the_wall_clock():
+    timeline = build_timeline([
+        ("S1", "01_T", "2024-12-1810:00:30"),
+        ("S2", "02_T", "2024-12-1810:01:00+01:00"),
+        ("S3", "03_T", "2024-12-1810:02:00-05:00"),
+    ])
+    assert timeline["Stimulation"].tolist() == ["S1", "S2", "S3"]
+    assert timeline["Time"].dt.strftime("%H:%M:%S").tolist() == ["10:00:30", "10:01:00", "10:02:00"]
+    assert step_durations(timeline, "Stimulation")["Duration (s)"].tolist() == [30, 60, 0]
+
+
+def test_sub_second_durations_are_kept():
+    timeline = build_timeline([
+        ("S1", "01_T", "2024-12-1810:00:00.250"),
+        ("S1", "01_T", "2024-12-1810:00:00.400"),
+        ("S2", "02_T", "2024-12-1810:00:00.500"),
+        ("S3", "03_T", "2024-12-1810:00:01"),
+    ])
+    steps = step_durations(timeline, "Stimulation")
+    assert steps["Duration (s)"].tolist() == [0.25, 0.5, 0]
+    assert steps["Gap To Next (s)"].tolist() == [0.1, 0.5, 0]